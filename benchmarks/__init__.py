@@ -0,0 +1,5 @@
+"""Performance benchmarks for MoneyMetrics.
+
+Each module can be executed directly, e.g. ``python -m
+benchmarks.bench_four_zero_one_k``, and prints its timings to stdout.
+"""
@@ -0,0 +1,98 @@
+"""Measure GraphScreen latency from cell edits to the redrawn graph.
+
+Run with ``python -m benchmarks.bench_edit_pipeline`` (set
+``QT_QPA_PLATFORM=offscreen`` on machines without a display).  For each
+dataset size the script times a single edit and a pasted column of
+``PASTE`` cells, from the first ``setData`` to the end of the redraw, and
+compares them with ``EDIT_LATENCY_TARGET_MS`` for datasets of up to
+``EDIT_LATENCY_TARGET_ROWS`` rows.  The previous synchronous
+cycle (rebuilding the plan, pushing every later row and redrawing after
+each cell) is timed for the paste as a baseline.
+"""
+
+from __future__ import annotations
+
+import time
+
+from PySide6.QtCore import QEventLoop
+from PySide6.QtWidgets import QApplication
+
+from money_metrics.core.data_manager import DataManager
+from money_metrics.core.four_zero_one_k import FourZeroOneK
+from money_metrics.ui.graph_screen import (
+    EDIT_LATENCY_TARGET_MS,
+    EDIT_LATENCY_TARGET_ROWS,
+    GraphScreen,
+)
+
+SIZES = (1_000, 10_000, 100_000)
+PASTE = 50
+
+
+def _edit(app, screen, rows, value) -> float:
+    """Edit the contribution of ``rows`` and wait for the redraw."""
+    model = screen.table_model
+    column = model.column_index("contribution")
+    screen.last_edit_latency = None
+    for row in rows:
+        model.setData(model.index(row, column), str(value))
+    while screen.last_edit_latency is None:
+        # Block for the next event instead of spinning on processEvents.
+        app.processEvents(QEventLoop.WaitForMoreEvents)
+    return screen.last_edit_latency
+
+
+def _synchronous_paste(screen, rows, value) -> float:
+    """The per-cell cycle the pipeline replaced."""
+    start = time.perf_counter()
+    for row in rows:
+        screen.data[row]["contribution"] = value
+        screen.data = FourZeroOneK(screen.data).to_dict()
+        changed = {i: screen.data[i] for i in range(row, len(screen.data))}
+        screen._update_table_rows(changed)
+        screen._push_changes(changed)
+        screen._update_graph(screen.data)
+    return time.perf_counter() - start
+
+
+def run(sizes=SIZES) -> None:
+    app = QApplication.instance() or QApplication([])
+    print(
+        f"target: {EDIT_LATENCY_TARGET_MS} ms per edit"
+        f" up to {EDIT_LATENCY_TARGET_ROWS} rows"
+    )
+    print(
+        f"{'rows':>8} {'edit (ms)':>10} {'paste (ms)':>11}"
+        f" {'per-cell paste (ms)':>20} {'target':>7}"
+    )
+    for size in sizes:
+        dm = DataManager()
+        dm.add_dataset(
+            "bench", FourZeroOneK.from_arrays([100.0] * size, 0.005).to_dict()
+        )
+        screen = GraphScreen(dm)
+        screen.resize(800, 600)
+        screen.set_data(dm.get_dataset("bench"), name="bench")
+        screen.canvas.draw()
+        app.processEvents()
+
+        middle = size // 2
+        paste = range(middle, middle + PASTE)
+        edit = min(_edit(app, screen, [middle], value) for value in (1.0, 2.0, 3.0))
+        pasted = min(_edit(app, screen, paste, value) for value in (4.0, 5.0, 6.0))
+        synchronous = _synchronous_paste(screen, paste, 7.0)
+        if size > EDIT_LATENCY_TARGET_ROWS:
+            verdict = "-"
+        elif max(edit, pasted) * 1e3 <= EDIT_LATENCY_TARGET_MS:
+            verdict = "met"
+        else:
+            verdict = "missed"
+        print(
+            f"{size:>8} {edit * 1e3:>10.1f} {pasted * 1e3:>11.1f}"
+            f" {synchronous * 1e3:>20.1f} {verdict:>7}"
+        )
+        screen.deleteLater()
+
+
+if __name__ == "__main__":  # pragma: no cover - manual benchmark
+    run()
@@ -0,0 +1,86 @@
+"""Compare the columnar :class:`FourZeroOneK` with the old list-of-entries model.
+
+Run with ``python -m benchmarks.bench_four_zero_one_k``.  For each plan size
+the script times an edit of the first month (which invalidates every later
+balance) three ways: the original pure-Python recompute loop, the columnar
+engine followed by a read of the full balance column, and the columnar
+engine followed by a single ``balance_at`` lookup served by the affine tree.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from money_metrics.core.four_zero_one_k import FourZeroOneK
+
+SIZES = (10_000, 100_000, 1_000_000)
+
+
+@dataclass
+class _LegacyEntry:
+    month: int
+    contribution: float
+    growth_rate: float
+    balance: float
+
+
+def _legacy_recalculate(entries, start):
+    """The interpreted loop used before the columnar engine."""
+
+    prev_balance = entries[start - 1].balance if start > 0 else 0.0
+    for i in range(start, len(entries)):
+        entry = entries[i]
+        entry.month = i + 1
+        entry.balance = (prev_balance + entry.contribution) * (1 + entry.growth_rate)
+        prev_balance = entry.balance
+
+
+def _best_of(func, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes=SIZES) -> None:
+    rng = np.random.default_rng(0)
+    print(
+        f"{'rows':>10} {'legacy (s)':>12} {'columnar (s)':>14} {'speedup':>9}"
+        f" {'point read (s)':>15} {'speedup':>9}"
+    )
+    for size in sizes:
+        contributions = rng.uniform(0, 500, size)
+        growth = rng.normal(0.0, 0.01, size)
+
+        legacy = [
+            _LegacyEntry(i + 1, c, g, 0.0)
+            for i, (c, g) in enumerate(zip(contributions.tolist(), growth.tolist()))
+        ]
+        plan = FourZeroOneK.from_arrays(contributions, growth)
+
+        def edit_and_read_column():
+            plan.modify_month(1, contribution=1.0)
+            return plan.balances
+
+        def edit_and_read_last():
+            plan.modify_month(1, contribution=2.0)
+            return plan.balance_at(size)
+
+        edit_and_read_last()  # build the affine tree outside the timing
+        legacy_time = _best_of(lambda: _legacy_recalculate(legacy, 0))
+        column_time = _best_of(edit_and_read_column)
+        point_time = _best_of(edit_and_read_last)
+        print(
+            f"{size:>10} {legacy_time:>12.4f} {column_time:>14.4f}"
+            f" {legacy_time / column_time:>8.1f}x {point_time:>15.6f}"
+            f" {legacy_time / point_time:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":  # pragma: no cover - manual benchmark
+    run()
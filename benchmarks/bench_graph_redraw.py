@@ -0,0 +1,91 @@
+"""Measure GraphScreen redraw latency after a single-cell edit.
+
+Run with ``python -m benchmarks.bench_graph_redraw`` (set
+``QT_QPA_PLATFORM=offscreen`` on machines without a display).  For each
+series length the script edits one balance of a dataset held by the data
+manager, through ``DataManager.update_cells`` as the application does, and
+times the redraw two ways: the previous approach of clearing the figure,
+re-plotting every parameter and drawing the whole canvas, and the screen's
+own refresh, which moves the persistent lines with ``set_data`` and blits
+them over a cached background.
+"""
+
+from __future__ import annotations
+
+import time
+
+from PySide6.QtWidgets import QApplication
+
+from money_metrics.core.data_manager import DataManager
+from money_metrics.ui.graph_screen import GraphScreen
+
+SIZES = (1_000, 10_000, 100_000)
+
+
+def _best_of(func, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _legacy_redraw(screen, data):
+    """The clear-and-replot rendering used before persistent artists."""
+
+    fig = screen.canvas.figure
+    fig.clear()
+    ax = fig.add_subplot(111)
+    months = [d.get("month", i + 1) for i, d in enumerate(data)]
+    for param in screen._parameters:
+        ax.plot(months, [d.get(param, 0) for d in data], marker="o", label=param)
+    ax.set_xlabel("Month")
+    ax.set_ylabel("Value")
+    ax.legend()
+    screen.canvas.draw()
+
+
+def run(sizes=SIZES) -> None:
+    app = QApplication.instance() or QApplication([])
+    print(f"{'points':>8} {'replot (ms)':>12} {'blit (ms)':>10} {'speedup':>8}")
+    for size in sizes:
+        data = [
+            {"month": m, "contribution": 100.0, "growth_rate": 0.0, "balance": 100.0 * m}
+            for m in range(1, size + 1)
+        ]
+        dm = DataManager()
+        dm.add_dataset("bench", data)
+        screen = GraphScreen(dm)
+        screen.resize(800, 600)
+        screen.show_dataset("bench")
+        screen.canvas.draw()
+        app.processEvents()
+
+        def edit(value):
+            dm.update_cells("bench", {size // 2: {"balance": value}})
+
+        def legacy():
+            edit(1.0)
+            _legacy_redraw(screen, dm.view("bench"))
+
+        def incremental():
+            edit(2.0)
+            # Apply the published change now instead of on the next frame.
+            screen._apply_pending_changes()
+            app.processEvents()
+
+        legacy_time = _best_of(legacy)
+        screen._ax = None  # rebuild the persistent artists after the legacy runs
+        screen._update_graph(screen.data)
+        screen.canvas.draw()
+        incremental_time = _best_of(incremental)
+        print(
+            f"{size:>8} {legacy_time * 1e3:>12.1f} {incremental_time * 1e3:>10.1f}"
+            f" {legacy_time / incremental_time:>7.1f}x"
+        )
+        screen.deleteLater()
+
+
+if __name__ == "__main__":  # pragma: no cover - manual benchmark
+    run()
@@ -0,0 +1,71 @@
+"""Measure GraphScreen zoom latency on long series.
+
+Run with ``python -m benchmarks.bench_graph_zoom`` (set
+``QT_QPA_PLATFORM=offscreen`` on machines without a display).  For each
+series length the script zooms to successive windows of the series and
+times a full canvas draw two ways: with every point handed to Matplotlib,
+and with the level-of-detail views ``GraphScreen`` re-samples from its
+downsampling pyramid on every x limit change.
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+from PySide6.QtWidgets import QApplication
+
+from money_metrics.core.data_manager import DataManager
+from money_metrics.ui.graph_screen import GraphScreen
+
+SIZES = (100_000, 1_000_000)
+ZOOMS = 5
+
+
+def _windows(size):
+    """Halve the visible range ``ZOOMS`` times around the middle."""
+    middle = size / 2
+    return [(middle - size / 2**k, middle + size / 2**k) for k in range(1, ZOOMS + 1)]
+
+
+def _time_zooms(canvas, ax, size) -> float:
+    start = time.perf_counter()
+    for x0, x1 in _windows(size):
+        ax.set_xlim(x0, x1)
+        canvas.draw()
+    return (time.perf_counter() - start) / ZOOMS
+
+
+def run(sizes=SIZES) -> None:
+    app = QApplication.instance() or QApplication([])
+    print(f"{'points':>9} {'all points (ms)':>16} {'downsampled (ms)':>17} {'speedup':>8}")
+    rng = np.random.default_rng(0)
+    for size in sizes:
+        balances = np.cumsum(rng.normal(size=size))
+        data = [
+            {"month": m, "contribution": 0.0, "growth_rate": 0.0, "balance": b}
+            for m, b in enumerate(balances.tolist(), 1)
+        ]
+        dm = DataManager()
+        dm.add_dataset("bench", data)
+        screen = GraphScreen(dm)
+        screen.resize(800, 600)
+        screen.set_data(dm.get_dataset("bench"), name="bench")
+        screen.canvas.draw()
+        app.processEvents()
+        downsampled = _time_zooms(screen.canvas, screen._ax, size)
+
+        fig = screen.canvas.figure
+        fig.clear()
+        ax = fig.add_subplot(111)
+        ax.plot(np.arange(1, size + 1), balances, label="balance")
+        full = _time_zooms(screen.canvas, ax, size)
+        print(
+            f"{size:>9} {full * 1e3:>16.1f} {downsampled * 1e3:>17.1f}"
+            f" {full / downsampled:>7.1f}x"
+        )
+        screen.deleteLater()
+
+
+if __name__ == "__main__":  # pragma: no cover - manual benchmark
+    run()
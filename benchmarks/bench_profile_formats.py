@@ -0,0 +1,64 @@
+"""Compare the size and speed of the JSON and binary profile formats.
+
+Run with ``python -m benchmarks.bench_profile_formats``.  For each dataset
+size the script saves and loads a profile holding one 401(k) plan as
+indented JSON, as an uncompressed binary profile and as a zlib-compressed
+binary profile, and reports the file size and the best save and load time.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from money_metrics.core.four_zero_one_k import FourZeroOneK
+from money_metrics.core.profile import AppProfile
+
+SIZES = (1_000, 10_000, 100_000)
+
+FORMATS = (
+    ("json", "profile.json", {}),
+    ("binary", "profile.mmp", {"compress": False}),
+    ("binary+zlib", "profile.mmp", {"compress": True}),
+)
+
+
+def _best_of(func, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes=SIZES) -> None:
+    rng = np.random.default_rng(0)
+    print(
+        f"{'rows':>8} {'format':>12} {'size (KiB)':>11} {'save (s)':>9}"
+        f" {'load (s)':>9}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            plan = FourZeroOneK.from_arrays(
+                rng.uniform(0, 500, size), rng.normal(0.005, 0.01, size)
+            )
+            profile = AppProfile(
+                datasets={"401(k)": plan.to_dict()},
+                screens=[{"title": "Plot", "dataset": "401(k)"}],
+            )
+            for label, filename, options in FORMATS:
+                path = os.path.join(tmp, filename)
+                save_time = _best_of(lambda: profile.save_to_file(path, **options))
+                load_time = _best_of(lambda: AppProfile.load_from_file(path))
+                print(
+                    f"{size:>8} {label:>12} {os.path.getsize(path) / 1024:>11.1f}"
+                    f" {save_time:>9.4f} {load_time:>9.4f}"
+                )
+
+
+if __name__ == "__main__":  # pragma: no cover - manual benchmark
+    run()
@@ -0,0 +1,106 @@
+"""Measure UI-thread stalls while several graph screens redraw.
+
+Run with ``python -m benchmarks.bench_render_pool`` (set
+``QT_QPA_PLATFORM=offscreen`` on machines without a display).  ``SCREENS``
+screens over one long dataset are redrawn, first on the UI thread and then
+through a :class:`~money_metrics.ui.render_pool.RenderPool`.  A 1 ms timer
+measures the longest gap between event-loop turns, which is how long input
+would have gone unanswered, along with the time until every screen shows
+the new data.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+import numpy as np
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QApplication
+
+from money_metrics.core.data_manager import DataManager
+from money_metrics.ui.graph_screen import GraphScreen
+from money_metrics.ui.render_pool import RenderPool
+
+SCREENS = 4
+POINTS = 200_000
+
+
+def _measure(app, screens, redraw, done):
+    """Return the longest event-loop gap and the total time of a redraw."""
+    gaps = []
+    last = [time.perf_counter()]
+
+    def tick():
+        now = time.perf_counter()
+        gaps.append(now - last[0])
+        last[0] = now
+
+    timer = QTimer()
+    timer.setInterval(1)
+    timer.timeout.connect(tick)
+    timer.start()
+    start = last[0] = time.perf_counter()
+    redraw()
+    while not done():
+        app.processEvents()
+    total = time.perf_counter() - start
+    timer.stop()
+    tick()
+    return max(gaps), total
+
+
+def run(screens=SCREENS, points=POINTS) -> None:
+    app = QApplication.instance() or QApplication([])
+    balances = np.cumsum(np.random.default_rng(0).normal(size=points)).tolist()
+    dm = DataManager()
+    dm.add_dataset(
+        "bench",
+        [
+            {"month": m, "contribution": 0.0, "growth_rate": 0.0, "balance": b}
+            for m, b in enumerate(balances, 1)
+        ],
+    )
+    data = dm.get_dataset("bench")
+    print(f"{screens} screens, {points} points, {os.cpu_count()} CPUs")
+    print(f"{'mode':>10} {'longest stall (ms)':>19} {'all drawn (ms)':>15}")
+
+    inline = [GraphScreen(dm) for _ in range(screens)]
+    for screen in inline:
+        screen.resize(800, 600)
+        screen.set_data(data, name="bench")
+        screen.canvas.draw()
+
+    def draw_inline():
+        for screen in inline:
+            screen._ax = None  # force a full redraw
+            screen._update_graph(data)
+            screen.canvas.draw()
+
+    stall, total = _measure(app, inline, draw_inline, lambda: True)
+    print(f"{'UI thread':>10} {stall * 1e3:>19.1f} {total * 1e3:>15.1f}")
+
+    pool = RenderPool()
+    pooled = [GraphScreen(dm, render_pool=pool) for _ in range(screens)]
+    for screen in pooled:
+        screen.resize(800, 600)
+        screen.set_data(data, name="bench")
+    pool.wait()
+    app.processEvents()
+
+    def draw_pooled():
+        for screen in pooled:
+            screen.canvas.image = None
+            screen._update_graph(data)
+
+    stall, total = _measure(
+        app,
+        pooled,
+        draw_pooled,
+        lambda: all(s.canvas.image is not None for s in pooled),
+    )
+    print(f"{'pool':>10} {stall * 1e3:>19.1f} {total * 1e3:>15.1f}")
+
+
+if __name__ == "__main__":  # pragma: no cover - manual benchmark
+    run()
@@ -1,15 +1,76 @@
 """Application bootstrap for MoneyMetrics."""
 
+import argparse
+import os
 import sys
-from PySide6.QtWidgets import QApplication
+from PySide6.QtWidgets import QApplication, QMessageBox
 
+from money_metrics.core.journal import ProfileJournal
 from money_metrics.ui.main_window import MainWindow
+from money_metrics.ui.render_pool import RenderPool
+
+DEFAULT_JOURNAL = os.path.join(os.path.expanduser("~"), ".money_metrics", "autosave.jsonl")
 
 
 def main() -> None:
     """Launch the MoneyMetrics GUI."""
-    app = QApplication(sys.argv)
-    window = MainWindow()
+    parser = argparse.ArgumentParser(prog="money_metrics")
+    parser.add_argument(
+        "--data-store",
+        metavar="PATH",
+        help="keep datasets in an SQLite database at PATH instead of in memory",
+    )
+    parser.add_argument(
+        "--autosave",
+        metavar="PATH",
+        nargs="?",
+        const=DEFAULT_JOURNAL,
+        help="journal changes to PATH (default: %(const)s) and offer to "
+        "recover them if MoneyMetrics does not shut down cleanly",
+    )
+    parser.add_argument(
+        "--render-threads",
+        metavar="N",
+        type=int,
+        default=0,
+        help="render graphs on N worker threads so the UI thread stays responsive",
+    )
+    args, qt_args = parser.parse_known_args()
+
+    app = QApplication([sys.argv[0], *qt_args])
+    data_manager = None
+    if args.data_store:
+        from money_metrics.core.sqlite_store import SQLiteDataManager
+
+        data_manager = SQLiteDataManager(args.data_store)
+    journal = profile = None
+    if args.autosave:
+        os.makedirs(os.path.dirname(os.path.abspath(args.autosave)), exist_ok=True)
+        journal = ProfileJournal(args.autosave)
+        # Only a session that did not shut down cleanly leaves changes behind.
+        if journal.needs_recovery() and (
+            QMessageBox.question(
+                None,
+                "MoneyMetrics",
+                "MoneyMetrics did not shut down cleanly. "
+                "Recover the unsaved changes from the previous session?",
+            )
+            == QMessageBox.Yes
+        ):
+            try:
+                profile = journal.recover()
+            except (OSError, ValueError) as exc:
+                QMessageBox.warning(
+                    None,
+                    "MoneyMetrics",
+                    f"Could not recover the previous session, starting afresh:\n{exc}",
+                )
+    render_pool = RenderPool(args.render_threads) if args.render_threads > 0 else None
+    window = MainWindow(
+        profile=profile,
+        data_manager=data_manager,
+        journal=journal,
+        render_pool=render_pool,
+    )
     window.show()
     sys.exit(app.exec())
-
@@ -1,7 +1,7 @@
 """Core utilities for MoneyMetrics."""
 
-from .data_manager import DataManager
+from .data_manager import DataManager, DatasetChange
 from .profile import AppProfile
 from .four_zero_one_k import FourZeroOneK, Entry
 
-__all__ = ["DataManager", "AppProfile", "FourZeroOneK", "Entry"]
+__all__ = ["DataManager", "DatasetChange", "AppProfile", "FourZeroOneK", "Entry"]
@@ -0,0 +1,132 @@
+"""Segment tree of composed affine maps.
+
+Every month of a 401(k) plan transforms the running balance with the affine
+map ``b -> (b + c) * (1 + g)``, i.e. ``b -> a * b + s`` with ``a = 1 + g`` and
+``s = c * (1 + g)``.  Affine maps compose into affine maps, so a segment tree
+whose nodes hold the composition of their children can answer "what is the
+balance after month *k*" and absorb a single-month edit in ``O(log n)``
+instead of walking every later month.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+class AffineTree:
+    """Array-backed segment tree over a sequence of affine maps.
+
+    Leaf ``i`` holds the map ``x -> scale[i] * x + shift[i]``.  Internal
+    nodes store the composition "left child, then right child", so the root
+    describes the whole sequence applied in order.  Unused leaves hold the
+    identity map, which lets the tree grow by doubling its capacity.
+    """
+
+    def __init__(self, scale=(), shift=()):
+        scale = np.asarray(scale, dtype=np.float64)
+        shift = np.asarray(shift, dtype=np.float64)
+        if scale.shape != shift.shape or scale.ndim != 1:
+            raise ValueError("scale and shift must be 1-D arrays of equal length")
+        self._size = len(scale)
+        capacity = 1
+        while capacity < max(self._size, 1):
+            capacity *= 2
+        self._build(capacity, scale, shift)
+
+    @classmethod
+    def from_months(cls, contributions, growth_rates) -> "AffineTree":
+        """Build the tree for a plan's contribution and growth columns."""
+
+        factors = 1.0 + np.asarray(growth_rates, dtype=np.float64)
+        return cls(factors, np.asarray(contributions, dtype=np.float64) * factors)
+
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return self._size
+
+    def update(self, index: int, scale: float, shift: float) -> None:
+        """Replace the map at ``index`` and refresh its ancestors."""
+
+        if not 0 <= index < self._size:
+            raise IndexError("leaf index out of range")
+        self._set_leaf(index, scale, shift)
+
+    def update_month(self, index: int, contribution: float, growth_rate: float) -> None:
+        """Replace leaf ``index`` with the map for one month of a plan."""
+
+        factor = 1.0 + growth_rate
+        self.update(index, factor, contribution * factor)
+
+    def append(self, scale: float, shift: float) -> None:
+        """Add a map after the last leaf, doubling the capacity if needed."""
+
+        if self._size == self._capacity:
+            scale_leaves = self._scale[self._capacity :].copy()
+            shift_leaves = self._shift[self._capacity :].copy()
+            self._build(self._capacity * 2, scale_leaves, shift_leaves)
+        self._size += 1
+        self._set_leaf(self._size - 1, scale, shift)
+
+    def prefix(self, count: int) -> tuple[float, float]:
+        """Return ``(scale, shift)`` of the first ``count`` maps composed."""
+
+        if not 0 <= count <= self._size:
+            raise IndexError("prefix length out of range")
+        left_a, left_b = 1.0, 0.0
+        right_a, right_b = 1.0, 0.0
+        lo = self._capacity
+        hi = self._capacity + count
+        scale, shift = self._scale, self._shift
+        while lo < hi:
+            if lo & 1:
+                # left accumulator, then node ``lo``
+                left_a, left_b = scale[lo] * left_a, scale[lo] * left_b + shift[lo]
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                # node ``hi``, then right accumulator
+                right_a, right_b = right_a * scale[hi], right_a * shift[hi] + right_b
+            lo >>= 1
+            hi >>= 1
+        return float(right_a * left_a), float(right_a * left_b + right_b)
+
+    def evaluate(self, count: int, initial: float = 0.0) -> float:
+        """Apply the first ``count`` maps to ``initial``."""
+
+        scale, shift = self.prefix(count)
+        return scale * initial + shift
+
+    # ------------------------------------------------------------------
+    def _build(self, capacity: int, scale: np.ndarray, shift: np.ndarray) -> None:
+        self._capacity = capacity
+        self._scale = np.ones(2 * capacity, dtype=np.float64)
+        self._shift = np.zeros(2 * capacity, dtype=np.float64)
+        self._scale[capacity : capacity + len(scale)] = scale
+        self._shift[capacity : capacity + len(shift)] = shift
+        # Combine one level at a time so construction is vectorised.
+        lo = capacity // 2
+        with np.errstate(over="ignore", invalid="ignore"):
+            while lo >= 1:
+                hi = 2 * lo
+                left = slice(2 * lo, 2 * hi, 2)
+                right = slice(2 * lo + 1, 2 * hi, 2)
+                self._scale[lo:hi] = self._scale[right] * self._scale[left]
+                self._shift[lo:hi] = (
+                    self._scale[right] * self._shift[left] + self._shift[right]
+                )
+                lo //= 2
+
+    def _set_leaf(self, index: int, scale: float, shift: float) -> None:
+        node = self._capacity + index
+        self._scale[node] = scale
+        self._shift[node] = shift
+        node //= 2
+        s, t = self._scale, self._shift
+        while node >= 1:
+            left, right = 2 * node, 2 * node + 1
+            s[node] = s[right] * s[left]
+            t[node] = s[right] * t[left] + t[right]
+            node //= 2
+
+
+__all__ = ["AffineTree"]
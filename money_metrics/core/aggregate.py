@@ -0,0 +1,165 @@
+"""Derived datasets combining several :class:`DataManager` datasets.
+
+:class:`AggregateDataset` stores the month-aligned sum of one column across
+several source datasets (for example the balances of a 401(k), an HSA and a
+brokerage account) as a regular dataset, so it can be graphed like any
+other.  It listens to the manager's change notifications and keeps the sum
+up to date incrementally: a cell edit in one account only rewrites the
+aggregate rows of the months it touched, re-summed from the source rows of
+those months so that rounding errors do not build up over many edits.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Iterable, List
+
+
+def _number(value) -> float:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return value if math.isfinite(value) else 0.0
+
+
+class AggregateDataset:
+    """Month-aligned sum of ``column`` over ``sources``, stored as ``name``.
+
+    Parameters
+    ----------
+    data_manager: DataManager
+        Manager holding the sources; the aggregate is stored there too.
+    name: str
+        Name of the aggregate dataset.
+    sources: Iterable[str]
+        Datasets to combine. They are lists of row dicts with a ``month``
+        column (the row position is used otherwise). Missing sources simply
+        contribute nothing until they are added.
+    column: str, optional
+        Column summed per month. Defaults to ``"balance"``.
+
+    The aggregate rows are ``{"month": m, column: total}`` sorted by month.
+    Call :meth:`close` to stop tracking the sources; :meth:`to_dict` returns
+    the keyword arguments to build the aggregate again, e.g. from a profile.
+    """
+
+    def __init__(self, data_manager, name: str, sources: Iterable[str], column="balance"):
+        self.data_manager = data_manager
+        self.name = name
+        self.sources: List[str] = list(sources)
+        self.column = column
+        if name in self.sources:
+            raise ValueError("an aggregate cannot include itself")
+        # Per source: the (month, value) of every row, the rows of each month
+        # and the sum per month.
+        self._rows: Dict[str, List[tuple]] = {}
+        self._members: Dict[str, Dict[int, List[int]]] = {}
+        self._by_month: Dict[str, Dict[int, float]] = {}
+        self._months: List[int] = []
+        self._index: Dict[int, int] = {}
+        for source in self.sources:
+            self._load_source(source)
+        self._rewrite()
+        self._token = data_manager.subscribe(self._on_change)
+
+    def close(self) -> None:
+        """Stop following changes to the sources."""
+        self.data_manager.unsubscribe(self._token)
+
+    def total(self, month: int) -> float:
+        """Return the aggregate value for ``month``."""
+        return math.fsum(values.get(month, 0.0) for values in self._by_month.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the ``sources`` and ``column`` the aggregate is built from."""
+        return {"sources": list(self.sources), "column": self.column}
+
+    # ------------------------------------------------------------------
+    def _load_source(self, source: str) -> None:
+        data = self.data_manager.view(source)
+        rows = []
+        members: Dict[int, List[int]] = {}
+        if isinstance(data, list):
+            for i, row in enumerate(data):
+                if not isinstance(row, dict):
+                    # Keeps row positions aligned; such rows never count.
+                    rows.append(None)
+                    continue
+                month = int(row.get("month", i + 1))
+                rows.append((month, _number(row.get(self.column))))
+                members.setdefault(month, []).append(i)
+        self._rows[source] = rows
+        self._members[source] = members
+        self._by_month[source] = {}
+        for month in members:
+            self._sum_month(source, month)
+
+    def _sum_month(self, source: str, month: int) -> None:
+        """Re-sum ``month`` of ``source`` from its rows."""
+        members = self._members[source].get(month)
+        if members:
+            rows = self._rows[source]
+            self._by_month[source][month] = math.fsum(rows[i][1] for i in members)
+        else:
+            self._members[source].pop(month, None)
+            self._by_month[source].pop(month, None)
+
+    def _rewrite(self) -> None:
+        """Store the whole aggregate, used when the set of months changes."""
+        months = set()
+        for values in self._by_month.values():
+            months.update(values)
+        self._months = sorted(months)
+        self._index = {month: i for i, month in enumerate(self._months)}
+        self.data_manager.add_dataset(
+            self.name,
+            [{"month": m, self.column: self.total(m)} for m in self._months],
+            replace=True,
+        )
+
+    def _on_change(self, change) -> None:
+        if change.name not in self.sources:
+            return
+        if change.kind != "updated":
+            self._load_source(change.name)
+            self._rewrite()
+            return
+        if not {"month", self.column} & set(change.columns):
+            return
+
+        view = self.data_manager.view(change.name)
+        rows = self._rows[change.name]
+        members = self._members[change.name]
+        affected = set()
+        for index in change.rows:
+            if rows[index] is None:
+                continue
+            old_month = rows[index][0]
+            row = view[index]
+            month = int(row.get("month", index + 1))
+            rows[index] = (month, _number(row.get(self.column)))
+            affected.add(month)
+            if month != old_month:
+                # The row moved to another month.
+                members[old_month].remove(index)
+                members.setdefault(month, []).append(index)
+                affected.add(old_month)
+        for month in affected:
+            self._sum_month(change.name, month)
+
+        if not affected.issubset(self._index) or any(
+            not any(month in values for values in self._by_month.values())
+            for month in affected
+        ):
+            # Months appeared or disappeared, so the row layout changed.
+            self._rewrite()
+            return
+        self.data_manager.update_cells(
+            self.name,
+            {self._index[m]: {self.column: self.total(m)} for m in sorted(affected)},
+            source=self,
+        )
+
+
+__all__ = ["AggregateDataset"]
@@ -0,0 +1,60 @@
+"""Atomic file replacement.
+
+Writers open a temporary file next to the destination and rename it over
+the destination only once everything has been written and flushed to disk.
+A crash or error mid-write therefore leaves the previous file intact, and
+readers never see a half-written file.  The replacement keeps the
+permissions of the file it replaces, and a new file gets the usual
+permissions for the process umask.
+"""
+
+from __future__ import annotations
+
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
+
+# Read once: os.umask can only be read by setting it, which is not thread-safe.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _file_mode(path: str) -> int:
+    """Permissions for a file written to ``path``."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+@contextmanager
+def atomic_write(path, mode: str = "w", **kwargs):
+    """Open a temporary file that replaces ``path`` when the block succeeds.
+
+    ``mode`` and ``kwargs`` are passed to :func:`open`, e.g.
+    ``atomic_write(path, "w", encoding="utf-8")``.
+    """
+
+    path = os.fspath(path)
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        # mkstemp creates the file readable by its owner only.
+        os.chmod(tmp, _file_mode(path))
+        with open(fd, mode, **kwargs) as fh:
+            yield fh
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+__all__ = ["atomic_write"]
@@ -0,0 +1,312 @@
+"""Compact binary profile container.
+
+JSON profiles render every float as text.  The binary container keeps the
+screen layout in a small JSON header and stores each dataset as binary
+blobs, split into content-addressed, optionally zlib-compressed chunks::
+
+    b"MMPROF\\x00\\x02"            magic and format version
+    uint64                         header length in bytes
+    header                         JSON: version, screens, aggregates, dataset
+                                   names, the encoding and chunk hashes of
+                                   each blob and the offset and length of
+                                   each chunk
+    chunks ...
+
+Chunks are identified by the SHA-256 of their uncompressed bytes and stored
+once, so near-identical datasets (scenario copies of the same plan, say)
+share their unchanged chunks and the file grows with its unique content.
+Re-saving over an existing profile copies the compressed bytes of chunks it
+already contains instead of compressing them again.
+
+Tabular datasets (lists of row dicts sharing one key order) are stored column
+by column: integer, float and boolean columns as little-endian binary arrays,
+anything else as a JSON list.  Other datasets are stored as JSON.  Integers
+stay integers and floats stay floats, so a profile round-trips losslessly
+with the JSON format.
+
+:class:`BinaryProfile` mirrors :class:`~money_metrics.core.profile.LazyProfile`:
+opening a file reads the header only and memory-maps the rest, so datasets
+are decoded on demand and only the chunks they use are read.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .atomic import atomic_write
+from .profile import AppProfile
+
+MAGIC = b"MMPROF\x00\x02"
+EXTENSION = ".mmp"
+_LENGTH = struct.Struct("<Q")
+# Uncompressed bytes per chunk (8192 values of a float column).
+CHUNK_SIZE = 64 * 1024
+
+
+def is_binary_profile(path: str) -> bool:
+    """Return ``True`` if ``path`` starts with the binary profile magic."""
+    try:
+        with open(path, "rb") as fh:
+            return fh.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class _Payload:
+    """Read-only memory map of the chunks of a binary profile.
+
+    The map keeps the file open, so the profile stays readable even if the
+    file is replaced or deleted before every dataset has been loaded.
+    """
+
+    def __init__(self, fh, offset: int):
+        self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._offset = offset
+
+    def read(self, offset: int, length: int) -> bytes:
+        start = self._offset + offset
+        return self._map[start : start + length]
+
+    def close(self) -> None:
+        self._map.close()
+
+
+def _read(path: str):
+    """Return the header and the mapped chunk payload of a binary profile."""
+    with open(path, "rb") as fh:
+        if fh.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a MoneyMetrics binary profile")
+        (length,) = _LENGTH.unpack(fh.read(_LENGTH.size))
+        header = json.loads(fh.read(length))
+        payload = _Payload(fh, fh.tell())
+    return header, payload
+
+
+@dataclass(frozen=True)
+class SaveStats:
+    """Chunk counts reported by :func:`write_profile`."""
+
+    chunks: int
+    unique: int
+    reused: int
+
+
+def _column_dtype(values: list) -> str | None:
+    """Binary dtype able to hold ``values`` exactly, or ``None``."""
+    kinds = {type(v) for v in values}
+    if kinds == {float}:
+        return "<f8"
+    if kinds == {bool}:
+        return "|b1"
+    if kinds == {int} and all(-(2**63) <= v < 2**63 for v in values):
+        return "<i8"
+    return None
+
+
+def _is_table(data) -> bool:
+    if not (isinstance(data, list) and data and isinstance(data[0], dict)):
+        return False
+    keys = list(data[0])
+    return all(isinstance(row, dict) and list(row) == keys for row in data)
+
+
+def _encode(data) -> tuple[dict, list[bytes]]:
+    """Split a dataset into a description and its raw blobs."""
+    if _is_table(data):
+        columns = []
+        blobs = []
+        for key in data[0]:
+            values = [row[key] for row in data]
+            dtype = _column_dtype(values)
+            if dtype is None:
+                blobs.append(json.dumps(values).encode("utf-8"))
+                dtype = "json"
+            else:
+                blobs.append(np.asarray(values, dtype=dtype).tobytes())
+            columns.append({"name": key, "dtype": dtype})
+        return {"encoding": "table", "rows": len(data), "columns": columns}, blobs
+    return {"encoding": "json"}, [json.dumps(data).encode("utf-8")]
+
+
+def _decode(spec: dict, blobs: List[bytes]) -> Any:
+    if spec["encoding"] == "json":
+        return json.loads(blobs[0])
+    columns = []
+    for column, blob in zip(spec["columns"], blobs):
+        if column["dtype"] == "json":
+            columns.append(json.loads(blob))
+        else:
+            columns.append(np.frombuffer(blob, dtype=column["dtype"]).tolist())
+    names = [column["name"] for column in spec["columns"]]
+    if not names:
+        return [{} for _ in range(spec["rows"])]
+    return [dict(zip(names, values)) for values in zip(*columns)]
+
+
+def _previous_chunks(path: str, compress: bool):
+    """Chunk index and payload of an existing profile at ``path``, if usable."""
+    if not (os.path.exists(path) and is_binary_profile(path)):
+        return {}, None
+    try:
+        header, payload = _read(path)
+    except (OSError, ValueError):
+        return {}, None
+    if (header.get("compression") == "zlib") != compress or "format" not in header:
+        payload.close()
+        return {}, None
+    return header["chunks"], payload
+
+
+def _encode_profile(profile: AppProfile, compress, old_chunks, old_payload, progress):
+    """Chunk every dataset of ``profile``, reusing chunks of ``old_payload``."""
+    chunks: Dict[str, list] = {}
+    datasets = {}
+    payload: List[bytes] = []
+    offset = count = reused = 0
+    total = len(profile.datasets)
+    for done, (name, data) in enumerate(profile.datasets.items(), 1):
+        spec, blobs = _encode(data)
+        spec["blobs"] = []
+        for blob in blobs:
+            keys = []
+            for start in range(0, max(len(blob), 1), CHUNK_SIZE):
+                piece = blob[start : start + CHUNK_SIZE]
+                key = hashlib.sha256(piece).hexdigest()
+                keys.append(key)
+                count += 1
+                if key in chunks:
+                    continue
+                if key in old_chunks:
+                    piece = old_payload.read(*old_chunks[key])
+                    reused += 1
+                elif compress:
+                    piece = zlib.compress(piece, 6)
+                chunks[key] = [offset, len(piece)]
+                payload.append(piece)
+                offset += len(piece)
+            spec["blobs"].append(keys)
+        datasets[name] = spec
+        if progress is not None:
+            progress(done, total)
+    return chunks, datasets, payload, count, reused
+
+
+def write_profile(
+    path: str, profile: AppProfile, compress: bool = True, progress=None
+) -> SaveStats:
+    """Write ``profile`` to ``path`` in the binary container format.
+
+    ``progress(done, total)`` is called after each dataset is encoded.
+    Returns how many chunks were written, how many of them were unique and
+    how many were copied from the profile previously stored at ``path``.
+    """
+    old_chunks, old_payload = _previous_chunks(path, compress)
+    try:
+        chunks, datasets, payload, count, reused = _encode_profile(
+            profile, compress, old_chunks, old_payload, progress
+        )
+    finally:
+        # Unmapped before the file is replaced.
+        if old_payload is not None:
+            old_payload.close()
+
+    header = json.dumps(
+        {
+            "version": profile.version,
+            "screens": profile.screens,
+            "aggregates": profile.aggregates,
+            "dataset_names": list(profile.datasets),
+            "compression": "zlib" if compress else None,
+            "format": 2,
+            "datasets": datasets,
+            "chunks": chunks,
+        }
+    ).encode("utf-8")
+    with atomic_write(path, "wb") as fh:
+        fh.write(MAGIC)
+        fh.write(_LENGTH.pack(len(header)))
+        fh.write(header)
+        for piece in payload:
+            fh.write(piece)
+    return SaveStats(count, len(chunks), reused)
+
+
+class BinaryProfile:
+    """Binary profile whose datasets are decoded on demand.
+
+    Offers the same interface as :class:`~money_metrics.core.profile.LazyProfile`.
+    The file stays mapped until every dataset has been loaded.
+    """
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        header, self._payload = _read(path)
+        self._chunks: Dict[str, list] = header["chunks"]
+        self._lock = threading.Lock()
+        self._specs: Dict[str, dict] = header["datasets"]
+        self._compressed = header.get("compression") == "zlib"
+        self._parsed: Dict[str, Any] = {}
+        self._taken: set = set()
+        self.version = header.get("version", 1)
+        self.screens: List[Dict[str, Any]] = header.get("screens", [])
+        self.aggregates: Dict[str, Dict[str, Any]] = header.get("aggregates", {})
+        self.dataset_names: List[str] = header.get("dataset_names", list(self._specs))
+
+    def is_parsed(self, name: str) -> bool:
+        """Return ``True`` if ``name`` has been decoded already."""
+        return name in self._parsed
+
+    def prefetch(self, name: str) -> None:
+        """Decode dataset ``name`` so a later :meth:`load_dataset` is instant."""
+        with self._lock:
+            if name in self._parsed or name in self._taken:
+                return
+            spec = self._specs[name]
+            blobs = [b"".join(map(self._chunk, keys)) for keys in spec["blobs"]]
+            self._parsed[name] = _decode(spec, blobs)
+
+    def _chunk(self, key: str) -> bytes:
+        offset, length = self._chunks[key]
+        piece = self._payload.read(offset, length)
+        return zlib.decompress(piece) if self._compressed else piece
+
+    def load_dataset(self, name: str) -> Any:
+        """Return dataset ``name``, handing over (and forgetting) its data."""
+        self.prefetch(name)
+        with self._lock:
+            if name in self._taken:
+                raise KeyError(f"Dataset '{name}' has already been loaded")
+            self._taken.add(name)
+            if len(self._taken) == len(self._specs):
+                self._payload.close()
+            return self._parsed.pop(name)
+
+    def to_profile(self) -> AppProfile:
+        """Decode every dataset into a regular :class:`AppProfile`."""
+        datasets = {name: self.load_dataset(name) for name in self.dataset_names}
+        profile = AppProfile(
+            datasets=datasets, screens=self.screens, aggregates=self.aggregates
+        )
+        profile.version = self.version
+        return profile
+
+
+__all__ = [
+    "BinaryProfile",
+    "CHUNK_SIZE",
+    "EXTENSION",
+    "MAGIC",
+    "SaveStats",
+    "is_binary_profile",
+    "write_profile",
+]
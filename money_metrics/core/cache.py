@@ -0,0 +1,176 @@
+"""Memory-budgeted LRU cache for derived and rendered artifacts.
+
+Derived series, downsampled plot data and rendered figures are cheaper to
+keep than to recompute, but only up to a point.  :class:`ArtifactCache`
+stores them under ``(dataset, version, params)`` keys, sizes every entry by
+its byte footprint and evicts the least recently used entries once the
+total exceeds the budget.  Because the dataset version is part of the key, a
+changed dataset never serves stale results; :meth:`ArtifactCache.invalidate`
+frees the superseded entries early.
+
+Most callers use the process-wide :func:`shared_cache`.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+
+import numpy as np
+
+# Default budget of the shared cache.
+DEFAULT_BUDGET = 64 * 1024 * 1024
+
+_MISSING = object()
+
+
+def sizeof(value: Any) -> int:
+    """Approximate the number of bytes held by ``value``.
+
+    NumPy arrays count their buffers; lists, tuples, sets and dicts are
+    sized recursively.
+    """
+
+    if isinstance(value, np.ndarray):
+        # Views share their base's memory but are counted in full, erring on
+        # the side of evicting too early.
+        return sys.getsizeof(value) + (0 if value.flags.owndata else value.nbytes)
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(sizeof(k) + sizeof(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(sizeof(v) for v in value)
+    return size
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Counters reported by :meth:`ArtifactCache.stats`."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+    budget: int
+
+
+class ArtifactCache:
+    """Thread-safe LRU cache bounded by the byte size of its entries.
+
+    Parameters
+    ----------
+    budget: int, optional
+        Maximum total size of the cached entries in bytes. An entry larger
+        than the whole budget is not cached at all.
+
+    Keys are ``(dataset, version, params)`` tuples where ``params`` is any
+    hashable description of how the artifact was derived.
+    """
+
+    def __init__(self, budget: int = DEFAULT_BUDGET):
+        self.budget = budget
+        self._entries: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    # ------------------------------------------------------------------
+    def get(self, key: tuple, default=None):
+        """Return the entry for ``key`` and mark it as recently used."""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self._misses += 1
+                return default
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: tuple, value, size: int | None = None) -> None:
+        """Store ``value`` under ``key``, evicting old entries as needed.
+
+        ``size`` overrides the estimate from :func:`sizeof`.
+        """
+        size = sizeof(value) if size is None else size
+        with self._lock:
+            self._discard(key)
+            if size > self.budget:
+                return
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.budget:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self._evictions += 1
+
+    def get_or_compute(self, key: tuple, compute: Callable[[], Any]):
+        """Return the entry for ``key``, calling ``compute()`` on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def invalidate(self, dataset: Hashable = None, keep_version=_MISSING) -> int:
+        """Drop the entries of ``dataset`` (all entries if ``None``).
+
+        If ``keep_version`` is given, entries for that version survive.
+        Returns the number of entries removed.
+        """
+        with self._lock:
+            stale = [
+                key
+                for key in self._entries
+                if (dataset is None or key[0] == dataset)
+                and (keep_version is _MISSING or key[1] != keep_version)
+            ]
+            for key in stale:
+                self._discard(key)
+            return len(stale)
+
+    def clear(self) -> None:
+        """Remove every entry; the statistics are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> CacheStats:
+        """Return hit, miss and eviction counts and the current footprint."""
+        with self._lock:
+            return CacheStats(
+                self._hits,
+                self._misses,
+                self._evictions,
+                len(self._entries),
+                self._bytes,
+                self.budget,
+            )
+
+    # ------------------------------------------------------------------
+    def _discard(self, key) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+
+_shared = ArtifactCache()
+
+
+def shared_cache() -> ArtifactCache:
+    """Return the process-wide cache used by queries and graph screens."""
+    return _shared
+
+
+__all__ = ["ArtifactCache", "CacheStats", "DEFAULT_BUDGET", "shared_cache", "sizeof"]
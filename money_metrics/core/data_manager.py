@@ -1,4 +1,191 @@
 import copy
+import inspect
+import sys
+import threading
+import weakref
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import numpy as np
+
+
+def _readonly(self, *args, **kwargs):
+    raise TypeError("dataset views are read-only; use get_dataset() for a copy")
+
+
+class _FrozenList(list):
+    """List that rejects mutation, used for stored datasets."""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+
+    def __reduce_ex__(self, protocol):
+        return (_FrozenList, (list(self),))
+
+
+class _FrozenDict(dict):
+    """Dict that rejects mutation, used for stored datasets."""
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce_ex__(self, protocol):
+        return (_FrozenDict, (dict(self),))
+
+
+_SCALARS = (int, float, complex, str, bytes, bool, type(None))
+
+
+def _freeze(obj):
+    """Return a read-only deep copy of ``obj``.
+
+    Lists and dicts become read-only subclasses so views still compare equal
+    to, and serialise like, the original data.
+    """
+    if isinstance(obj, _SCALARS) or isinstance(obj, (_FrozenList, _FrozenDict)):
+        return obj
+    if isinstance(obj, list):
+        return _FrozenList(_freeze(v) for v in obj)
+    if isinstance(obj, dict):
+        return _FrozenDict((k, _freeze(v)) for k, v in obj.items())
+    if isinstance(obj, tuple):
+        return tuple(_freeze(v) for v in obj)
+    if isinstance(obj, (set, frozenset)):
+        return frozenset(obj)
+    if isinstance(obj, np.ndarray):
+        frozen = obj.copy()
+        frozen.flags.writeable = False
+        return frozen
+    return copy.deepcopy(obj)
+
+
+def _unshared_refs():
+    """References to a stored list held only by its store and one local."""
+    store = {None: _FrozenList()}
+    frozen = store[None]
+    return sys.getrefcount(frozen)
+
+
+# Without reference counts (e.g. on PyPy) stored lists are always copied.
+_UNSHARED_REFS = _unshared_refs() if hasattr(sys, "getrefcount") else None
+
+
+def _replace_rows(store, name, rows):
+    """Replace the frozen rows in ``rows`` (keyed by index) of ``store[name]``.
+
+    Views handed out earlier must not change, so the list is copied first
+    if anything else still references it, such as a snapshot being saved.
+    Otherwise only the changed rows are written, in place; numpy's
+    ``ndarray.resize`` makes the same reference check.
+    """
+    frozen = store[name]
+    if _UNSHARED_REFS is None or sys.getrefcount(frozen) > _UNSHARED_REFS:
+        frozen = store[name] = _FrozenList(frozen)
+    for index, row in rows.items():
+        list.__setitem__(frozen, index, row)
+
+
+def _thaw(obj):
+    """Return a mutable deep copy of a frozen dataset."""
+    if isinstance(obj, _SCALARS):
+        return obj
+    if isinstance(obj, list):
+        return [_thaw(v) for v in obj]
+    if isinstance(obj, dict):
+        return {k: _thaw(v) for k, v in obj.items()}
+    if isinstance(obj, tuple):
+        return tuple(_thaw(v) for v in obj)
+    if isinstance(obj, frozenset):
+        return set(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.copy()
+    return copy.deepcopy(obj)
+
+
+class _LazyData:
+    """Loader of a lazy dataset, shared by the manager and its snapshots.
+
+    Whichever thread reads the data first calls the loader and the frozen
+    result is kept for the others. A loader that fails is tried again on
+    the next read.
+    """
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._data = None
+
+    def get(self):
+        with self._lock:
+            if self._loader is not None:
+                self._data = _freeze(self._loader())
+                self._loader = None
+            return self._data
+
+
+class _Snapshot(Mapping):
+    """Read-only mapping returned by :meth:`DataManager.snapshot`."""
+
+    def __init__(self, items):
+        self._items = items
+
+    def __getitem__(self, name):
+        value = self._items[name]
+        return value.get() if isinstance(value, _LazyData) else value
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+
+@dataclass(frozen=True)
+class DatasetChange:
+    """Notification that a dataset in a :class:`DataManager` changed.
+
+    ``kind`` is ``"updated"`` for cell edits, in which case ``rows`` and
+    ``columns`` list the touched cells, ``"replaced"`` when the whole dataset
+    (or its column layout) changed and ``"removed"`` when it was deleted.
+    ``source`` is whatever the caller passed to identify itself, so a
+    subscriber can ignore changes it made.  ``rename`` lists the
+    ``(old, new)`` column names of the renames made by
+    :meth:`DataManager.rename_column`, in order: one for the ``"replaced"``
+    change a rename publishes, and all of them once such changes are merged.
+    """
+
+    name: str
+    version: int | None
+    kind: str
+    rows: tuple | None = None
+    columns: tuple | None = None
+    source: Any = None
+    rename: tuple = ()
+
+    def merge(self, later: "DatasetChange") -> "DatasetChange":
+        """Combine this change with a ``later`` one for the same dataset."""
+        if later.name != self.name:
+            raise ValueError("can only merge changes to the same dataset")
+        source = self.source if self.source is later.source else None
+        if self.kind == later.kind == "updated":
+            return DatasetChange(
+                self.name,
+                later.version,
+                "updated",
+                tuple(sorted(set(self.rows) | set(later.rows))),
+                tuple(sorted(set(self.columns) | set(later.columns))),
+                source,
+            )
+        if later.kind == "removed":
+            return DatasetChange(self.name, later.version, "removed", source=source)
+        return DatasetChange(
+            self.name,
+            later.version,
+            "replaced",
+            source=source,
+            rename=self.rename + later.rename,
+        )
 
 
 class DataManager:
@@ -6,13 +193,40 @@ class DataManager:
 
     This class keeps the graph data separate from the UI components. Graph
     screens can query datasets by name when the user chooses to attach data to
-    a graph.  The manager defends its internal state by storing and returning
-    copies of datasets so that callers cannot accidentally mutate what is
-    stored.
+    a graph.
+
+    Each stored dataset is an immutable snapshot tagged with a version number
+    that changes whenever the dataset is replaced.  Readers that only look at
+    the data use :meth:`view` or :meth:`snapshot`, which hand out the stored
+    snapshot without copying it.  Callers that intend to modify a dataset use
+    :meth:`get_dataset`, which returns a private mutable copy, so the copy is
+    only paid for by callers that actually mutate.
+
+    Every change is published as a :class:`DatasetChange` to callbacks
+    registered with :meth:`subscribe`.  :meth:`update_cells` and
+    :meth:`rename_column` edit tabular datasets (lists of row dicts) in place
+    of a full replace, sharing untouched rows with the previous snapshot and
+    reporting exactly which rows and columns changed.
+
+    Datasets registered with :meth:`add_lazy_dataset` are only loaded the
+    first time they are read, which lets a large profile open before its
+    datasets have been parsed.
+
+    :attr:`path` names the file a persistent subclass keeps its datasets in;
+    it is ``None`` while they only live in memory.  :meth:`series_store`
+    returns the plot arrays prepared from the datasets, shared by every
+    graph screen showing them.
     """
 
     def __init__(self):
+        self.path: str | None = None
         self._datasets = {}
+        self._versions = {}
+        self._version_counter = 0
+        self._subscribers: dict[int, tuple[Callable, str | None]] = {}
+        self._next_token = 0
+        self._lazy: dict[str, _LazyData] = {}
+        self._series_store = None
 
     def add_dataset(self, name, data, replace=False):
         """Store a dataset under a given name.
@@ -30,40 +244,262 @@ class DataManager:
 
         Notes
         -----
-        A deep copy of ``data`` is stored to prevent external modification of
-        the internal dataset after it has been added.
+        A read-only copy of ``data`` is stored to prevent external
+        modification of the internal dataset after it has been added.
+        """
+        if not replace and name in self:
+            raise ValueError(f"Dataset '{name}' already exists")
+        # Store a frozen copy so future modifications to the original object
+        # do not alter the stored dataset.
+        self._save(name, _freeze(data))
+        self._bump_version(name)
+        self._publish(DatasetChange(name, self._versions[name], "replaced"))
+
+    def add_lazy_dataset(self, name, loader, replace=False):
+        """Register a dataset whose data is produced by ``loader()`` on first use.
+
+        The dataset is listed by :meth:`names` and gets a version straight
+        away; ``loader`` is called (once) the first time the data is read.
         """
-        if not replace and name in self._datasets:
+        if not replace and name in self:
             raise ValueError(f"Dataset '{name}' already exists")
-        # Store a copy so future modifications to the original object do not
-        # alter the stored dataset.
-        self._datasets[name] = copy.deepcopy(data)
+        self._delete(name)
+        self._lazy[name] = _LazyData(loader)
+        self._bump_version(name)
+        self._publish(DatasetChange(name, self._versions[name], "replaced"))
+
+    def is_loaded(self, name):
+        """Return ``False`` while a lazy dataset has not been loaded yet."""
+        return name not in self._lazy
 
     def remove_dataset(self, name):
         """Remove a dataset if it exists."""
-        self._datasets.pop(name, None)
+        if self._lazy.pop(name, None) is not None or self._delete(name):
+            self._versions.pop(name, None)
+            self._publish(DatasetChange(name, None, "removed"))
 
     def get_dataset(self, name):
-        """Retrieve a dataset by name.
+        """Retrieve a mutable copy of a dataset by name.
 
         Returns
         -------
         Any or ``None``
             A deep copy of the dataset or ``None`` if the dataset is unknown.
         """
-        data = self._datasets.get(name)
-        return None if data is None else copy.deepcopy(data)
+        data = self.view(name)
+        return None if data is None else _thaw(data)
+
+    def view(self, name):
+        """Return a read-only view of a dataset without copying it.
+
+        Lists and dicts in the view raise :class:`TypeError` when modified.
+        Returns ``None`` if the dataset is unknown.
+        """
+        self._materialize(name)
+        return self._datasets.get(name)
+
+    def version(self, name):
+        """Return the current version of a dataset, or ``None`` if unknown.
+
+        Versions are unique across the manager's lifetime, so a dataset that
+        is removed and added again never reuses an earlier version.
+        """
+        return self._versions.get(name)
+
+    def names(self):
+        """Return the names of all stored datasets without touching the data."""
+        return list(self._versions)
+
+    def __contains__(self, name):
+        return name in self._versions
+
+    # ------------------------------------------------------------------
+    def row_count(self, name):
+        """Return the number of rows in a list dataset."""
+        rows = self.view(name)
+        if rows is None:
+            raise KeyError(name)
+        if not isinstance(rows, list):
+            raise TypeError(f"Dataset '{name}' is not a list of rows")
+        return len(rows)
+
+    def get_rows(self, name, start, stop):
+        """Return a mutable copy of rows ``start`` to ``stop`` of a list dataset.
+
+        Table views use this to page through large datasets.
+        """
+        rows = self.view(name)
+        if rows is None:
+            raise KeyError(name)
+        return _thaw(rows[start:stop])
+
+    def update_cells(self, name, changes, source=None):
+        """Update individual cells of a tabular dataset.
+
+        Parameters
+        ----------
+        name: str
+            Dataset to modify. It must be a list of row dicts.
+        changes: Mapping[int, Mapping[str, Any]]
+            New values keyed by row index, then column name.
+        source: Any, optional
+            Identifies the caller in the published :class:`DatasetChange`.
+        """
+        count = self.row_count(name)
+        replaced = {}
+        columns = set()
+        for index, values in changes.items():
+            if not 0 <= index < count:
+                raise IndexError(f"row {index} out of range")
+            row = self._load_row(name, index)
+            if not isinstance(row, dict):
+                raise TypeError(f"Dataset '{name}' is not a list of rows")
+            # The stored row is frozen already; only the new values need it.
+            row = dict(row)
+            row.update((key, _freeze(value)) for key, value in values.items())
+            replaced[index] = _FrozenDict(row)
+            columns.update(values)
+        self._save_rows(name, replaced)
+        self._bump_version(name)
+        self._publish(
+            DatasetChange(
+                name,
+                self._versions[name],
+                "updated",
+                tuple(sorted(changes)),
+                tuple(sorted(columns)),
+                source,
+            )
+        )
+
+    def rename_column(self, name, old, new, source=None):
+        """Rename a column of a tabular dataset, keeping its position."""
+        rows = self.view(name)
+        if rows is None:
+            raise KeyError(name)
+        self._save(
+            name,
+            _FrozenList(
+                _FrozenDict((new if k == old else k, v) for k, v in row.items())
+                for row in rows
+            ),
+        )
+        self._bump_version(name)
+        self._publish(
+            DatasetChange(
+                name,
+                self._versions[name],
+                "replaced",
+                columns=(old, new),
+                source=source,
+                rename=((old, new),),
+            )
+        )
 
     # ------------------------------------------------------------------
     def all_datasets(self):
         """Return a deep copy of all stored datasets.
 
         The returned mapping can be freely modified by callers without
-        affecting the internal state of the manager.  It is primarily used for
-        serialising the application state to a profile.
+        affecting the internal state of the manager.
+        """
+        return {name: self.get_dataset(name) for name in self.names()}
+
+    def snapshot(self):
+        """Return a read-only mapping of every dataset's current view.
+
+        The mapping is unaffected by later changes to the manager, making it
+        a cheap, consistent input for serialising the application state to a
+        profile.  Lazy datasets that have not been loaded yet are loaded
+        when first read from the mapping, which may be on another thread,
+        e.g. the one writing the profile; the manager then reuses the data.
         """
-        return copy.deepcopy(self._datasets)
+        return _Snapshot(
+            {
+                name: self._lazy[name] if name in self._lazy else self.view(name)
+                for name in self.names()
+            }
+        )
 
     def clear(self):
         """Remove all datasets from the manager."""
-        self._datasets.clear()
+        for name in self.names():
+            self.remove_dataset(name)
+
+    def series_store(self):
+        """Return the :class:`~money_metrics.core.series_store.SeriesStore` of
+        this manager, created on first use and shared by all its users.
+        """
+        if self._series_store is None:
+            from .series_store import SeriesStore
+
+            self._series_store = SeriesStore(self)
+        return self._series_store
+
+    # ------------------------------------------------------------------
+    def subscribe(self, callback, name=None, weak=False):
+        """Call ``callback(change)`` for every :class:`DatasetChange`.
+
+        If ``name`` is given only changes to that dataset are delivered.
+        Returns a token for :meth:`unsubscribe`.
+
+        With ``weak`` a bound method ``callback`` is held through a weak
+        reference, so subscribing does not keep its object (a graph screen,
+        say) alive and the subscription lapses once the object is gone.
+        Otherwise the callback is held until it is unsubscribed.
+        """
+        if weak and inspect.ismethod(callback):
+            callback = weakref.WeakMethod(callback)
+        self._next_token += 1
+        self._subscribers[self._next_token] = (callback, name)
+        return self._next_token
+
+    def unsubscribe(self, token):
+        """Stop delivering changes to the subscriber behind ``token``."""
+        self._subscribers.pop(token, None)
+
+    # ------------------------------------------------------------------
+    # Storage hooks.  Subclasses backed by other storage override these
+    # together with :meth:`view`, :meth:`names` and ``__contains__``.
+    def _save(self, name, frozen):
+        self._datasets[name] = frozen
+
+    def _save_rows(self, name, rows):
+        """Replace the frozen rows in ``rows`` (keyed by index)."""
+        _replace_rows(self._datasets, name, rows)
+
+    def _load_row(self, name, index):
+        self._materialize(name)
+        return self._datasets[name][index]
+
+    def _delete(self, name):
+        if name not in self._datasets:
+            return False
+        del self._datasets[name]
+        return True
+
+    def _materialize(self, name):
+        """Load a lazy dataset into storage, keeping its version.
+
+        The loader is only forgotten once its data is stored, so a loader
+        that fails (say, on a truncated file) is tried again on the next read.
+        """
+        lazy = self._lazy.get(name)
+        if lazy is not None:
+            self._save(name, lazy.get())
+            del self._lazy[name]
+
+    def _publish(self, change):
+        for token, (callback, name) in list(self._subscribers.items()):
+            if isinstance(callback, weakref.WeakMethod):
+                callback = callback()
+                if callback is None:
+                    # The subscriber's object has been collected.
+                    self._subscribers.pop(token, None)
+                    continue
+            if name is None or name == change.name:
+                callback(change)
+
+    def _bump_version(self, name):
+        self._version_counter += 1
+        self._versions[name] = self._version_counter
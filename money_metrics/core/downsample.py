@@ -0,0 +1,180 @@
+"""Level-of-detail downsampling for plotting long series.
+
+A line plot cannot show more points than its axis has pixels.  The helpers
+here reduce a series to roughly that many points while keeping its visual
+shape:
+
+* :func:`minmax_downsample` keeps the minimum and maximum of each bucket, so
+  spikes survive and the drawn envelope matches the full series.
+* :func:`lttb` implements Largest-Triangle-Three-Buckets, which picks one
+  representative point per bucket and suits smooth curves.
+* :class:`SeriesPyramid` precomputes min/max levels of increasing coarseness
+  once, so re-sampling a zoomed or panned view costs time proportional to
+  the points shown rather than the length of the series.
+
+``x`` values are expected to be sorted, as months are.
+"""
+
+from __future__ import annotations
+
+from typing import List, Tuple
+
+import numpy as np
+
+# Buckets of one pyramid level are merged this many at a time.
+PYRAMID_FACTOR = 4
+
+
+def _minmax_indices(y: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Sorted indices of the min and max of each bucket beginning at ``starts``."""
+    lows = np.where(np.isnan(y), np.inf, y)
+    highs = np.where(np.isnan(y), -np.inf, y)
+    ends = np.r_[starts[1:], len(y)]
+    mins = np.empty(len(starts), dtype=np.int64)
+    maxs = np.empty(len(starts), dtype=np.int64)
+    # Equal-width buckets (all but possibly the last) are reduced in one go.
+    width = ends[0] - starts[0] if len(starts) else 0
+    full = int(np.sum(ends - starts == width)) if width else 0
+    if full:
+        block = slice(starts[0], starts[0] + full * width)
+        mins[:full] = starts[:full] + lows[block].reshape(full, width).argmin(axis=1)
+        maxs[:full] = starts[:full] + highs[block].reshape(full, width).argmax(axis=1)
+    for i in range(full, len(starts)):
+        mins[i] = starts[i] + lows[starts[i] : ends[i]].argmin()
+        maxs[i] = starts[i] + highs[starts[i] : ends[i]].argmax()
+    return np.unique(np.concatenate([mins, maxs]))
+
+
+def minmax_downsample(x, y, buckets: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Keep the minimum and maximum of ``buckets`` equal-width buckets.
+
+    Returns at most ``2 * buckets + 2`` points, including the first and last.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if buckets < 1:
+        raise ValueError("buckets must be at least 1")
+    if n <= 2 * buckets:
+        return x, y
+    width = -(-n // buckets)
+    idx = _minmax_indices(y, np.arange(0, n, width))
+    idx = np.unique(np.r_[0, idx, n - 1])
+    return x[idx], y[idx]
+
+
+def lttb(x, y, threshold: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Largest-Triangle-Three-Buckets downsampling to ``threshold`` points."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return x, y
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(threshold - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        # Average of the next bucket (the last point for the final bucket).
+        ax = x[stop:next_stop].mean()
+        ay = y[stop:next_stop].mean()
+        px, py = x[previous], y[previous]
+        area = np.abs(
+            (px - ax) * (y[start:stop] - py) - (px - x[start:stop]) * (ay - py)
+        )
+        previous = start + int(area.argmax())
+        selected[i + 1] = previous
+    return x[selected], y[selected]
+
+
+def envelope(x, lows, highs, buckets: int):
+    """Reduce a band to the lowest ``lows`` and highest ``highs`` per bucket.
+
+    The result still encloses the full band, so a shaded range drawn from it
+    looks the same as one drawn from every point.
+    """
+    x = np.asarray(x)
+    lows = np.asarray(lows, dtype=np.float64)
+    highs = np.asarray(highs, dtype=np.float64)
+    n = len(x)
+    if n <= 2 * buckets:
+        return x, lows, highs
+    starts = np.arange(0, n, -(-n // buckets))
+    # Each bucket is drawn at its first and last x so the band stays closed.
+    ends = np.r_[starts[1:], n] - 1
+    bucket_lows = np.fmin.reduceat(lows, starts)
+    bucket_highs = np.fmax.reduceat(highs, starts)
+    xs = np.column_stack([x[starts], x[ends]]).ravel()
+    return xs, np.repeat(bucket_lows, 2), np.repeat(bucket_highs, 2)
+
+
+class SeriesPyramid:
+    """Min/max pyramid of a series for fast level-of-detail views.
+
+    Level ``k`` holds, for buckets of ``PYRAMID_FACTOR ** k`` points, the
+    indices of each bucket's minimum and maximum.  Building every level
+    costs O(n); :meth:`view` then answers in time proportional to the
+    number of points returned.
+    """
+
+    def __init__(self, x, y):
+        self.x = np.asarray(x)
+        self.y = np.asarray(y, dtype=np.float64)
+        n = len(self.y)
+        lows = np.where(np.isnan(self.y), np.inf, self.y)
+        highs = np.where(np.isnan(self.y), -np.inf, self.y)
+        # Each level: (bucket size, index of bucket min, index of bucket max)
+        self.levels: List[Tuple[int, np.ndarray, np.ndarray]] = []
+        mins = maxs = np.arange(n)
+        size = 1
+        while len(mins) > PYRAMID_FACTOR:
+            size *= PYRAMID_FACTOR
+            pad = -len(mins) % PYRAMID_FACTOR
+            mins = np.r_[mins, np.full(pad, mins[-1])].reshape(-1, PYRAMID_FACTOR)
+            maxs = np.r_[maxs, np.full(pad, maxs[-1])].reshape(-1, PYRAMID_FACTOR)
+            rows = np.arange(len(mins))
+            mins = mins[rows, lows[mins].argmin(axis=1)]
+            maxs = maxs[rows, highs[maxs].argmax(axis=1)]
+            self.levels.append((size, mins, maxs))
+
+    def __len__(self) -> int:
+        return len(self.y)
+
+    def __sizeof__(self) -> int:
+        # Lets ArtifactCache budget the levels as well as the series.
+        levels = sum(mins.nbytes + maxs.nbytes for _, mins, maxs in self.levels)
+        return object.__sizeof__(self) + self.x.nbytes + self.y.nbytes + levels
+
+    def view(self, x0=-np.inf, x1=np.inf, pixels: int = 1000):
+        """Return at most ``2 * pixels + 2`` points covering ``x0`` to ``x1``.
+
+        The returned arrays also include the nearest point on each side of
+        the range so lines run to the edge of the view.  The flag is ``True``
+        when every point in range was returned.
+        """
+        start = max(int(np.searchsorted(self.x, x0, side="left")) - 1, 0)
+        stop = min(int(np.searchsorted(self.x, x1, side="right")) + 1, len(self.y))
+        count = stop - start
+        if count <= 2 * pixels:
+            return self.x[start:stop], self.y[start:stop], True
+        level = None
+        for size, mins, maxs in self.levels:
+            if count // size < pixels:
+                break
+            level = (size, mins, maxs)
+        if level is None:
+            x, y = minmax_downsample(self.x[start:stop], self.y[start:stop], pixels)
+            return x, y, False
+        size, mins, maxs = level
+        first, last = start // size, -(-stop // size)
+        idx = np.concatenate([mins[first:last], maxs[first:last], [start, stop - 1]])
+        idx = np.unique(idx[(idx >= start) & (idx < stop)])
+        # The level has up to PYRAMID_FACTOR buckets per pixel; fold its
+        # extremes down to one bucket per pixel.
+        x, y = minmax_downsample(self.x[idx], self.y[idx], pixels)
+        return x, y, False
+
+
+__all__ = ["PYRAMID_FACTOR", "SeriesPyramid", "envelope", "lttb", "minmax_downsample"]
@@ -1,25 +1,67 @@
 """Utilities for managing 401(k) datasets.
 
 The :class:`FourZeroOneK` class stores monthly contribution data and the
-resulting account balance after applying a growth rate.  The dataset is stored
-as a list of dictionaries so it can be serialised directly to JSON for
+resulting account balance after applying a growth rate.  Internally the data
+lives in contiguous typed NumPy columns (month, contribution, growth rate and
+balance) so that long plans stay compact and balances can be recomputed with
+vectorised math.  The dataset is still exposed as a list of dictionaries via
+:meth:`FourZeroOneK.to_dict` so it can be serialised directly to JSON for
 inclusion in an :class:`~money_metrics.core.profile.AppProfile`.
 
 Inputs such as the monthly contribution and growth rate are kept alongside the
 output balance, allowing the data to be graphed or displayed in tabular form by
 the UI.
+
+Long plans can also be consumed a chunk at a time through
+:meth:`FourZeroOneK.iter_chunks`, :func:`stream_projection` and the
+:func:`write_json`/:func:`write_csv` exporters.  Graphs and aggregates do not
+read plans: they work on the rows stored in a
+:class:`~money_metrics.core.DataManager`, so they are not streamed.
 """
 
 from __future__ import annotations
 
+import csv
 import json
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Iterable
+import math
+from collections.abc import Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, List, Dict, Iterable, Iterator, Mapping
+
+import numpy as np
+
+from .affine_tree import AffineTree
+from .atomic import atomic_write
+from .columnar_file import open_columns, write_columns
+
+
+# Number of months folded into one closed-form step of
+# :func:`compound_balances`.  Larger blocks mean fewer interpreted iterations
+# but a wider range for the cumulative growth factor, so blocks that overflow
+# or underflow are split in half until they are safe.
+_BLOCK_SIZE = 4096
+_MIN_BLOCK_SIZE = 64
+# Cumulative growth factors outside this range lose too much precision when
+# dividing contributions back out of them.
+_SAFE_FACTOR = 1e100
+
+_INITIAL_CAPACITY = 16
+
+# Rows per chunk produced by the streaming APIs.
+DEFAULT_CHUNK_SIZE = 8192
+
+_FIELDS = ("month", "contribution", "growth_rate", "balance")
 
 
-@dataclass
+@dataclass(frozen=True)
 class Entry:
-    """Single month of 401(k) data."""
+    """Single month of 401(k) data.
+
+    Entries are snapshots of a plan's columns, so assigning to their fields
+    raises :class:`dataclasses.FrozenInstanceError`; use
+    :meth:`FourZeroOneK.modify_month` to change a month.
+    """
 
     month: int
     contribution: float
@@ -27,40 +69,362 @@ class Entry:
     balance: float
 
 
+def compound_balances(contributions, growth_rates, initial=0.0) -> np.ndarray:
+    """Apply the 401(k) balance recurrence along the last axis.
+
+    Each month's balance is ``(previous + contribution) * (1 + growth_rate)``.
+    Rather than iterating month by month, consecutive months are folded into
+    blocks solved in closed form: with ``F`` the running product of growth
+    factors, ``b_i = F_i * (b_0 + sum(c_j / F_{j-1}))``.
+
+    Parameters
+    ----------
+    contributions, growth_rates: array_like
+        Monthly inputs. They are broadcast against each other, so a 2-D input
+        computes one independent path per row.
+    initial: float or array_like, optional
+        Balance before the first month, broadcast against the leading axes.
+
+    Returns
+    -------
+    numpy.ndarray
+        Balances with the broadcast shape of the inputs.
+    """
+
+    c = np.asarray(contributions, dtype=np.float64)
+    factors = 1.0 + np.asarray(growth_rates, dtype=np.float64)
+    c, factors = np.broadcast_arrays(c, factors)
+    out = np.empty(c.shape, dtype=np.float64)
+    carry = np.array(
+        np.broadcast_to(np.asarray(initial, dtype=np.float64), c.shape[:-1]),
+        dtype=np.float64,
+    )
+    n = c.shape[-1] if c.ndim else 0
+    for start in range(0, n, _BLOCK_SIZE):
+        stop = min(start + _BLOCK_SIZE, n)
+        carry = _compound_block(c, factors, carry, out, start, stop)
+    return out
+
+
+def _compound_block(c, factors, carry, out, start, stop):
+    """Fill ``out[..., start:stop]`` and return the balance after ``stop``."""
+
+    fb = factors[..., start:stop]
+    cb = c[..., start:stop]
+    with np.errstate(all="ignore"):
+        growth = np.cumprod(fb, axis=-1)
+        prior = np.empty_like(growth)
+        prior[..., 0] = 1.0
+        prior[..., 1:] = growth[..., :-1]
+        block = growth * (carry[..., None] + np.cumsum(cb / prior, axis=-1))
+        magnitude = np.abs(prior)
+    # Overflowing balances are a genuine result; only a badly scaled growth
+    # factor makes the closed form inaccurate.
+    safe = np.all(magnitude >= 1.0 / _SAFE_FACTOR) and np.all(
+        magnitude <= _SAFE_FACTOR
+    )
+    if safe:
+        out[..., start:stop] = block
+        return block[..., -1].copy()
+
+    if stop - start > _MIN_BLOCK_SIZE:
+        middle = (start + stop) // 2
+        carry = _compound_block(c, factors, carry, out, start, middle)
+        return _compound_block(c, factors, carry, out, middle, stop)
+
+    # Degenerate growth (e.g. a -100% month) - fall back to the recurrence.
+    balance = carry
+    for i in range(start, stop):
+        balance = (balance + c[..., i]) * factors[..., i]
+        out[..., i] = balance
+    return np.array(balance, dtype=np.float64)
+
+
+def stream_projection(
+    contribution,
+    growth_rate,
+    months: int,
+    *,
+    initial: float = 0.0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Dict[str, np.ndarray]]:
+    """Lazily project a plan without materialising every month.
+
+    ``contribution`` and ``growth_rate`` may be scalars or arrays with one
+    value per month.  Each yielded chunk maps the 401(k) column names to
+    arrays of at most ``chunk_size`` rows, so peak memory is bounded by the
+    chunk size rather than by ``months``.
+    """
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    c_all = np.asarray(contribution, dtype=np.float64)
+    g_all = np.asarray(growth_rate, dtype=np.float64)
+    balance = float(initial)
+    for start in range(0, months, chunk_size):
+        stop = min(start + chunk_size, months)
+        shape = (stop - start,)
+        c = np.broadcast_to(c_all if c_all.ndim == 0 else c_all[start:stop], shape)
+        g = np.broadcast_to(g_all if g_all.ndim == 0 else g_all[start:stop], shape)
+        balances = compound_balances(c, g, balance)
+        balance = float(balances[-1])
+        yield {
+            "month": np.arange(start + 1, stop + 1),
+            "contribution": c,
+            "growth_rate": g,
+            "balance": balances,
+        }
+
+
+def iter_chunk_rows(
+    chunks: Iterable[Mapping[str, np.ndarray]]
+) -> Iterator[Dict[str, Any]]:
+    """Turn column chunks into row dicts one chunk at a time."""
+
+    for chunk in chunks:
+        keys = list(chunk)
+        for values in zip(*(chunk[k].tolist() for k in keys)):
+            yield dict(zip(keys, values))
+
+
+def write_json(chunks: Iterable[Mapping[str, np.ndarray]], path: str) -> None:
+    """Write column chunks to ``path`` as a JSON list of row objects.
+
+    The output is identical to ``json.dump(rows, fh, indent=2)`` but rows are
+    formatted as they are produced instead of being collected first.
+    """
+
+    with atomic_write(path, "w", encoding="utf-8") as fh:
+        first = True
+        for row in iter_chunk_rows(chunks):
+            fh.write("[\n" if first else ",\n")
+            first = False
+            text = json.dumps(row, indent=2)
+            fh.write("  " + text.replace("\n", "\n  "))
+        fh.write("[]" if first else "\n]")
+
+
+def write_csv(chunks: Iterable[Mapping[str, np.ndarray]], path: str) -> None:
+    """Write column chunks to ``path`` as CSV with a header row."""
+
+    with atomic_write(path, "w", encoding="utf-8", newline="") as fh:
+        writer = csv.writer(fh)
+        header = None
+        for chunk in chunks:
+            if header is None:
+                header = list(chunk)
+                writer.writerow(header)
+            writer.writerows(zip(*(chunk[k].tolist() for k in header)))
+
+
+def _check_value(name: str, value: float) -> None:
+    """Reject values that would poison every later balance."""
+
+    try:
+        finite = math.isfinite(value)
+    except TypeError:
+        raise ValueError(f"{name} must be a number, got {value!r}") from None
+    if not finite:
+        raise ValueError(f"{name} must be finite, got {value!r}")
+
+
+class _EntriesView(Sequence):
+    """Read-only sequence of :class:`Entry` snapshots over a plan's columns."""
+
+    def __init__(self, plan: "FourZeroOneK"):
+        self._plan = plan
+
+    def __len__(self) -> int:
+        return len(self._plan)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("entry index out of range")
+        plan = self._plan
+        plan._flush()
+        return Entry(
+            int(plan._month[index]),
+            float(plan._contribution[index]),
+            float(plan._growth_rate[index]),
+            float(plan._balance[index]),
+        )
+
+
 class FourZeroOneK:
     """Simple 401(k) tracker with add/modify/delete operations.
 
-    The internal ``entries`` list is maintained in chronological order. Each
-    operation that alters the sequence will recompute the balance of the
-    affected month and all subsequent months.
+    Months are kept in chronological order in four typed columns.  Each
+    operation that alters the sequence marks the affected month and all
+    subsequent months as stale; their balances are recomputed in a single
+    vectorised pass the next time the column is read.  Individual balances
+    can be read without that pass through :meth:`balance_at`, which uses an
+    :class:`~money_metrics.core.affine_tree.AffineTree` of the monthly maps.
+    Bulk edits can be grouped with :meth:`transaction` or
+    :meth:`modify_months` so that they commit or roll back together.
+
+    The :attr:`entries` attribute provides a read-only sequence of
+    :class:`Entry` snapshots; use :meth:`modify_month` to change data.
     """
 
     def __init__(self, entries: Iterable[Dict[str, float]] | None = None):
-        self.entries: List[Entry] = []
+        self._size = 0
+        # First month whose stored balance is stale, or ``None`` when clean.
+        self._dirty_from: int | None = None
+        self._tree: AffineTree | None = None
+        self._transaction_depth = 0
+        self._allocate(_INITIAL_CAPACITY)
         if entries:
-            for item in entries:
-                self.entries.append(Entry(**item))
+            items = list(entries)
+            self._reserve(len(items))
+            self._size = len(items)
+            self._contribution[: self._size] = [
+                item["contribution"] for item in items
+            ]
+            self._growth_rate[: self._size] = [
+                item["growth_rate"] for item in items
+            ]
             # ensure balances are consistent when loading external data
             self._recalculate_from(0)
 
+    @classmethod
+    def from_arrays(cls, contributions, growth_rates) -> "FourZeroOneK":
+        """Create a plan from per-month contribution and growth columns.
+
+        Scalars are broadcast against the other argument, so
+        ``from_arrays(np.full(12, 100.0), 0.01)`` builds a year of equal
+        contributions without a Python-level loop.
+        """
+
+        c, g = np.broadcast_arrays(
+            np.asarray(contributions, dtype=np.float64),
+            np.asarray(growth_rates, dtype=np.float64),
+        )
+        if c.ndim != 1:
+            raise ValueError("contributions and growth_rates must be 1-D")
+        plan = cls()
+        plan._reserve(len(c))
+        plan._size = len(c)
+        plan._contribution[: plan._size] = c
+        plan._growth_rate[: plan._size] = g
+        plan._recalculate_from(0)
+        return plan
+
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def entries(self) -> Sequence[Entry]:
+        """Read-only sequence of :class:`Entry` snapshots."""
+
+        return _EntriesView(self)
+
+    @property
+    def months(self) -> np.ndarray:
+        """Read-only view of the month column."""
+
+        self._flush()
+        return self._column_view(self._month)
+
+    @property
+    def contributions(self) -> np.ndarray:
+        """Read-only view of the contribution column."""
+
+        return self._column_view(self._contribution)
+
+    @property
+    def growth_rates(self) -> np.ndarray:
+        """Read-only view of the growth rate column."""
+
+        return self._column_view(self._growth_rate)
+
+    @property
+    def balances(self) -> np.ndarray:
+        """Read-only view of the balance column."""
+
+        self._flush()
+        return self._column_view(self._balance)
+
+    def balance_at(self, month: int) -> float:
+        """Return the balance at the end of ``month`` (1-based).
+
+        Months before the first pending edit are read from the balance
+        column; later months are evaluated in ``O(log n)`` from the affine
+        tree so a single read does not force the whole tail to recompute.
+        """
+
+        index = month - 1
+        if not (0 <= index < self._size):
+            raise IndexError("month out of range")
+        if self._dirty_from is None or index < self._dirty_from:
+            return float(self._balance[index])
+        if self._tree is None:
+            n = self._size
+            self._tree = AffineTree.from_months(
+                self._contribution[:n], self._growth_rate[:n]
+            )
+        return self._tree.evaluate(index + 1)
+
     # ------------------------------------------------------------------
     def add_month(self, contribution: float, growth_rate: float) -> None:
         """Append a new month to the dataset."""
 
-        prev_balance = self.entries[-1].balance if self.entries else 0.0
-        balance = (prev_balance + contribution) * (1 + growth_rate)
-        self.entries.append(
-            Entry(len(self.entries) + 1, contribution, growth_rate, balance)
-        )
+        _check_value("contribution", contribution)
+        _check_value("growth_rate", growth_rate)
+        n = self._size
+        self._reserve(n + 1)
+        self._month[n] = n + 1
+        self._contribution[n] = contribution
+        self._growth_rate[n] = growth_rate
+        if self._dirty_from is None:
+            prev_balance = self._balance[n - 1] if n else 0.0
+            self._balance[n] = (prev_balance + contribution) * (1 + growth_rate)
+        self._size = n + 1
+        if self._tree is not None:
+            factor = 1 + growth_rate
+            self._tree.append(factor, contribution * factor)
+
+    def insert_month(
+        self, month: int, contribution: float, growth_rate: float
+    ) -> None:
+        """Insert a new month before ``month`` (1-based).
+
+        ``month`` may be one past the last month, which appends.
+        """
+
+        index = month - 1
+        if not (0 <= index <= self._size):
+            raise IndexError("month out of range")
+        _check_value("contribution", contribution)
+        _check_value("growth_rate", growth_rate)
+        n = self._size
+        self._reserve(n + 1)
+        for column in self._columns():
+            column[index + 1 : n + 1] = column[index:n]
+        self._contribution[index] = contribution
+        self._growth_rate[index] = growth_rate
+        self._size = n + 1
+        self._tree = None
+        self._mark_dirty(index)
 
     def delete_month(self, month: int) -> None:
         """Remove a month by index (1-based)."""
 
         index = month - 1
-        if not (0 <= index < len(self.entries)):
+        if not (0 <= index < self._size):
             raise IndexError("month out of range")
-        del self.entries[index]
-        self._recalculate_from(index)
+        n = self._size
+        for column in self._columns():
+            column[index : n - 1] = column[index + 1 : n]
+        self._size = n - 1
+        # Every later leaf moves, so the tree is rebuilt on the next read.
+        self._tree = None
+        self._mark_dirty(index)
 
     def modify_month(
         self,
@@ -72,29 +436,164 @@ class FourZeroOneK:
         """Modify contribution and/or growth rate for a month."""
 
         index = month - 1
-        if not (0 <= index < len(self.entries)):
+        if not (0 <= index < self._size):
             raise IndexError("month out of range")
+        if contribution is not None:
+            _check_value("contribution", contribution)
+        if growth_rate is not None:
+            _check_value("growth_rate", growth_rate)
 
-        entry = self.entries[index]
         if contribution is not None:
-            entry.contribution = contribution
+            self._contribution[index] = contribution
         if growth_rate is not None:
-            entry.growth_rate = growth_rate
-        self.entries[index] = entry
-        self._recalculate_from(index)
+            self._growth_rate[index] = growth_rate
+        if self._tree is not None:
+            self._tree.update_month(
+                index, self._contribution[index], self._growth_rate[index]
+            )
+        self._mark_dirty(index)
+
+    # ------------------------------------------------------------------
+    @contextmanager
+    def transaction(self) -> Iterator["FourZeroOneK"]:
+        """Group edits so balances are recomputed once when the block exits.
+
+        Any exception raised inside the ``with`` block restores the plan to
+        its state on entry before propagating.  Nested transactions join the
+        outermost one.
+        """
+
+        if self._transaction_depth:
+            self._transaction_depth += 1
+            try:
+                yield self
+            finally:
+                self._transaction_depth -= 1
+            return
+
+        n = self._size
+        saved = tuple(column[:n].copy() for column in self._columns())
+        saved_dirty = self._dirty_from
+        self._transaction_depth = 1
+        try:
+            yield self
+        except BaseException:
+            self._size = 0
+            self._allocate(max(n, _INITIAL_CAPACITY))
+            for column, values in zip(self._columns(), saved):
+                column[:n] = values
+            self._size = n
+            self._dirty_from = saved_dirty
+            self._tree = None
+            raise
+        else:
+            self._flush()
+        finally:
+            self._transaction_depth = 0
+
+    def modify_months(self, edits: Iterable[Mapping[str, Any]]) -> None:
+        """Apply many edits in a single :meth:`transaction`.
+
+        Each edit is a mapping with a ``"month"`` key and an optional
+        ``"op"`` of ``"modify"`` (the default), ``"insert"`` or
+        ``"delete"``.  Modify and insert edits take ``"contribution"`` and
+        ``"growth_rate"`` values.  Edits are applied in order, so month
+        numbers refer to the plan as left by the previous edit.  If any edit
+        is invalid, none of them are applied.
+        """
+
+        with self.transaction():
+            for edit in edits:
+                op = edit.get("op", "modify")
+                month = edit["month"]
+                if op == "modify":
+                    self.modify_month(
+                        month,
+                        contribution=edit.get("contribution"),
+                        growth_rate=edit.get("growth_rate"),
+                    )
+                elif op == "insert":
+                    self.insert_month(
+                        month, edit["contribution"], edit["growth_rate"]
+                    )
+                elif op == "delete":
+                    self.delete_month(month)
+                else:
+                    raise ValueError(f"Unknown edit operation '{op}'")
 
     # ------------------------------------------------------------------
     def to_dict(self) -> List[Dict[str, float]]:
         """Return the dataset as a list of serialisable dicts."""
 
-        return [asdict(e) for e in self.entries]
+        self._flush()
+        n = self._size
+        return [
+            {"month": m, "contribution": c, "growth_rate": g, "balance": b}
+            for m, c, g, b in zip(
+                self._month[:n].tolist(),
+                self._contribution[:n].tolist(),
+                self._growth_rate[:n].tolist(),
+                self._balance[:n].tolist(),
+            )
+        ]
+
+    def iter_chunks(
+        self, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[Dict[str, np.ndarray]]:
+        """Yield the plan as column chunks of at most ``chunk_size`` rows.
+
+        Chunks are read-only views of the plan's columns, so no data is
+        copied; they should be consumed before the plan is modified.
+        """
+
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self._flush()
+        columns = dict(zip(_FIELDS, self._columns()))
+        for start in range(0, self._size, chunk_size):
+            stop = min(start + chunk_size, self._size)
+            chunk = {}
+            for name, column in columns.items():
+                view = column[start:stop]
+                view.flags.writeable = False
+                chunk[name] = view
+            yield chunk
+
+    def iter_rows(
+        self, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[Dict[str, float]]:
+        """Lazily yield the rows returned by :meth:`to_dict`."""
+
+        return iter_chunk_rows(self.iter_chunks(chunk_size))
 
     # ------------------------------------------------------------------
     def save_to_json(self, path: str) -> None:
         """Persist the dataset to ``path`` as JSON."""
 
-        with open(path, "w", encoding="utf-8") as fh:
-            json.dump(self.to_dict(), fh, indent=2)
+        write_json(self.iter_chunks(), path)
+
+    def save_to_csv(self, path: str) -> None:
+        """Persist the dataset to ``path`` as CSV."""
+
+        write_csv(self.iter_chunks(), path)
+
+    def save_columns(self, path: str) -> None:
+        """Persist the dataset to ``path`` in the binary columnar format."""
+
+        self._flush()
+        n = self._size
+        write_columns(path, dict(zip(_FIELDS, (c[:n] for c in self._columns()))))
+
+    @classmethod
+    def load_columns(cls, path: str) -> "FourZeroOneK":
+        """Create a :class:`FourZeroOneK` from a binary columnar file.
+
+        For read-only access without copying, use
+        :func:`~money_metrics.core.columnar_file.open_columns` directly.
+        """
+
+        with open_columns(path) as columns:
+            return cls.from_arrays(columns["contribution"], columns["growth_rate"])
 
     @classmethod
     def load_from_json(cls, path: str) -> "FourZeroOneK":
@@ -105,19 +604,63 @@ class FourZeroOneK:
         return cls(entries=data)
 
     # ------------------------------------------------------------------
+    def _allocate(self, capacity: int) -> None:
+        self._month = np.zeros(capacity, dtype=np.int64)
+        self._contribution = np.zeros(capacity, dtype=np.float64)
+        self._growth_rate = np.zeros(capacity, dtype=np.float64)
+        self._balance = np.zeros(capacity, dtype=np.float64)
+
+    def _reserve(self, size: int) -> None:
+        """Grow the column buffers geometrically to hold ``size`` months."""
+
+        capacity = len(self._month)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        old = self._columns()
+        self._allocate(capacity)
+        for new, column in zip(self._columns(), old):
+            new[: self._size] = column[: self._size]
+
+    def _columns(self):
+        return (self._month, self._contribution, self._growth_rate, self._balance)
+
+    def _column_view(self, column: np.ndarray) -> np.ndarray:
+        view = column[: self._size]
+        view.flags.writeable = False
+        return view
+
+    def _mark_dirty(self, index: int) -> None:
+        if self._dirty_from is None or index < self._dirty_from:
+            self._dirty_from = index
+
+    def _flush(self) -> None:
+        """Recompute stale balances in one pass from the first dirty month."""
+
+        if self._dirty_from is not None:
+            start, self._dirty_from = self._dirty_from, None
+            self._recalculate_from(start)
+
     def _recalculate_from(self, start: int) -> None:
         """Recompute balances starting at ``start`` index."""
 
-        prev_balance = self.entries[start - 1].balance if start > 0 else 0.0
-        for i in range(start, len(self.entries)):
-            entry = self.entries[i]
-            entry.month = i + 1
-            entry.balance = (prev_balance + entry.contribution) * (
-                1 + entry.growth_rate
-            )
-            self.entries[i] = entry
-            prev_balance = entry.balance
-
+        n = self._size
+        if start >= n:
+            return
+        prev_balance = self._balance[start - 1] if start > 0 else 0.0
+        self._month[start:n] = np.arange(start + 1, n + 1)
+        self._balance[start:n] = compound_balances(
+            self._contribution[start:n], self._growth_rate[start:n], prev_balance
+        )
 
-__all__ = ["FourZeroOneK", "Entry"]
 
+__all__ = [
+    "FourZeroOneK",
+    "Entry",
+    "compound_balances",
+    "stream_projection",
+    "iter_chunk_rows",
+    "write_json",
+    "write_csv",
+]
@@ -0,0 +1,541 @@
+"""Append-only autosave journal with crash recovery.
+
+Rewriting a whole profile on every save costs time proportional to all the
+data.  :class:`ProfileJournal` instead appends one JSON line per change
+published by a :class:`~money_metrics.core.DataManager`, so an edit of one
+cell writes a record the size of that cell.  The journal starts with a
+*base* record naming a snapshot of a full profile; :meth:`ProfileJournal.recover`
+opens the snapshot lazily and replays the records after it.  A record cut
+short by a crash is ignored.
+
+Snapshots are owned by the journal and kept next to it, in files named
+``<journal>.<id>.snapshot``: rebasing onto a saved profile hard-links (or
+copies) it there, so moving or deleting the user's profile afterwards does
+not affect recovery.
+
+Records look like::
+
+    {"op": "base", "path": "...", "versions": {...}, "store": null}
+    {"op": "replace", "name": "401(k)", "version": 7, "data": [...]}
+    {"op": "cells", "name": "401(k)", "version": 8, "rows": {"3": {"contribution": 50.0}}}
+    {"op": "rename", "name": "401(k)", "version": 9, "old": "balance", "new": "total"}
+    {"op": "remove", "name": "401(k)"}
+    {"op": "screens", "screens": [...]}
+    {"op": "aggregates", "aggregates": {"Net worth": {"sources": [...], ...}}}
+    {"op": "versions", "versions": {...}, "store": null}
+    {"op": "closed"}
+
+``version`` is the data manager's version of the dataset after the change
+and ``store`` the :attr:`~money_metrics.core.DataManager.path` of the
+manager, which lets a persistent store keep the datasets it already holds
+in their journaled state when the journal is recovered.  A ``closed`` record
+ends the journal of a session that shut down cleanly; see
+:meth:`ProfileJournal.needs_recovery`.
+
+Once enough records have accumulated, the journaled state is written to a
+new snapshot and the journal restarts from it.  That only reads the journal
+and its snapshot, so :meth:`ProfileJournal.write_snapshot` can run on a
+worker thread.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List
+
+from .atomic import atomic_write
+from .profile import AppProfile, open_profile
+
+# Number of records after which maybe_compact() writes a new snapshot.
+DEFAULT_COMPACT_AFTER = 5_000
+
+_SNAPSHOT_SUFFIX = ".snapshot"
+
+
+@dataclass(frozen=True)
+class JournalMark:
+    """Position in a journal returned by :meth:`ProfileJournal.mark`."""
+
+    generation: int
+    offset: int
+    versions: Dict[str, int] = field(default_factory=dict)
+
+
+class RecoveredProfile:
+    """State rebuilt from a journal, with datasets decoded on demand.
+
+    Offers the interface of :class:`~money_metrics.core.profile.LazyProfile`.
+    A dataset is read from the base snapshot only when it is loaded, and the
+    journaled changes to it are applied at that point.
+
+    ``versions`` maps each dataset to its data manager version when it was
+    last journaled and ``store`` is the persistent store the journal was
+    kept for, if any; see :meth:`stored_in`.
+    """
+
+    def __init__(self, base, records: List[dict], versions: Dict[str, int], store):
+        self.path = base.path
+        self.version = base.version
+        self.screens: List[Dict[str, Any]] = base.screens
+        self.aggregates: Dict[str, Dict[str, Any]] = base.aggregates
+        self.versions = versions
+        self.store = store
+        self._base = base
+        # Per dataset, the records to replay; a dataset whose first record
+        # is a "replace" does not come from the base.
+        self._changes: Dict[str, List[dict]] = {
+            name: [] for name in base.dataset_names
+        }
+        self._taken: set = set()
+        for record in records:
+            op = record["op"]
+            name = record.get("name")
+            if op == "screens":
+                self.screens = record["screens"]
+            elif op == "aggregates":
+                self.aggregates = record["aggregates"]
+            elif op == "replace":
+                self._changes[name] = [record]
+            elif op == "remove":
+                self._changes.pop(name, None)
+            elif name in self._changes:
+                self._changes[name].append(record)
+        self.dataset_names: List[str] = list(self._changes)
+
+    def stored_in(self, data_manager) -> set:
+        """Names of the datasets ``data_manager`` already holds as recovered.
+
+        Only the persistent store the journal was kept for can: it holds a
+        dataset in its recovered state if it has the journaled version.
+        """
+        if self.store is None or data_manager.path != self.store:
+            return set()
+        return {
+            name
+            for name in self.dataset_names
+            if data_manager.version(name) == self.versions.get(name)
+        }
+
+    def is_parsed(self, name: str) -> bool:
+        """Return ``True`` if ``name`` can be loaded without decoding."""
+        return self._replaced(name) or self._base.is_parsed(name)
+
+    def prefetch(self, name: str) -> None:
+        """Decode the base data of ``name`` ahead of :meth:`load_dataset`."""
+        if name not in self._changes:
+            raise KeyError(name)
+        if name not in self._taken and not self._replaced(name):
+            self._base.prefetch(name)
+
+    def load_dataset(self, name: str) -> Any:
+        """Return dataset ``name`` with its journaled changes applied."""
+        if name in self._taken:
+            raise KeyError(f"Dataset '{name}' has already been loaded")
+        changes = self._changes[name]
+        if self._replaced(name):
+            data, changes = changes[0]["data"], changes[1:]
+        else:
+            data = self._base.load_dataset(name)
+        datasets = {name: data}
+        for record in changes:
+            _replay(datasets, record)
+        self._taken.add(name)
+        self._changes[name] = []
+        return datasets[name]
+
+    def to_profile(self) -> AppProfile:
+        """Decode every dataset into a regular :class:`AppProfile`."""
+        datasets = {name: self.load_dataset(name) for name in self.dataset_names}
+        profile = AppProfile(
+            datasets=datasets, screens=self.screens, aggregates=self.aggregates
+        )
+        profile.version = self.version
+        return profile
+
+    def _replaced(self, name: str) -> bool:
+        changes = self._changes.get(name)
+        return bool(changes) and changes[0]["op"] == "replace"
+
+
+class ProfileJournal:
+    """Journal of the changes made to a data manager since the last snapshot.
+
+    Parameters
+    ----------
+    path: str
+        Journal file. Its snapshots are kept in the same directory.
+    compact_after: int, optional
+        Number of records after which :attr:`needs_compaction` is set. A
+        record replacing a dataset holds all of its rows and counts once per
+        row, so replacing large datasets compacts the journal sooner.
+    """
+
+    def __init__(self, path: str, compact_after: int = DEFAULT_COMPACT_AFTER):
+        self.path = os.path.abspath(path)
+        self.compact_after = compact_after
+        self.records = 0
+        self.base: str | None = None
+        self._fh = None
+        self._data_manager = None
+        self._profile_factory: Callable[[], AppProfile] | None = None
+        self._token = None
+        self._screens = None
+        self._aggregates = None
+        # Bumped whenever the journal is rewritten, invalidating older marks.
+        self._generation = 0
+
+    # ------------------------------------------------------------------
+    def recover(self) -> RecoveredProfile | None:
+        """Rebuild the journaled state, or return ``None`` if there is none.
+
+        Raises :class:`ValueError` if the journal cannot be used, e.g.
+        because its snapshot is missing.
+        """
+        return self._read()
+
+    def needs_recovery(self) -> bool:
+        """Return ``True`` if the journal was left behind by a crashed session.
+
+        A journal closed with :meth:`close` ends with a ``closed`` record;
+        any other journal on disk holds changes the session did not get to
+        save.
+        """
+        try:
+            lines = self._lines()
+        except FileNotFoundError:
+            return False
+        return bool(lines) and lines[-1][1].get("op") != "closed"
+
+    def attach(
+        self, data_manager, profile_factory, base: str | None = None, resume=False
+    ) -> None:
+        """Start journaling changes to ``data_manager``.
+
+        ``profile_factory()`` returns the full current state and is used to
+        write a snapshot when the journal restarts from ``base=None``;
+        otherwise it restarts from ``base``, a profile file matching the
+        current state. Pass ``resume=True`` instead, after applying the state
+        returned by :meth:`recover`, to carry on with the existing journal.
+        """
+        self.detach()
+        self._data_manager = data_manager
+        self._profile_factory = profile_factory
+        if resume and os.path.exists(self.path):
+            self._resume()
+        else:
+            self.rebase(base)
+        self._token = data_manager.subscribe(self._on_change)
+
+    def detach(self) -> None:
+        """Stop journaling, e.g. while a new profile is being loaded."""
+        self._generation += 1
+        if self._token is not None:
+            self._data_manager.unsubscribe(self._token)
+            self._token = None
+
+    def close(self) -> None:
+        """Detach and close the journal file, marking a clean shutdown."""
+        self.detach()
+        if self._fh is not None:
+            self._append({"op": "closed"})
+            self._fh.close()
+            self._fh = None
+
+    # ------------------------------------------------------------------
+    def mark(self) -> JournalMark:
+        """Return a position to pass to :meth:`rebase` as ``since``.
+
+        Take a mark together with the snapshot written by a background save;
+        rebasing onto that save with ``since=mark`` keeps the changes made
+        while it was being written. A mark is only valid until the journal
+        is next rebased or detached.
+        """
+        dm = self._data_manager
+        versions = {name: dm.version(name) for name in dm.names()} if dm else {}
+        offset = self._fh.tell() if self._fh is not None else 0
+        return JournalMark(self._generation, offset, versions)
+
+    def stage(self, source: str) -> str:
+        """Place a copy of the profile ``source`` next to the journal.
+
+        The copy is a hard link where the file system allows it, so staging
+        a large profile is cheap. Profiles are saved by replacing the file,
+        so the link keeps the saved content even if ``source`` is later
+        overwritten, moved or deleted. Safe to call from a worker thread.
+        """
+        staged = self._new_snapshot_path()
+        tmp = staged + ".tmp"
+        try:
+            os.link(source, tmp)
+        except OSError:
+            shutil.copyfile(source, tmp)
+        os.replace(tmp, staged)
+        return staged
+
+    def write_snapshot(self, mark: JournalMark) -> str | None:
+        """Write the journaled state at ``mark`` to a new snapshot.
+
+        Only the journal and its current snapshot are read, never the data
+        manager, so this can run on a worker thread while edits continue.
+        Returns the snapshot to pass to :meth:`rebase` with ``since=mark``,
+        or ``None`` if the journal was rebased in the meantime.
+        """
+        try:
+            profile = self._read(mark.offset).to_profile()
+            snapshot = self._new_snapshot_path()
+            profile.save_to_file(snapshot, format="binary")
+        except (OSError, ValueError):
+            if mark.generation != self._generation:
+                return None  # The snapshot was replaced while being read.
+            raise
+        return snapshot
+
+    def rebase(self, base: str | None = None, since: JournalMark | None = None) -> bool:
+        """Restart the journal from the profile ``base``.
+
+        ``base`` is staged next to the journal unless it came from
+        :meth:`stage` or :meth:`write_snapshot`; if ``None`` a snapshot is
+        written from the profile factory. Records written before the mark
+        ``since`` are discarded (all of them if ``since`` is ``None``).
+
+        Returns ``False``, discarding ``base``, if the journal was rebased or
+        detached after ``since`` was taken, as then ``base`` may be older
+        than the journal's current state.
+        """
+        if since is not None and since.generation != self._generation:
+            if base is not None and self._is_snapshot(base):
+                _remove(base)
+            return False
+        if base is None:
+            profile = self._profile_factory()
+            base = self._new_snapshot_path()
+            profile.save_to_file(base, format="binary")
+            self._screens = profile.screens
+            self._aggregates = profile.aggregates
+        elif not self._is_snapshot(base):
+            base = self.stage(base)
+        versions = (since if since is not None else self.mark()).versions
+        kept = []
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+            if since is not None:
+                with open(self.path, "r", encoding="utf-8") as fh:
+                    fh.seek(since.offset)
+                    kept = [line for line in fh if line.endswith("\n")]
+        header = {
+            "op": "base",
+            "path": os.path.abspath(base),
+            "versions": versions,
+            "store": self._store(),
+        }
+        with atomic_write(self.path, "w", encoding="utf-8") as fh:
+            fh.write(json.dumps(header) + "\n")
+            fh.writelines(kept)
+        self._open(base, len(kept))
+        return True
+
+    @property
+    def needs_compaction(self) -> bool:
+        """``True`` once at least ``compact_after`` records were written."""
+        return self.records >= self.compact_after
+
+    def compact(self) -> None:
+        """Write a snapshot of the journaled state and truncate the journal."""
+        mark = self.mark()
+        self.rebase(self.write_snapshot(mark), since=mark)
+
+    def maybe_compact(self) -> bool:
+        """Compact if at least ``compact_after`` records were written."""
+        if not self.needs_compaction:
+            return False
+        self.compact()
+        return True
+
+    def record_screens(self, screens) -> None:
+        """Journal the screen layout if it changed since it was last written.
+
+        Ignored while detached, e.g. while a new profile lays out its screens.
+        """
+        if self._token is not None and screens != self._screens:
+            self._screens = [dict(s) for s in screens]
+            self._append({"op": "screens", "screens": self._screens})
+
+    def record_aggregates(self, aggregates) -> None:
+        """Journal the sources of the aggregates if they changed.
+
+        ``aggregates`` maps each aggregate to its keyword arguments, as in
+        :attr:`AppProfile.aggregates`. Ignored while detached.
+        """
+        if self._token is not None and aggregates != self._aggregates:
+            self._aggregates = {name: dict(spec) for name, spec in aggregates.items()}
+            self._append({"op": "aggregates", "aggregates": self._aggregates})
+
+    # ------------------------------------------------------------------
+    def _on_change(self, change) -> None:
+        name = change.name
+        if change.kind == "removed":
+            self._append({"op": "remove", "name": name})
+            return
+        record = {"name": name, "version": change.version}
+        if change.kind == "updated":
+            view = self._data_manager.view(name)
+            rows = {
+                str(i): {c: view[i][c] for c in change.columns if c in view[i]}
+                for i in change.rows
+            }
+            record.update(op="cells", rows=rows)
+        elif change.rename:
+            for old, new in change.rename:
+                self._append(dict(record, op="rename", old=old, new=new))
+            return
+        else:
+            data = self._data_manager.view(name)
+            record.update(op="replace", data=data)
+            self._append(record, len(data) if isinstance(data, list) else 1)
+            return
+        self._append(record)
+
+    def _append(self, record: dict, weight: int = 1) -> None:
+        if self._fh is None:
+            return
+        self._fh.write(json.dumps(record) + "\n")
+        self._fh.flush()
+        self.records += max(weight, 1)
+
+    def _open(self, base: str, records: int) -> None:
+        """Continue appending to the journal just written, based on ``base``."""
+        self._fh = open(self.path, "a", encoding="utf-8")
+        self.records = records
+        self.base = os.path.abspath(base)
+        self._generation += 1
+        # This journal's snapshots that it no longer refers to, including any
+        # left behind by a crash or by a save that was superseded. Other
+        # journals in the same directory keep theirs.
+        directory = os.path.dirname(self.path)
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if self._is_snapshot(path) and path != self.base:
+                _remove(path)
+
+    def _resume(self) -> None:
+        """Carry on with the journal on disk, dropping a truncated tail."""
+        lines = [
+            line for line, record in self._lines() if record.get("op") != "closed"
+        ]
+        base = json.loads(lines[0])["path"]
+        with atomic_write(self.path, "w", encoding="utf-8") as fh:
+            fh.writelines(lines)
+        self._open(base, len(lines) - 1)
+        # Recovery may have reloaded datasets under new versions.
+        self._append({"op": "versions", **self._state()})
+
+    def _read(self, limit: int | None = None) -> RecoveredProfile | None:
+        """Return the state journaled in the first ``limit`` bytes."""
+        try:
+            records = [record for _, record in self._lines(limit)]
+        except FileNotFoundError:
+            return None
+        if not records or records[0].get("op") != "base":
+            raise ValueError(f"{self.path} does not start with a base record")
+        header, records = records[0], records[1:]
+        path = header.get("path")
+        if not (path and os.path.exists(path)):
+            raise ValueError(f"The autosave snapshot {path} is missing")
+        base = open_profile(path)
+        versions = dict(header.get("versions", {}))
+        store = header.get("store")
+        for record in records:
+            if record["op"] == "versions":
+                versions, store = dict(record["versions"]), record.get("store")
+            elif record["op"] == "remove":
+                versions.pop(record["name"], None)
+            elif "version" in record:
+                versions[record["name"]] = record["version"]
+        return RecoveredProfile(base, records, versions, store)
+
+    def _lines(self, limit: int | None = None) -> List[tuple]:
+        """The complete ``(line, record)`` pairs at the start of the journal."""
+        with open(self.path, "rb") as fh:
+            data = fh.read() if limit is None else fh.read(limit)
+        lines = []
+        for line in data.decode("utf-8", errors="replace").splitlines(keepends=True):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break  # The last record was cut short by a crash.
+            lines.append((line if line.endswith("\n") else line + "\n", record))
+        return lines
+
+    def _state(self) -> dict:
+        """Versions of the datasets and the store they are kept in."""
+        return {"versions": self.mark().versions, "store": self._store()}
+
+    def _store(self) -> str | None:
+        return self._data_manager.path if self._data_manager is not None else None
+
+    def _new_snapshot_path(self) -> str:
+        directory, name = os.path.split(self.path)
+        fd, path = tempfile.mkstemp(
+            dir=directory, prefix=f"{name}.", suffix=_SNAPSHOT_SUFFIX
+        )
+        os.close(fd)
+        return path
+
+    def _is_snapshot(self, path: str) -> bool:
+        """Return ``True`` if ``path`` is one of this journal's snapshots.
+
+        Those are named ``<journal>.<id>.snapshot`` with an ``id`` made by
+        :func:`tempfile.mkstemp`, which never contains a dot, so the
+        snapshots of ``autosave.jsonl`` are not mistaken for those of a
+        journal named ``autosave``.
+        """
+        directory, name = os.path.split(self.path)
+        snapshot_directory, snapshot = os.path.split(os.path.abspath(path))
+        prefix = f"{name}."
+        if snapshot_directory != directory or not snapshot.startswith(prefix):
+            return False
+        if not snapshot.endswith(_SNAPSHOT_SUFFIX):
+            return False
+        snapshot_id = snapshot[len(prefix) : -len(_SNAPSHOT_SUFFIX)]
+        return bool(snapshot_id) and "." not in snapshot_id
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass  # e.g. still open on Windows; removed by a later rebase.
+
+
+def _replay(datasets: Dict[str, Any], record: dict) -> None:
+    """Apply one dataset record to ``datasets``.
+
+    Records for datasets that are not in ``datasets`` are skipped.
+    """
+    op = record["op"]
+    name = record.get("name")
+    if op == "replace":
+        datasets[name] = record["data"]
+    elif op == "remove":
+        datasets.pop(name, None)
+    elif name not in datasets:
+        return
+    elif op == "cells":
+        rows = datasets[name]
+        for index, values in record["rows"].items():
+            if 0 <= int(index) < len(rows):
+                rows[int(index)].update(values)
+    elif op == "rename":
+        old, new = record["old"], record["new"]
+        datasets[name] = [
+            {(new if k == old else k): v for k, v in row.items()}
+            for row in datasets[name]
+        ]
+
+
+__all__ = ["ProfileJournal", "RecoveredProfile", "JournalMark", "DEFAULT_COMPACT_AFTER"]
@@ -0,0 +1,175 @@
+"""Monte Carlo projections of 401(k) balances.
+
+A :class:`MonteCarloProjection` draws many random monthly growth-rate paths
+around a plan's expected growth and pushes them all through the same balance
+recurrence as :class:`~money_metrics.core.four_zero_one_k.FourZeroOneK`, one
+NumPy matrix row per path.  The result is summarised as percentile bands that
+the UI can plot as shaded regions.
+
+Paths are simulated in fixed-size chunks, each seeded from its own child of a
+:class:`numpy.random.SeedSequence`.  The same ``seed`` therefore produces the
+same bands whether the chunks run in-process or fan out across a process
+pool.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List
+
+import numpy as np
+
+from .four_zero_one_k import FourZeroOneK, compound_balances
+
+# Column names used when bands are stored as a dataset.
+BAND_COLUMNS = ("p5", "p50", "p95")
+
+_PERCENTILES = (5, 50, 95)
+
+
+@dataclass
+class ProjectionBands:
+    """Percentile bands of simulated balances for each month."""
+
+    months: np.ndarray
+    p5: np.ndarray
+    p50: np.ndarray
+    p95: np.ndarray
+    paths: int
+    target: float | None = None
+    probability_of_target: float | None = None
+
+    def to_dict(self) -> List[Dict[str, float]]:
+        """Return the bands as rows suitable for :class:`DataManager`."""
+
+        return [
+            {"month": m, "p5": lo, "p50": mid, "p95": hi}
+            for m, lo, mid, hi in zip(
+                self.months.tolist(),
+                self.p5.tolist(),
+                self.p50.tolist(),
+                self.p95.tolist(),
+            )
+        ]
+
+
+def _simulate_chunk(contributions, mean_growth, volatility, initial, count, seed):
+    """Simulate ``count`` paths; a module-level function so it can be pickled."""
+
+    rng = np.random.default_rng(seed)
+    shape = (count, len(contributions))
+    growth = rng.normal(mean_growth, volatility, size=shape)
+    # A month cannot lose more than the whole balance.
+    np.maximum(growth, -1.0, out=growth)
+    return compound_balances(contributions, growth, initial)
+
+
+class MonteCarloProjection:
+    """Simulate stochastic growth paths for a contribution schedule.
+
+    Parameters
+    ----------
+    contributions: array_like
+        Contribution for each month.
+    mean_growth: float or array_like
+        Expected monthly growth rate, either constant or one per month.
+    volatility: float or array_like
+        Standard deviation of the monthly growth rate.
+    initial: float, optional
+        Balance before the first month.
+    """
+
+    def __init__(self, contributions, mean_growth, volatility, initial=0.0):
+        self.contributions = np.asarray(contributions, dtype=np.float64)
+        if self.contributions.ndim != 1:
+            raise ValueError("contributions must be 1-D")
+        months = len(self.contributions)
+        self.mean_growth = np.broadcast_to(
+            np.asarray(mean_growth, dtype=np.float64), (months,)
+        )
+        self.volatility = np.broadcast_to(
+            np.asarray(volatility, dtype=np.float64), (months,)
+        )
+        if np.any(self.volatility < 0):
+            raise ValueError("volatility must be non-negative")
+        self.initial = float(initial)
+
+    @classmethod
+    def from_plan(cls, plan: FourZeroOneK, volatility) -> "MonteCarloProjection":
+        """Use a plan's contributions and growth rates as the expected path.
+
+        The plan's columns are copied, so later edits to the plan do not
+        change the projection, e.g. while it runs on a worker thread.
+        """
+
+        return cls(np.array(plan.contributions), np.array(plan.growth_rates), volatility)
+
+    # ------------------------------------------------------------------
+    def simulate(
+        self,
+        paths: int,
+        *,
+        seed=None,
+        workers: int | None = None,
+        chunk_size: int = 5_000,
+    ) -> np.ndarray:
+        """Return a ``(paths, months)`` matrix of simulated balances.
+
+        ``workers`` greater than one distributes chunks of ``chunk_size``
+        paths over a :class:`~concurrent.futures.ProcessPoolExecutor`.  The
+        output only depends on ``seed`` and ``chunk_size``, not on
+        ``workers``.
+        """
+
+        if paths < 1:
+            raise ValueError("paths must be at least 1")
+        counts = [
+            min(chunk_size, paths - start) for start in range(0, paths, chunk_size)
+        ]
+        seeds = np.random.SeedSequence(seed).spawn(len(counts))
+        args = [
+            (self.contributions, self.mean_growth, self.volatility, self.initial, n, s)
+            for n, s in zip(counts, seeds)
+        ]
+        if workers is not None and workers > 1 and len(args) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                chunks = list(pool.map(_simulate_chunk, *zip(*args)))
+        else:
+            chunks = [_simulate_chunk(*a) for a in args]
+        return np.concatenate(chunks, axis=0)
+
+    def run(
+        self,
+        paths: int = 10_000,
+        *,
+        seed=None,
+        target: float | None = None,
+        workers: int | None = None,
+        chunk_size: int = 5_000,
+    ) -> ProjectionBands:
+        """Simulate ``paths`` paths and summarise them as percentile bands.
+
+        If ``target`` is given the result also reports the fraction of paths
+        whose final balance reaches it.
+        """
+
+        balances = self.simulate(
+            paths, seed=seed, workers=workers, chunk_size=chunk_size
+        )
+        p5, p50, p95 = np.percentile(balances, _PERCENTILES, axis=0)
+        probability = None
+        if target is not None:
+            probability = float(np.mean(balances[:, -1] >= target))
+        return ProjectionBands(
+            months=np.arange(1, balances.shape[1] + 1),
+            p5=p5,
+            p50=p50,
+            p95=p95,
+            paths=paths,
+            target=target,
+            probability_of_target=probability,
+        )
+
+
+__all__ = ["MonteCarloProjection", "ProjectionBands", "BAND_COLUMNS"]
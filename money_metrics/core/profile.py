@@ -1,6 +1,12 @@
 import json
+import re
+import threading
 from dataclasses import dataclass, field
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Mapping
+
+from .atomic import atomic_write
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
 
 
 @dataclass
@@ -10,19 +16,31 @@ class AppProfile:
     The profile stores datasets managed by :class:`DataManager` alongside a
     minimal description of the current graph screens. Profiles can be saved to
     and loaded from JSON files, allowing them to be shared between users or
-    re-used later.
+    re-used later.  ``aggregates`` records the sources of each
+    :class:`~money_metrics.core.aggregate.AggregateDataset`, so they can be
+    rebuilt and kept up to date when the profile is loaded.
+
+    Files list the version, screens, aggregates and dataset names ahead of the datasets
+    themselves, so :class:`LazyProfile` can lay out the window after reading
+    only the start of the file.  Profiles can also be stored in the compact
+    binary container of :mod:`money_metrics.core.binary_profile`, selected by
+    the ``.mmp`` extension or the ``format`` argument of :meth:`save_to_file`.
     """
 
-    datasets: Dict[str, Any] = field(default_factory=dict)
+    datasets: Mapping[str, Any] = field(default_factory=dict)
     screens: List[Dict[str, Any]] = field(default_factory=list)
     version: int = 1
+    # Aggregate name -> AggregateDataset keyword arguments (see to_dict()).
+    aggregates: Dict[str, Dict[str, Any]] = field(default_factory=dict)
 
     # ------------------------------------------------------------------
     def to_dict(self) -> Dict[str, Any]:
         return {
             "version": self.version,
-            "datasets": self.datasets,
             "screens": self.screens,
+            "aggregates": self.aggregates,
+            "dataset_names": list(self.datasets),
+            "datasets": self.datasets,
         }
 
     @classmethod
@@ -30,19 +48,61 @@ class AppProfile:
         version = data.get("version", 1)
         datasets = data.get("datasets", {})
         screens = data.get("screens", [])
-        profile = cls(datasets=datasets, screens=screens)
+        aggregates = data.get("aggregates", {})
+        profile = cls(datasets=datasets, screens=screens, aggregates=aggregates)
         profile.version = version
         return profile
 
     # ------------------------------------------------------------------
-    def save_to_file(self, path: str) -> None:
-        """Write the profile to ``path`` as JSON."""
-        with open(path, "w", encoding="utf-8") as fh:
-            json.dump(self.to_dict(), fh, indent=2)
+    def save_to_file(
+        self, path: str, format: str | None = None, compress=True, progress=None
+    ) -> None:
+        """Write the profile to ``path``.
+
+        ``format`` is ``"json"`` or ``"binary"``; by default it follows the
+        file extension (``.mmp`` for binary). ``compress`` applies to the
+        binary format only. ``progress(done, total)`` is called after each
+        dataset is written. The file is replaced atomically, so an
+        interrupted save leaves the previous file intact.
+        """
+        from .binary_profile import EXTENSION, write_profile
+
+        if format is None:
+            format = "binary" if str(path).endswith(EXTENSION) else "json"
+        if format == "binary":
+            write_profile(path, self, compress=compress, progress=progress)
+        elif format == "json":
+            with atomic_write(path, "w", encoding="utf-8") as fh:
+                self._write_json(fh, progress)
+        else:
+            raise ValueError(f"Unknown profile format '{format}'")
+
+    def _write_json(self, fh, progress=None) -> None:
+        """Write ``json.dump(self.to_dict(), fh, indent=2)`` one dataset at a time."""
+
+        def member(key, value, depth):
+            text = json.dumps(value, indent=2).replace("\n", "\n" + "  " * depth)
+            return f"\n{'  ' * depth}{json.dumps(key)}: {text}"
+
+        data = self.to_dict()
+        datasets = data.pop("datasets")
+        fh.write("{")
+        for key, value in data.items():
+            fh.write(member(key, value, 1) + ",")
+        fh.write('\n  "datasets": {')
+        for done, (name, value) in enumerate(datasets.items(), 1):
+            fh.write(("," if done > 1 else "") + member(name, value, 2))
+            if progress is not None:
+                progress(done, len(datasets))
+        fh.write("\n  }\n}" if datasets else "}\n}")
 
     @classmethod
     def load_from_file(cls, path: str) -> "AppProfile":
-        """Load a profile from ``path``."""
+        """Load a JSON or binary profile from ``path``."""
+        from .binary_profile import BinaryProfile, is_binary_profile
+
+        if is_binary_profile(path):
+            return BinaryProfile(path).to_profile()
         with open(path, "r", encoding="utf-8") as fh:
             data = json.load(fh)
         return cls.from_dict(data)
@@ -50,12 +110,156 @@ class AppProfile:
     # ------------------------------------------------------------------
     @classmethod
     def from_window(cls, window) -> "AppProfile":
-        """Create a profile from the current state of a main window."""
-        datasets = window.data_manager.all_datasets()
+        """Create a profile from the current state of a main window.
+
+        Datasets are taken from a :meth:`DataManager.snapshot`, so they are
+        shared read-only views rather than copies, and datasets that have
+        not been loaded yet are only loaded as the profile is written, on
+        the worker thread of a background save.
+        """
+        datasets = window.data_manager.snapshot()
+        return cls(
+            datasets=datasets,
+            screens=cls.screen_layout(window),
+            aggregates=cls.aggregate_sources(window),
+        )
+
+    @staticmethod
+    def screen_layout(window) -> List[Dict[str, Any]]:
+        """Describe the graph screens of a main window."""
         screens: List[Dict[str, Any]] = []
         for graph in window.graph_screens:
             screens.append({
                 "title": graph.windowTitle(),
                 "dataset": getattr(graph, "dataset_name", None),
             })
-        return cls(datasets=datasets, screens=screens)
+        return screens
+
+    @staticmethod
+    def aggregate_sources(window) -> Dict[str, Dict[str, Any]]:
+        """Describe the aggregates of a main window, including pending ones."""
+        aggregates = dict(window.pending_aggregates)
+        for name, aggregate in window.aggregates.items():
+            aggregates[name] = aggregate.to_dict()
+        return aggregates
+
+
+class LazyProfile:
+    """Profile whose datasets are parsed on demand.
+
+    Opening a profile parses the version, the screen layout and the list of
+    dataset names; datasets are decoded one at a time, in file order, only
+    when :meth:`load_dataset` first asks for them (or one stored after them).
+    Decoding is thread-safe, so datasets can be loaded in the background
+    while the window is already shown.
+
+    Older files that store the datasets ahead of the screens are read
+    completely when opened.
+    """
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        with open(path, "r", encoding="utf-8") as fh:
+            self._text = fh.read()
+        self._decoder = json.JSONDecoder()
+        self._lock = threading.Lock()
+        self._parsed: Dict[str, Any] = {}
+        self._taken: set = set()
+        # Position of the next dataset member, or ``None`` once all are read.
+        self._next: int | None = None
+        self.version = 1
+        self.screens: List[Dict[str, Any]] = []
+        self.aggregates: Dict[str, Dict[str, Any]] = {}
+        self.dataset_names: List[str] = []
+        self._header_read = False
+
+        header: Dict[str, Any] = {}
+        pos = self._expect(0, "{")
+        while self._text[pos] != "}":
+            key, pos = self._decoder.raw_decode(self._text, pos)
+            pos = self._expect(pos, ":")
+            if key == "datasets":
+                self._next = self._expect(pos, "{")
+                if "screens" in header and "dataset_names" in header:
+                    break
+                # Datasets ahead of the header: read them to reach the rest.
+                while self._next is not None:
+                    self._parse_next()
+                pos = self._after_datasets
+            else:
+                header[key], pos = self._decoder.raw_decode(self._text, pos)
+            pos = self._skip(pos)
+            if self._text[pos] == ",":
+                pos = self._skip(pos + 1)
+
+        self.version = header.get("version", 1)
+        self.screens = header.get("screens", [])
+        self.aggregates = header.get("aggregates", {})
+        self.dataset_names = header.get("dataset_names", list(self._parsed))
+        self._header_read = True
+        if self._next is None:
+            self._text = ""
+
+    # ------------------------------------------------------------------
+    def is_parsed(self, name: str) -> bool:
+        """Return ``True`` if ``name`` has been decoded already."""
+        return name in self._parsed
+
+    def prefetch(self, name: str) -> None:
+        """Decode datasets up to and including ``name``."""
+        with self._lock:
+            while name not in self._parsed and self._next is not None:
+                self._parse_next()
+            if name not in self._parsed and name not in self._taken:
+                raise KeyError(name)
+
+    def load_dataset(self, name: str) -> Any:
+        """Return dataset ``name``, handing over (and forgetting) its data."""
+        self.prefetch(name)
+        with self._lock:
+            if name in self._taken:
+                raise KeyError(f"Dataset '{name}' has already been loaded")
+            self._taken.add(name)
+            return self._parsed.pop(name)
+
+    def to_profile(self) -> AppProfile:
+        """Decode every dataset into a regular :class:`AppProfile`."""
+        datasets = {name: self.load_dataset(name) for name in self.dataset_names}
+        profile = AppProfile(
+            datasets=datasets, screens=self.screens, aggregates=self.aggregates
+        )
+        profile.version = self.version
+        return profile
+
+    # ------------------------------------------------------------------
+    def _skip(self, pos: int) -> int:
+        return _WHITESPACE.match(self._text, pos).end()
+
+    def _expect(self, pos: int, char: str) -> int:
+        pos = self._skip(pos)
+        if self._text[pos : pos + 1] != char:
+            raise ValueError(f"Expected '{char}' at position {pos} of profile")
+        return self._skip(pos + 1)
+
+    def _parse_next(self) -> None:
+        pos = self._next
+        if self._text[pos] == "}":
+            self._next = None
+            self._after_datasets = pos + 1
+            if self._header_read:
+                self._text = ""  # Everything is decoded; free the raw text.
+            return
+        name, pos = self._decoder.raw_decode(self._text, pos)
+        pos = self._expect(pos, ":")
+        self._parsed[name], pos = self._decoder.raw_decode(self._text, pos)
+        pos = self._skip(pos)
+        if self._text[pos] == ",":
+            pos = self._skip(pos + 1)
+        self._next = pos
+
+
+def open_profile(path: str):
+    """Open the profile at ``path`` for lazy loading, whatever its format."""
+    from .binary_profile import BinaryProfile, is_binary_profile
+
+    return BinaryProfile(path) if is_binary_profile(path) else LazyProfile(path)
@@ -0,0 +1,305 @@
+"""Derived series over :class:`~money_metrics.core.DataManager` datasets.
+
+:class:`DatasetQuery` turns tabular datasets (lists of row dicts) into NumPy
+columns and derives new series from them: resampling monthly data to
+quarters or years, rolling windows, cumulative sums and user-registered
+computed columns such as an inflation-adjusted balance.
+
+Every result is cached in an :class:`~money_metrics.core.cache.ArtifactCache`
+under the dataset's version, so switching views or re-plotting reuses
+unchanged aggregates.  When a dataset changes its version moves on and the
+stale results for that dataset are dropped the next time it is queried.
+Cell edits are the exception for the columns themselves: they are carried
+over to the new version by rewriting only the edited cells, so an edit
+costs in proportion to its size rather than to the size of the dataset.
+"""
+
+from __future__ import annotations
+
+import itertools
+from typing import Callable, Dict, Mapping, Tuple
+
+import numpy as np
+
+from .cache import ArtifactCache, shared_cache
+from .downsample import SeriesPyramid
+
+# Months folded into one period by :meth:`DatasetQuery.resample`.
+PERIODS = {"month": 1, "quarter": 3, "year": 12}
+
+_REDUCERS = {
+    "last": None,
+    "first": None,
+    "sum": np.add.reduceat,
+    "min": np.minimum.reduceat,
+    "max": np.maximum.reduceat,
+    "mean": None,
+}
+
+ComputedColumn = Callable[[Mapping[str, np.ndarray]], np.ndarray]
+
+# Distinguishes the cache entries of different queries (and so of different
+# data managers and computed column definitions) sharing one cache.
+_query_ids = itertools.count(1)
+
+
+def inflation_adjusted(annual_rate: float, column: str = "balance") -> ComputedColumn:
+    """Computed column deflating ``column`` to month-zero money.
+
+    Register it with ``query.register_column("real_balance",
+    inflation_adjusted(0.03))``.
+    """
+
+    def compute(columns: Mapping[str, np.ndarray]) -> np.ndarray:
+        months = columns["month"]
+        return columns[column] / (1.0 + annual_rate) ** (months / 12.0)
+
+    return compute
+
+
+class DatasetQuery:
+    """Memoised resampling, rolling and computed-column queries.
+
+    Parameters
+    ----------
+    data_manager: DataManager
+        Source of the datasets. Only :meth:`~DataManager.view`,
+        :meth:`~DataManager.version` and :meth:`~DataManager.subscribe` are
+        used, so no dataset is copied.
+    cache: ArtifactCache, optional
+        Where results are kept. Defaults to the :func:`shared_cache`.
+    """
+
+    def __init__(self, data_manager, cache: ArtifactCache | None = None):
+        self.data_manager = data_manager
+        self.cache = shared_cache() if cache is None else cache
+        self._computed: Dict[str, ComputedColumn] = {}
+        self._id = next(_query_ids)
+        # Bumped whenever a computed column is (re)defined so results that
+        # may depend on the old definition are no longer looked up.
+        self._generation = 0
+        self._versions: Dict[str, int] = {}
+        data_manager.subscribe(self._on_change, weak=True)
+
+    # ------------------------------------------------------------------
+    def register_column(self, name: str, func: ComputedColumn) -> None:
+        """Register a computed column available on every dataset.
+
+        ``func`` receives the dataset's columns (including other computed
+        columns) and returns an array with one value per row.
+        """
+
+        self._computed[name] = func
+        self._generation += 1
+
+    def computed_columns(self) -> list[str]:
+        """Names of the registered computed columns."""
+
+        return list(self._computed)
+
+    def columns(self, dataset: str) -> Dict[str, np.ndarray]:
+        """Numeric columns of ``dataset``; non-numeric columns are skipped."""
+
+        def build():
+            rows = self.data_manager.view(dataset)
+            if not (isinstance(rows, list) and rows and isinstance(rows[0], dict)):
+                return {}
+            result = {}
+            for key in rows[0]:
+                try:
+                    values = np.array([row.get(key) for row in rows], dtype=np.float64)
+                except (TypeError, ValueError):
+                    continue
+                values.flags.writeable = False
+                result[key] = values
+            if "month" not in result:
+                months = np.arange(1, len(rows) + 1, dtype=np.float64)
+                months.flags.writeable = False
+                result["month"] = months
+            return result
+
+        return self._cached(dataset, ("columns",), build)
+
+    def column(self, dataset: str, name: str) -> np.ndarray:
+        """Return a raw or computed column of ``dataset``."""
+
+        def build():
+            raw = self.columns(dataset)
+            if name in raw:
+                return raw[name]
+            if name not in self._computed:
+                raise KeyError(name)
+            values = np.asarray(
+                self._computed[name](_ColumnLookup(self, dataset)), dtype=np.float64
+            )
+            values.flags.writeable = False
+            return values
+
+        return self._cached(dataset, ("column", name), build)
+
+    # ------------------------------------------------------------------
+    def resample(
+        self, dataset: str, name: str, period: str = "quarter", how: str = "last"
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Aggregate ``name`` into quarters or years.
+
+        Returns the 1-based period numbers and one aggregated value per
+        period. ``how`` is one of ``last``, ``first``, ``sum``, ``mean``,
+        ``min`` or ``max``.
+        """
+
+        if period not in PERIODS:
+            raise ValueError(f"Unknown period '{period}'")
+        if how not in _REDUCERS:
+            raise ValueError(f"Unknown aggregation '{how}'")
+
+        def build():
+            months = self.column(dataset, "month").astype(np.int64)
+            values = self.column(dataset, name)
+            if period == "month" or not len(values):
+                return months, values
+            groups = (months - 1) // PERIODS[period] + 1
+            starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+            ends = np.r_[starts[1:], len(groups)]
+            if how == "last":
+                result = values[ends - 1]
+            elif how == "first":
+                result = values[starts]
+            elif how == "mean":
+                result = np.add.reduceat(values, starts) / (ends - starts)
+            else:
+                result = _REDUCERS[how](values, starts)
+            return groups[starts], result
+
+        return self._cached(dataset, ("resample", name, period, how), build)
+
+    def rolling(
+        self, dataset: str, name: str, window: int, how: str = "mean"
+    ) -> np.ndarray:
+        """Trailing ``window``-row ``mean`` or ``sum`` of ``name``.
+
+        The first ``window - 1`` values are NaN.
+        """
+
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        if how not in ("mean", "sum"):
+            raise ValueError(f"Unknown rolling aggregation '{how}'")
+
+        def build():
+            values = self.column(dataset, name)
+            sums = np.cumsum(np.r_[0.0, values])
+            result = np.full(len(values), np.nan)
+            result[window - 1 :] = sums[window:] - sums[:-window]
+            if how == "mean":
+                result /= window
+            return result
+
+        return self._cached(dataset, ("rolling", name, window, how), build)
+
+    def cumulative(self, dataset: str, name: str) -> np.ndarray:
+        """Running total of ``name``."""
+
+        return self._cached(
+            dataset,
+            ("cumulative", name),
+            lambda: np.cumsum(self.column(dataset, name)),
+        )
+
+    def pyramid(
+        self, dataset: str, name: str, period: str = "month"
+    ) -> SeriesPyramid:
+        """Downsampling pyramid of ``name`` resampled to ``period``."""
+
+        return self._cached(
+            dataset,
+            ("pyramid", name, period),
+            lambda: SeriesPyramid(*self.resample(dataset, name, period)),
+        )
+
+    # ------------------------------------------------------------------
+    def _on_change(self, change) -> None:
+        """Carry the cached columns over a cell edit of ``change.name``."""
+        previous = self._versions.get(change.name)
+        if previous == change.version:
+            return
+        columns = None
+        if change.kind == "updated" and previous is not None:
+            columns = self.cache.get(self._key(change.name, previous, ("columns",)))
+        if columns is not None:
+            columns = self._patch(change, columns)
+        if columns is None:
+            # Nothing to carry over: rebuild on the next query.
+            self._versions.pop(change.name, None)
+            return
+        self.cache.invalidate((self._id, change.name), keep_version=change.version)
+        self._versions[change.name] = change.version
+        self.cache.put(self._key(change.name, change.version, ("columns",)), columns)
+
+    def _patch(self, change, columns):
+        """Return ``columns`` with the edited cells rewritten, or ``None``.
+
+        ``None`` means the edit cannot be applied cell by cell (it touches a
+        non-numeric column, a new column or the months) and the columns have
+        to be rebuilt from the rows.
+        """
+        if change.rows is None or "month" in change.columns:
+            return None
+        rows = self.data_manager.view(change.name)
+        index = list(change.rows)
+        patched = dict(columns)
+        for key in change.columns:
+            if key not in columns:
+                return None
+            try:
+                values = np.array([rows[i].get(key) for i in index], dtype=np.float64)
+            except (TypeError, ValueError):
+                return None
+            array = columns[key].copy()
+            array[index] = values
+            array.flags.writeable = False
+            patched[key] = array
+        return patched
+
+    def _key(self, dataset: str, version, params: tuple) -> tuple:
+        return ((self._id, dataset), version, (self._generation, *params))
+
+    def _cached(self, dataset: str, params: tuple, build):
+        version = self.data_manager.version(dataset)
+        if self._versions.get(dataset) != version:
+            # The dataset changed (or is new): forget its stale results.
+            self.cache.invalidate((self._id, dataset), keep_version=version)
+            self._versions[dataset] = version
+        key = self._key(dataset, version, params)
+        result = self.cache.get(key, _MISSING)
+        if result is _MISSING:
+            result = build()
+            for array in result if isinstance(result, tuple) else (result,):
+                if isinstance(array, np.ndarray):
+                    array.flags.writeable = False
+            self.cache.put(key, result)
+        return result
+
+
+_MISSING = object()
+
+
+class _ColumnLookup(Mapping):
+    """Mapping handed to computed columns, resolving names lazily."""
+
+    def __init__(self, query: DatasetQuery, dataset: str):
+        self._query = query
+        self._dataset = dataset
+
+    def __getitem__(self, name):
+        return self._query.column(self._dataset, name)
+
+    def __iter__(self):
+        yield from self._query.columns(self._dataset)
+        yield from self._query.computed_columns()
+
+    def __len__(self):
+        return len(self._query.columns(self._dataset)) + len(self._query._computed)
+
+
+__all__ = ["DatasetQuery", "inflation_adjusted", "PERIODS"]
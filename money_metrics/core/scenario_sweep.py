@@ -0,0 +1,80 @@
+"""Bulk what-if sweeps over 401(k) parameters.
+
+Comparing many combinations of contribution, growth rate and horizon does not
+need a :class:`~money_metrics.core.four_zero_one_k.FourZeroOneK` per
+combination.  With a constant contribution ``c`` and growth rate ``g`` the
+balance after ``n`` months has the closed form::
+
+    b_n = b_0 * f**n + c * f * (f**n - 1) / (f - 1),    f = 1 + g
+
+so :func:`sweep` evaluates a whole parameter grid with a single broadcast
+expression and returns it as a compact structured array.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+SWEEP_DTYPE = np.dtype(
+    [
+        ("contribution", np.float64),
+        ("growth_rate", np.float64),
+        ("months", np.int64),
+        ("final_balance", np.float64),
+    ]
+)
+
+
+def final_balance(contribution, growth_rate, months, initial=0.0) -> np.ndarray:
+    """Closed-form balance after ``months`` of constant inputs.
+
+    All arguments broadcast against each other.  ``expm1``/``log1p`` keep the
+    result accurate for growth rates close to zero.
+    """
+
+    c = np.asarray(contribution, dtype=np.float64)
+    g = np.asarray(growth_rate, dtype=np.float64)
+    n = np.asarray(months, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = np.expm1(n * np.log1p(g))  # f**n - 1
+        annuity = np.where(g == 0, n, growth / np.where(g == 0, 1.0, g))
+        return initial * (growth + 1.0) + c * (1.0 + g) * annuity
+
+
+def sweep(contributions, growth_rates, horizons, initial=0.0) -> np.ndarray:
+    """Evaluate every combination of the given parameter values.
+
+    Returns
+    -------
+    numpy.ndarray
+        Structured array of :data:`SWEEP_DTYPE` with shape
+        ``(len(contributions), len(growth_rates), len(horizons))``.
+    """
+
+    c = np.asarray(contributions, dtype=np.float64).reshape(-1, 1, 1)
+    g = np.asarray(growth_rates, dtype=np.float64).reshape(1, -1, 1)
+    n = np.asarray(horizons, dtype=np.int64).reshape(1, 1, -1)
+    if np.any(n < 0):
+        raise ValueError("horizons must be non-negative")
+    if np.any(g <= -1):
+        raise ValueError("growth rates must be greater than -1")
+    shape = np.broadcast_shapes(c.shape, g.shape, n.shape)
+    result = np.empty(shape, dtype=SWEEP_DTYPE)
+    result["contribution"] = c
+    result["growth_rate"] = g
+    result["months"] = n
+    result["final_balance"] = final_balance(c, g, n, initial)
+    return result
+
+
+def rank(results: np.ndarray, top: int | None = None) -> np.ndarray:
+    """Flatten sweep ``results`` ordered by descending final balance."""
+
+    flat = results.reshape(-1)
+    order = np.argsort(-flat["final_balance"], kind="stable")
+    if top is not None:
+        order = order[:top]
+    return flat[order]
+
+
+__all__ = ["SWEEP_DTYPE", "final_balance", "sweep", "rank"]
@@ -0,0 +1,71 @@
+"""Plot-ready arrays shared by every screen showing a dataset.
+
+Each graph screen used to extract its own ``months``/``values`` arrays from
+its own copy of a dataset, so ten screens over one large dataset held ten
+copies and did ten extractions after every change.  A :class:`SeriesStore`
+prepares the arrays once per dataset version and parameter and hands the
+same read-only arrays (and downsampling pyramids) to every caller.  Entries
+live in an :class:`~money_metrics.core.cache.ArtifactCache`, so they are
+budgeted with the other cached artifacts and superseded versions are freed.
+
+Each data manager owns one store, returned by
+:meth:`DataManager.series_store <money_metrics.core.data_manager.DataManager.series_store>`
+and by :func:`series_store`.
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+from .cache import ArtifactCache
+from .downsample import SeriesPyramid
+from .monte_carlo import BAND_COLUMNS
+from .query import DatasetQuery
+
+
+class SeriesStore:
+    """Versioned store of prepared plot arrays for one data manager.
+
+    Parameters
+    ----------
+    data_manager: DataManager
+        Source of the datasets.
+    cache: ArtifactCache, optional
+        Where the arrays are kept. Defaults to the shared cache.
+
+    Arrays are keyed by dataset, dataset version, parameter and period, and
+    computed columns registered on :attr:`query` are available to every
+    screen using the store.
+    """
+
+    def __init__(self, data_manager, cache: ArtifactCache | None = None):
+        self.data_manager = data_manager
+        self.query = DatasetQuery(data_manager, cache)
+
+    def series(
+        self, dataset: str, name: str, period: str = "month"
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the x values and the values of ``name`` per ``period``."""
+        return self.query.resample(dataset, name, period)
+
+    def pyramid(self, dataset: str, name: str, period: str = "month") -> SeriesPyramid:
+        """Return the downsampling pyramid of :meth:`series`."""
+        return self.query.pyramid(dataset, name, period)
+
+    def band(
+        self, dataset: str, period: str = "month"
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the x values and outer percentiles of a projection."""
+        low, _, high = BAND_COLUMNS
+        x, lows = self.series(dataset, low, period)
+        return x, lows, self.series(dataset, high, period)[1]
+
+
+def series_store(data_manager) -> SeriesStore:
+    """Return the :class:`SeriesStore` shared by all users of ``data_manager``."""
+    return data_manager.series_store()
+
+
+__all__ = ["SeriesStore", "series_store"]
@@ -0,0 +1,186 @@
+"""SQLite storage backend for :class:`~money_metrics.core.DataManager`.
+
+:class:`SQLiteDataManager` keeps datasets in a database file built on the
+standard library :mod:`sqlite3` module instead of in memory.  List datasets
+are stored one JSON-encoded row per database row, so the table view can page
+through row ranges and cell edits rewrite only the rows they touch.  Opening
+a store reads nothing but dataset names and versions, which keeps start-up
+time and resident memory flat however many datasets it holds.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from collections import OrderedDict
+
+from .data_manager import DataManager, _freeze, _replace_rows
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS datasets (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    kind TEXT NOT NULL,
+    row_count INTEGER NOT NULL DEFAULT 0,
+    payload TEXT
+);
+CREATE TABLE IF NOT EXISTS rows (
+    dataset TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (dataset, idx)
+) WITHOUT ROWID;
+"""
+
+
+class SQLiteDataManager(DataManager):
+    """:class:`DataManager` persisted to an SQLite database.
+
+    Parameters
+    ----------
+    path: str, optional
+        Database file. Defaults to a private in-memory database.
+    cache_size: int, optional
+        Number of recently viewed datasets kept in memory. Everything else
+        is loaded from the database on demand.
+
+    Datasets must be JSON-serialisable, as they already are for profiles.
+    """
+
+    def __init__(self, path=":memory:", cache_size=2):
+        super().__init__()
+        if path != ":memory:":
+            self.path = os.path.abspath(path)
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(_SCHEMA)
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_size = cache_size
+        for name, version in self._conn.execute(
+            "SELECT name, version FROM datasets ORDER BY rowid"
+        ):
+            self._versions[name] = version
+        self._version_counter = max(self._versions.values(), default=0)
+
+    def close(self):
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    # ------------------------------------------------------------------
+    def view(self, name):
+        self._materialize(name)
+        if name in self._cache:
+            self._cache.move_to_end(name)
+            return self._cache[name]
+        row = self._conn.execute(
+            "SELECT kind, payload FROM datasets WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            return None
+        kind, payload = row
+        if kind == "rows":
+            cursor = self._conn.execute(
+                "SELECT data FROM rows WHERE dataset = ? ORDER BY idx", (name,)
+            )
+            data = _freeze([json.loads(text) for (text,) in cursor])
+        else:
+            data = _freeze(json.loads(payload))
+        self._remember(name, data)
+        return data
+
+    def names(self):
+        return list(self._versions)
+
+    def __contains__(self, name):
+        return name in self._versions
+
+    def row_count(self, name):
+        self._materialize(name)
+        row = self._conn.execute(
+            "SELECT kind, row_count FROM datasets WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(name)
+        if row[0] != "rows":
+            raise TypeError(f"Dataset '{name}' is not a list of rows")
+        return row[1]
+
+    def get_rows(self, name, start, stop):
+        if name in self._cache:
+            return super().get_rows(name, start, stop)
+        count = self.row_count(name)
+        start, stop, _ = slice(start, stop).indices(count)
+        cursor = self._conn.execute(
+            "SELECT data FROM rows WHERE dataset = ? AND idx >= ? AND idx < ?"
+            " ORDER BY idx",
+            (name, start, stop),
+        )
+        return [json.loads(text) for (text,) in cursor]
+
+    # ------------------------------------------------------------------
+    def _save(self, name, frozen):
+        is_rows = isinstance(frozen, list)
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO datasets (name, version, kind, row_count, payload)"
+                " VALUES (?, ?, ?, ?, ?) ON CONFLICT(name) DO UPDATE SET"
+                " version = excluded.version, kind = excluded.kind,"
+                " row_count = excluded.row_count, payload = excluded.payload",
+                (
+                    name,
+                    # Lazy datasets already have their version when stored.
+                    self._versions.get(name, 0),
+                    "rows" if is_rows else "blob",
+                    len(frozen) if is_rows else 0,
+                    None if is_rows else json.dumps(frozen),
+                ),
+            )
+            self._conn.execute("DELETE FROM rows WHERE dataset = ?", (name,))
+            if is_rows:
+                self._conn.executemany(
+                    "INSERT INTO rows (dataset, idx, data) VALUES (?, ?, ?)",
+                    ((name, i, json.dumps(row)) for i, row in enumerate(frozen)),
+                )
+        self._remember(name, frozen)
+
+    def _save_rows(self, name, rows):
+        with self._conn:
+            self._conn.executemany(
+                "UPDATE rows SET data = ? WHERE dataset = ? AND idx = ?",
+                ((json.dumps(row), name, i) for i, row in rows.items()),
+            )
+        if name in self._cache:
+            _replace_rows(self._cache, name, rows)
+
+    def _load_row(self, name, index):
+        self._materialize(name)
+        if name in self._cache:
+            return self._cache[name][index]
+        (text,) = self._conn.execute(
+            "SELECT data FROM rows WHERE dataset = ? AND idx = ?", (name, index)
+        ).fetchone()
+        return json.loads(text)
+
+    def _delete(self, name):
+        self._cache.pop(name, None)
+        with self._conn:
+            cursor = self._conn.execute("DELETE FROM datasets WHERE name = ?", (name,))
+            self._conn.execute("DELETE FROM rows WHERE dataset = ?", (name,))
+        return cursor.rowcount > 0
+
+    def _bump_version(self, name):
+        super()._bump_version(name)
+        with self._conn:
+            self._conn.execute(
+                "UPDATE datasets SET version = ? WHERE name = ?",
+                (self._versions[name], name),
+            )
+
+    def _remember(self, name, data):
+        self._cache[name] = data
+        self._cache.move_to_end(name)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+
+__all__ = ["SQLiteDataManager"]
@@ -2,5 +2,6 @@
 
 from .main_window import MainWindow
 from .graph_screen import GraphScreen
+from .sweep_screen import SweepScreen
 
-__all__ = ["MainWindow", "GraphScreen"]
+__all__ = ["MainWindow", "GraphScreen", "SweepScreen"]
@@ -0,0 +1,75 @@
+"""Run work off the UI thread.
+
+:class:`BackgroundTask` runs a function in Qt's global thread pool and
+reports progress, the result or an error through Qt signals, which are
+delivered on the UI thread.  Widgets therefore stay responsive while long
+jobs such as parsing a large profile run.
+"""
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+class TaskSignals(QObject):
+    """Signals emitted by a :class:`BackgroundTask`."""
+
+    # done, total and the item that was just completed
+    progress = Signal(int, int, object)
+    finished = Signal(object)
+    failed = Signal(str)
+
+
+class BackgroundTask(QRunnable):
+    """Call ``func(report)`` on a worker thread.
+
+    ``func`` may call ``report(done, total, item)`` to publish progress;
+    ``report`` returns ``False`` once the task has been cancelled so the
+    function can stop early. Its return value is emitted by
+    ``signals.finished`` and any exception by ``signals.failed``.
+    """
+
+    def __init__(self, func):
+        super().__init__()
+        # The Python object owns the task, so it outlives ``run``.
+        self.setAutoDelete(False)
+        self._func = func
+        self.cancelled = False
+        self.signals = TaskSignals()
+
+    def run(self):  # type: ignore[override]
+        try:
+            result = self._func(self._report)
+        except Exception as exc:  # pragma: no cover - reported to the UI
+            self.signals.failed.emit(str(exc))
+            return
+        if not self.cancelled:
+            self.signals.finished.emit(result)
+
+    def start(self) -> "BackgroundTask":
+        """Queue the task on the global thread pool."""
+        QThreadPool.globalInstance().start(self)
+        return self
+
+    def cancel(self) -> None:
+        """Ask the task to stop and suppress its remaining signals."""
+        self.cancelled = True
+
+    def _report(self, done, total, item=None) -> bool:
+        if self.cancelled:
+            return False
+        self.signals.progress.emit(done, total, item)
+        return True
+
+
+def prefetch_datasets(profile, names) -> BackgroundTask:
+    """Task decoding the datasets ``names`` of a :class:`LazyProfile`."""
+
+    def work(report):
+        for done, name in enumerate(names, 1):
+            profile.prefetch(name)
+            if not report(done, len(names), name):
+                break
+
+    return BackgroundTask(work)
+
+
+__all__ = ["BackgroundTask", "TaskSignals", "prefetch_datasets"]
@@ -6,36 +6,52 @@ from PySide6.QtWidgets import (
     QMenu,
     QInputDialog,
     QMessageBox,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QPushButton,
 )
-from PySide6.QtGui import QDrag
-from PySide6.QtCore import Qt, QMimeData
+from PySide6.QtCore import Qt, QTimer, Signal
+
+import time
+import weakref
 
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
+import numpy as np
 
-from money_metrics.core.four_zero_one_k import FourZeroOneK
+from money_metrics.core.downsample import SeriesPyramid, envelope
+from money_metrics.core.four_zero_one_k import compound_balances
+from money_metrics.core.monte_carlo import BAND_COLUMNS
 
+from .render_pool import PlotSpec, RenderedCanvas
+from .table_model import DatasetTableModel, PagedRows
 
-class ParameterTableWidget(QTableWidget):
-    """QTableWidget that starts a drag with the column name."""
+# Changes published by the data manager are coalesced and applied at most
+# once per frame (~60 Hz).
+_FRAME_INTERVAL_MS = 16
 
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setDragEnabled(True)
+# Target time from a cell edit to the graph showing it, for datasets of up
+# to ``EDIT_LATENCY_TARGET_ROWS`` rows; see ``benchmarks/bench_edit_pipeline.py``.
+# An edit to a 401(k) plan rewrites the balance of every later month, so in
+# longer plans the latency grows with the number of rows an edit changes.
+EDIT_LATENCY_TARGET_MS = 50
+EDIT_LATENCY_TARGET_ROWS = 10_000
+
+# Context menu labels for the resampling periods of the graph.
+_PERIOD_LABELS = {"month": "Monthly", "quarter": "Quarterly", "year": "Yearly"}
+
+# Points are marked only while they are at least this many pixels apart.
+_MARKER_SPACING_PX = 8
+
+
+def _line_marker(points: int, pixels: int) -> str:
+    return "o" if points * _MARKER_SPACING_PX <= pixels else ""
 
-    def startDrag(self, supportedActions):  # type: ignore[override]
-        item = self.currentItem()
-        if item is None:
-            return
-        drag = QDrag(self)
-        mime = QMimeData()
-        column_name = self.horizontalHeaderItem(item.column()).text()
-        mime.setText(column_name)
-        drag.setMimeData(mime)
-        drag.exec(Qt.CopyAction)
+
+def _is_table(data) -> bool:
+    """Return ``True`` for a non-empty sequence of row dicts."""
+    return (
+        isinstance(data, (list, PagedRows)) and len(data) > 0 and isinstance(data[0], dict)
+    )
 
 
 class DragDropCanvas(FigureCanvas):
@@ -43,7 +59,8 @@ class DragDropCanvas(FigureCanvas):
 
     def __init__(self, screen, *args, **kwargs):
         super().__init__(Figure(figsize=(5, 3)))
-        self._screen = screen
+        # Weak, so the screen is freed as soon as it is no longer used.
+        self._screen = weakref.proxy(screen)
         self.setAcceptDrops(True)
 
     def dragEnterEvent(self, event):  # type: ignore[override]
@@ -61,11 +78,18 @@ class GraphScreen(QDockWidget):
     The screen does not automatically load any data. Data can be assigned
     later via :meth:`set_data`. The widget can be renamed, detached/attached
     and closed through a context menu.
+
+    Edits made in the table are pushed to the :class:`DataManager`, and
+    changes made elsewhere to the shown dataset are merged into the table
+    and graph.
     """
 
+    # Emitted with the new dataset name when the screen shows another dataset.
+    datasetChanged = Signal(object)
+
     _counter = 1
 
-    def __init__(self, data_manager, parent=None, title=None):
+    def __init__(self, data_manager, parent=None, title=None, render_pool=None):
         if title is None:
             title = "Plot" if GraphScreen._counter == 1 else f"Plot{GraphScreen._counter}"
             GraphScreen._counter += 1
@@ -75,6 +99,9 @@ class GraphScreen(QDockWidget):
         self.dataset_name = None
         # Track which parameters from the dataset are currently graphed
         self._parameters: list[str] = []
+        self.series = data_manager.series_store()
+        self.query = self.series.query
+        self.period = "month"
 
         content = QWidget(self)
         self._layout = QVBoxLayout(content)
@@ -82,16 +109,67 @@ class GraphScreen(QDockWidget):
         self.label.setAlignment(Qt.AlignCenter)
         self.add_button = QPushButton("+ Add data", content)
         self.add_button.clicked.connect(self._add_data)
-        self.table = ParameterTableWidget(content)
-        self.table.setEditTriggers(QTableWidget.AllEditTriggers)
+        # Cells are read from the rows on demand; dragging a cell starts a
+        # drag with its column name.
+        self.table_model = DatasetTableModel(self)
+        self.table_model.cellEdited.connect(self._on_cell_edited)
+        self.table = QTableView(content)
+        self.table.setModel(self.table_model)
+        self.table.setEditTriggers(QTableView.AllEditTriggers)
+        self.table.setDragEnabled(True)
+        self.table.setDragDropMode(QTableView.DragOnly)
         header = self.table.horizontalHeader()
         header.setSectionsMovable(True)
         header.setSectionsClickable(True)
         header.sectionDoubleClicked.connect(self._rename_column)
-        self.table.itemChanged.connect(self._on_item_changed)
-        self.canvas = DragDropCanvas(self)
+        self.render_pool = render_pool
+        if render_pool is None:
+            self.canvas = DragDropCanvas(self)
+            self.canvas.mpl_connect("draw_event", self._on_draw)
+        else:
+            self.canvas = RenderedCanvas(self)
+            key = id(self)
+            self.destroyed.connect(lambda *_: render_pool.forget(key))
+        self._ax = None
+        self._lines = {}
+        self._band = None
+        self._background = None
+        self._plot_layout = None
+        self._pyramids = {}
+        self._band_data = None
+        # x range shown by a pooled screen; None fits the data.
+        self._view = None
         self.view_mode = "graph"
 
+        # Cell edits waiting for the next event-loop turn: row -> {key: value}
+        self._pending_edits: dict = {}
+        self._first_edit_at = None
+        self.last_edit_latency = None
+        self._edit_timer = QTimer(self)
+        self._edit_timer.setSingleShot(True)
+        self._edit_timer.setInterval(0)
+        self._edit_timer.timeout.connect(self.flush_edits)
+        self._last_redraw = 0.0
+        self._redraw_timer = QTimer(self)
+        self._redraw_timer.setSingleShot(True)
+        self._redraw_timer.timeout.connect(self._redraw)
+
+        # Screens start out as not hidden; visibilityChanged tracks tabs.
+        self._hidden = False
+        # Version of a change that arrived while hidden, and whether a graph
+        # update was skipped; both are caught up when the screen is shown.
+        self._stale_version = None
+        self._graph_stale = False
+        self.visibilityChanged.connect(self._on_visibility_changed)
+
+        self._pending_change = None
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(_FRAME_INTERVAL_MS)
+        self._refresh_timer.timeout.connect(self._apply_pending_changes)
+        token = data_manager.subscribe(self._on_dataset_changed, weak=True)
+        self.destroyed.connect(lambda *_: data_manager.unsubscribe(token))
+
         self._layout.addWidget(self.add_button)
         self._layout.addWidget(self.label)
         self._current_widget = self.label
@@ -110,16 +188,26 @@ class GraphScreen(QDockWidget):
             Name of the dataset, stored so the screen can be recreated when a
             profile is loaded.
         """
+        changed = name != self.dataset_name
         self.data = data
         self.dataset_name = name
-
-        if isinstance(data, list) and data and isinstance(data[0], dict):
+        self._view = None
+        # Edits of the previous data no longer apply.
+        self._pending_edits = {}
+        self._first_edit_at = None
+        self._edit_timer.stop()
+        self._redraw_timer.stop()
+
+        if _is_table(data):
             # When new tabular data is assigned default to graphing the
-            # calculated balance if present. The user can add/remove
-            # additional parameters via the context menu.
+            # calculated balance (or the median of a projection) if present.
+            # The user can add/remove additional parameters via the context
+            # menu.
             self._parameters = []
             if "balance" in data[0]:
                 self._parameters.append("balance")
+            elif self._is_band_dataset(data):
+                self._parameters.append(BAND_COLUMNS[1])
             self._update_table(data)
             self._update_graph(data)
             widget = self.canvas if self.view_mode == "graph" else self.table
@@ -128,6 +216,47 @@ class GraphScreen(QDockWidget):
             text = "No data" if data is None else str(data)
             self.label.setText(text)
             self._set_widget(self.label)
+        if changed:
+            self.datasetChanged.emit(name)
+
+    def show_dataset(self, name) -> bool:
+        """Show dataset ``name`` of the data manager.
+
+        The rows of a tabular dataset are not copied; the screen reads them
+        from the data manager as :class:`PagedRows`. Returns ``False`` if
+        there is no such dataset.
+        """
+        if name not in self.data_manager:
+            return False
+        data = PagedRows(self.data_manager, name)
+        if not _is_table(data):
+            data = self.data_manager.get_dataset(name)
+        self.set_data(data, name)
+        return True
+
+    @property
+    def read_only(self) -> bool:
+        """``True`` if the table does not accept edits."""
+        return self.table_model.read_only
+
+    def set_read_only(self, read_only: bool) -> None:
+        """Turn table edits and column renames off, e.g. for derived datasets.
+
+        A derived dataset such as an
+        :class:`~money_metrics.core.aggregate.AggregateDataset` is rewritten
+        from its sources, which would overwrite any edit made to it.
+        """
+        self.table_model.read_only = read_only
+
+    def show_loading(self, name):
+        """Show that dataset ``name`` is being loaded in the background."""
+        changed = name != self.dataset_name
+        self.data = None
+        self.dataset_name = name
+        self.label.setText(f"Loading '{name}'...")
+        self._set_widget(self.label)
+        if changed:
+            self.datasetChanged.emit(name)
 
     # ------------------------ UI actions ---------------------------
     def contextMenuEvent(self, event):
@@ -135,9 +264,17 @@ class GraphScreen(QDockWidget):
         rename_action = menu.addAction("Rename")
         data_action = menu.addAction("Set Data")
         add_param = remove_param = toggle_action = None
-        if isinstance(self.data, list) and self.data and isinstance(self.data[0], dict):
+        period_actions = {}
+        if _is_table(self.data):
             add_param = menu.addAction("Add Parameter")
             remove_param = menu.addAction("Remove Parameter")
+            if self.dataset_name in self.data_manager:
+                view_menu = menu.addMenu("View")
+                for period, label in _PERIOD_LABELS.items():
+                    period_action = view_menu.addAction(label)
+                    period_action.setCheckable(True)
+                    period_action.setChecked(period == self.period)
+                    period_actions[period_action] = period
             toggle_action = menu.addAction(
                 "Show Table" if self.view_mode == "graph" else "Show Graph"
             )
@@ -156,6 +293,8 @@ class GraphScreen(QDockWidget):
             self._remove_parameter()
         elif toggle_action and action == toggle_action:
             self._toggle_view()
+        elif action in period_actions:
+            self.set_period(period_actions[action])
         elif action == detach_action:
             self.setFloating(not self.isFloating())
         elif action == close_action:
@@ -170,15 +309,14 @@ class GraphScreen(QDockWidget):
         name, ok = QInputDialog.getText(self, "Set Data", "Dataset name:")
         if not ok or not name:
             return
-        data = self.data_manager.get_dataset(name)
-        if data is None:
+        if not self.show_dataset(name):
             QMessageBox.warning(self, "Data not found", f"Dataset '{name}' not found.")
-            return
-        self.set_data(data, name)
 
     # ------------------------ Column management ---------------------
     def _rename_column(self, index: int) -> None:
-        old = self.table.horizontalHeaderItem(index).text()
+        if self.read_only:
+            return
+        old = self.table_model.column_name(index)
         text, ok = QInputDialog.getText(
             self, "Rename Column", "Column name:", text=old
         )
@@ -188,34 +326,140 @@ class GraphScreen(QDockWidget):
     def rename_column(self, index: int, new_name: str) -> None:
         """Rename a column both in the table and underlying data."""
 
-        old_name = self.table.horizontalHeaderItem(index).text()
+        old_name = self.table_model.column_name(index)
         if not new_name or new_name == old_name:
             return
-        self.table.horizontalHeaderItem(index).setText(new_name)
-        for row in self.data:
-            row[new_name] = row.pop(old_name, None)
+        self.flush_edits()
+        self.table_model.rename_column(index, new_name)
         if old_name in self._parameters:
             i = self._parameters.index(old_name)
             self._parameters[i] = new_name
-        self._sync_data_manager()
+        if self.dataset_name in self.data_manager:
+            self.data_manager.rename_column(
+                self.dataset_name, old_name, new_name, source=self
+            )
+            # Read the renamed rows rather than renaming private copies.
+            self.data = PagedRows(self.data_manager, self.dataset_name)
+            self.table_model.rows_changed(0, len(self.data) - 1, self.data)
+        else:
+            for i in range(len(self.data)):
+                row = self._own_row(i)
+                row[new_name] = row.pop(old_name, None)
+            self._sync_data_manager()
         self._update_graph(self.data)
 
-    def _on_item_changed(self, item: QTableWidgetItem) -> None:
-        key = self.table.horizontalHeaderItem(item.column()).text()
-        row = item.row()
-        try:
-            value = float(item.text())
-        except ValueError:
+    def _on_cell_edited(self, row: int, key: str, value: float) -> None:
+        """Queue an edit; the batch is applied on the next event-loop turn.
+
+        See :meth:`flush_edits` for what a batch does.
+        """
+        if isinstance(self.data, list):
+            self._own_row(row)[key] = value
+        self._pending_edits.setdefault(row, {})[key] = value
+        if self._first_edit_at is None:
+            self._first_edit_at = time.perf_counter()
+        if not self._edit_timer.isActive():
+            self._edit_timer.start()
+
+    def flush_edits(self) -> None:
+        """Apply the queued cell edits as one batch.
+
+        The 401(k) balances are recomputed once from the earliest edited row,
+        the table is refreshed over the recomputed rows and the data manager
+        receives one cell delta; the graph is redrawn at most once per frame.
+        :attr:`last_edit_latency` records how long the batch took from its
+        first edit to the redraw.
+        """
+        self._edit_timer.stop()
+        edits, self._pending_edits = self._pending_edits, {}
+        if not edits:
             return
-        self.data[row][key] = value
+        changed = {row: dict(values) for row, values in edits.items()}
         if self._is_401k_dataset():
-            plan = FourZeroOneK(self.data)
-            self.data = plan.to_dict()
-            self.table.blockSignals(True)
-            self._update_table(self.data)
-            self.table.blockSignals(False)
-        self._sync_data_manager()
+            # Balances of the earliest edited month and every later month
+            # change; earlier ones are untouched.
+            start = min(edits)
+            balances = compound_balances(*self._plan_inputs(start, edits))
+            owned = isinstance(self.data, list)
+            for i, balance in enumerate(balances.tolist(), start):
+                if owned:
+                    self._own_row(i)["balance"] = balance
+                changed.setdefault(i, {})["balance"] = balance
+        self._push_changes(changed)
+        self._update_table_rows(changed)
+        self._schedule_redraw()
+
+    def _plan_inputs(self, start: int, edits: dict):
+        """Contributions and growth rates from ``start`` and the opening balance.
+
+        Rows read from the data manager do not hold the queued ``edits`` yet,
+        so they are taken from the shared columns with the edits applied.
+        """
+        if isinstance(self.data, list):
+            rows = self.data[start:]
+            return (
+                [r["contribution"] for r in rows],
+                [r["growth_rate"] for r in rows],
+                self.data[start - 1]["balance"] if start else 0.0,
+            )
+        columns = self.query.columns(self.dataset_name)
+        contributions = columns["contribution"][start:].copy()
+        growth_rates = columns["growth_rate"][start:].copy()
+        for row, values in edits.items():
+            if "contribution" in values:
+                contributions[row - start] = values["contribution"]
+            if "growth_rate" in values:
+                growth_rates[row - start] = values["growth_rate"]
+        opening = float(columns["balance"][start - 1]) if start else 0.0
+        return contributions, growth_rates, opening
+
+    def _schedule_redraw(self) -> None:
+        """Redraw the graph on the next frame, at most once per frame."""
+        if self._redraw_timer.isActive():
+            return
+        elapsed = (time.perf_counter() - self._last_redraw) * 1000
+        self._redraw_timer.start(max(0, int(_FRAME_INTERVAL_MS - elapsed)))
+
+    def _redraw(self) -> None:
+        self._redraw_timer.stop()
         self._update_graph(self.data)
+        self._last_redraw = time.perf_counter()
+        if self._first_edit_at is not None:
+            self.last_edit_latency = self._last_redraw - self._first_edit_at
+            self._first_edit_at = None
+
+    def set_period(self, period: str) -> None:
+        """Graph the data per ``"month"``, ``"quarter"`` or ``"year"``.
+
+        Managed datasets are resampled by :attr:`query`, where computed
+        columns can also be registered for graphing.
+        """
+
+        if period not in _PERIOD_LABELS:
+            raise ValueError(f"Unknown period '{period}'")
+        self.period = period
+        self._update_graph(self.data)
+
+    def set_view(self, x0=None, x1=None) -> None:
+        """Show the x range ``x0`` to ``x1``, or all the data if omitted.
+
+        The lines are re-sampled for the range, on the Matplotlib canvas and
+        on a render pool alike.  Screens drawn by a render pool show an image
+        without axes to zoom, so this is how they are zoomed and panned.
+        """
+        self._view = None if x0 is None else (x0, x1)
+        if self.render_pool is not None:
+            self._update_graph(self.data)
+        elif self._ax is not None:
+            if self._view is None:
+                self._resample_view(full=True)
+                self._ax.set_autoscalex_on(True)
+                self._ax.relim()
+                self._ax.autoscale_view()
+            else:
+                # Re-sampled by the xlim_changed callback.
+                self._ax.set_xlim(x0, x1)
+            self.canvas.draw_idle()
 
     def handle_dropped_parameter(self, param: str) -> None:
         """Toggle a parameter on the graph via drag-and-drop."""
@@ -239,58 +483,330 @@ class GraphScreen(QDockWidget):
         if self.dataset_name:
             self.data_manager.add_dataset(self.dataset_name, self.data, replace=True)
 
+    def _push_changes(self, changed: dict) -> None:
+        """Send edited rows to the data manager as a cell delta."""
+        if self.dataset_name in self.data_manager:
+            self.data_manager.update_cells(self.dataset_name, changed, source=self)
+        else:
+            self._sync_data_manager()
+
+    def _on_dataset_changed(self, change) -> None:
+        """Queue a change published by the data manager.
+
+        Bursts of changes are merged and applied once per frame by
+        :meth:`_apply_pending_changes`.
+        """
+        if change.name != self.dataset_name or change.source is self:
+            return
+        if self._hidden:
+            # Only remember that the dataset moved on; the catch-up on show
+            # reloads it once, however many changes arrive meanwhile.
+            self._stale_version = change.version
+            self._pending_change = None
+            self._refresh_timer.stop()
+            return
+        if self._pending_change is None:
+            self._pending_change = change
+        else:
+            self._pending_change = self._pending_change.merge(change)
+        if not self._refresh_timer.isActive():
+            self._refresh_timer.start()
+
+    def _apply_pending_changes(self) -> None:
+        """Apply the coalesced changes received since the last frame."""
+        change, self._pending_change = self._pending_change, None
+        if change is None or change.kind == "removed":
+            return
+        # Local edits go first so the remote change is applied on top.
+        self.flush_edits()
+        if change.kind == "updated" and _is_table(self.data):
+            if isinstance(self.data, list):
+                view = self.data_manager.view(self.dataset_name)
+                for row in change.rows:
+                    self.data[row] = view[row]
+            self._update_table_rows(dict.fromkeys(change.rows))
+            self._update_graph(self.data)
+            return
+        self._reload(change.rename)
+
+    def _reload(self, rename: tuple = ()) -> None:
+        """Replace the screen's data with the dataset's current contents.
+
+        ``rename`` lists the ``(old, new)`` names of renamed columns, so
+        graphed columns stay graphed under their new names.
+        """
+        parameters = self._parameters
+        for old, new in rename:
+            parameters = [new if p == old else p for p in parameters]
+        self.show_dataset(self.dataset_name)
+        data = self.data
+        if _is_table(data):
+            # Keep the user's selection of graphed parameters where possible.
+            self._parameters = [p for p in parameters if p in data[0]]
+            self._update_graph(data)
+
+    def _on_visibility_changed(self, visible: bool) -> None:
+        """Catch up on the changes made while the screen was hidden.
+
+        A hidden screen (e.g. behind another tab) does no table or graph
+        work: changes to its dataset only record the latest version, and one
+        refresh runs when the screen is shown again.
+        """
+        self._hidden = not visible
+        if not visible:
+            return
+        stale, self._stale_version = self._stale_version, None
+        if stale is not None and self.dataset_name in self.data_manager:
+            self.flush_edits()
+            self._reload()
+        elif self._graph_stale:
+            self._update_graph(self.data)
+
+    def _own_row(self, index: int) -> dict:
+        """Return row ``index`` as a dict this screen may modify."""
+        row = self.data[index]
+        if type(row) is not dict:
+            # A read-only row shared with the data manager: copy on write.
+            row = self.data[index] = dict(row)
+        return row
+
     def _is_401k_dataset(self) -> bool:
-        return (
-            isinstance(self.data, list)
-            and self.data
-            and {
-                "month",
-                "contribution",
-                "growth_rate",
-                "balance",
-            }.issubset(self.data[0].keys())
-        )
+        return _is_table(self.data) and {
+            "month",
+            "contribution",
+            "growth_rate",
+            "balance",
+        }.issubset(self.data[0].keys())
+
+    @staticmethod
+    def _is_band_dataset(data) -> bool:
+        return set(BAND_COLUMNS).issubset(data[0].keys())
 
     def _update_table(self, data):
-        self.table.blockSignals(True)
-        keys = list(data[0].keys())
-        self.table.setColumnCount(len(keys))
-        self.table.setHorizontalHeaderLabels(keys)
-        self.table.setRowCount(len(data))
-        for row, entry in enumerate(data):
-            for col, key in enumerate(keys):
-                item = QTableWidgetItem(str(entry.get(key, "")))
-                self.table.setItem(row, col, item)
-        self.table.blockSignals(False)
+        self.table_model.set_rows(data)
+
+    def _update_table_rows(self, changed: dict) -> None:
+        """Refresh the cells of ``changed`` rows without resetting the table."""
+        if changed:
+            self.table_model.rows_changed(min(changed), max(changed), self.data)
 
     def _update_graph(self, data):
-        """Render the selected parameters against months."""
+        """Render the selected parameters against months.
+
+        The series are prepared by the data manager's shared
+        :class:`~money_metrics.core.series_store.SeriesStore`, cached per
+        dataset version, so screens showing the same dataset share them.
+        Each parameter is drawn by a persistent, animated ``Line2D`` fed with
+        a downsampled view of its series.  While the graphed parameters stay
+        the same, an update only calls ``set_data`` on the lines and blits
+        them over a cached background; axes are relimited (and the figure
+        fully redrawn) only when the data leaves the current view limits.
+        Changing what is graphed rebuilds the axes.  Hidden screens skip the
+        update until they are shown.  With a render pool the graph is instead
+        rendered to an image off the UI thread, see :meth:`_request_render`.
+        """
+
+        if self._hidden:
+            self._graph_stale = True
+            return
+        self._graph_stale = False
+
+        if not _is_table(data):
+            self._pyramids, self._band_data = {}, None
+            if self.render_pool is not None:
+                self.render_pool.forget(id(self))
+                self.canvas.set_image(None)
+            else:
+                self._build_plot(None, [])
+            return
 
-        # ``Figure.subplots`` creates a new set of axes every time it is
-        # called, which previously caused the figure to accumulate multiple
-        # axes when the graph was refreshed. Reuse the existing axes instead
-        # of adding new ones so repeated calls simply redraw on the same
-        # canvas.
+        xlabel, self._band_data, series = self._graph_series(data)
+        self._pyramids = dict(series)
+        if self.render_pool is not None:
+            self._request_render(xlabel)
+            return
+        layout = (xlabel, self._band_data is not None, tuple(self._pyramids))
+        if self._ax is None or layout != self._plot_layout:
+            self._build_plot(xlabel, series)
+            self._plot_layout = layout
+            return
 
+        if self._outside_view():
+            # Relimit against the whole series; the new x limits then
+            # re-sample the lines for the view.
+            self._resample_view(full=True)
+            self._ax.relim()
+            self._ax.autoscale_view()
+            self.canvas.draw_idle()
+        else:
+            self._resample_view()
+            self._blit()
+
+    def _graph_series(self, data):
+        """Return the x label, band arrays and ``(param, pyramid)`` pairs."""
+        if self._uses_query():
+            name = self.dataset_name
+            xlabel = "Month" if self.period == "month" else self.period.capitalize()
+            band = None
+            if self._is_band_dataset(data):
+                band = self.series.band(name, self.period)
+            series = []
+            for param in self._parameters:
+                try:
+                    pyramid = self.series.pyramid(name, param, self.period)
+                except KeyError:
+                    continue
+                series.append((param, pyramid))
+            return xlabel, band, series
+
+        months = np.array([d.get("month", i + 1) for i, d in enumerate(data)])
+        band = None
+        if self._is_band_dataset(data):
+            low, _, high = BAND_COLUMNS
+            band = (
+                months,
+                np.array([d.get(low, 0) for d in data]),
+                np.array([d.get(high, 0) for d in data]),
+            )
+        series = [
+            (param, SeriesPyramid(months, [d.get(param, 0) for d in data]))
+            for param in self._parameters
+        ]
+        return "Month", band, series
+
+    def _build_plot(self, xlabel, series) -> None:
+        """Recreate the axes and the artists for the graphed parameters."""
         fig = self.canvas.figure
-        # Clear any existing axes so we start fresh each update
         fig.clear()
-        ax = fig.add_subplot(111)
-
-        if not (isinstance(data, list) and data and isinstance(data[0], dict)):
+        self._ax = ax = fig.add_subplot(111)
+        self._lines = {}
+        self._band = None
+        self._background = None
+        self._plot_layout = None
+        if xlabel is None:
+            self._ax = None
             self.canvas.draw_idle()
             return
-
-        months = [d.get("month", i + 1) for i, d in enumerate(data)]
-        for param in self._parameters:
-            values = [d.get(param, 0) for d in data]
-            ax.plot(months, values, marker="o", label=param)
-        ax.set_xlabel("Month")
+        for param, _ in series:
+            (self._lines[param],) = ax.plot(
+                [], [], marker="o", label=param, animated=True
+            )
+        self._resample_view(full=True)
+        ax.relim()
+        ax.autoscale_view()
+        ax.callbacks.connect("xlim_changed", self._on_xlim_changed)
+        ax.set_xlabel(xlabel)
         ax.set_ylabel("Value")
-        if self._parameters:
+        if series:
             ax.legend()
         self.canvas.draw_idle()
 
+    def _resample_view(self, full: bool = False) -> None:
+        """Feed the artists only the points the axes can show.
+
+        The points come from each series'
+        :class:`~money_metrics.core.downsample.SeriesPyramid`, downsampled to
+        the width of the axes in pixels, so zooming and panning stay fast
+        for series of millions of points.  With ``full`` the whole series is
+        sampled, otherwise the current x limits.  Projection datasets shade
+        the range between the outer percentiles behind the lines.
+        """
+        x0, x1 = (-np.inf, np.inf) if full else self._ax.get_xlim()
+        pixels = max(int(self._ax.bbox.width), 1)
+        for param, line in self._lines.items():
+            x, y, _ = self._pyramids[param].view(x0, x1, pixels)
+            line.set_data(x, y)
+            line.set_marker(_line_marker(len(x), pixels))
+        if self._band_data is not None:
+            # Shade the range between the outer percentiles of a projection.
+            if self._band is not None:
+                self._band.remove()
+            self._band = self._fill_band(*self._band_view(x0, x1, pixels))
+
+    def _band_view(self, x0, x1, pixels):
+        """Envelope of the band between ``x0`` and ``x1`` at ``pixels`` wide."""
+        x, lows, highs = self._band_data
+        start = max(int(np.searchsorted(x, x0)) - 1, 0)
+        stop = int(np.searchsorted(x, x1, side="right")) + 1
+        return envelope(x[start:stop], lows[start:stop], highs[start:stop], pixels)
+
+    def _request_render(self, xlabel) -> None:
+        """Ask the render pool for an image of the graph at the canvas size.
+
+        The image is shown in a
+        :class:`~money_metrics.ui.render_pool.RenderedCanvas` once rendered.
+        """
+        width, height = max(self.canvas.width(), 1), max(self.canvas.height(), 1)
+        x0, x1 = (-np.inf, np.inf) if self._view is None else self._view
+        lines = []
+        for param, pyramid in self._pyramids.items():
+            x, y, _ = pyramid.view(x0, x1, width)
+            lines.append((param, x, y, _line_marker(len(x), width)))
+        band = None
+        if self._band_data is not None:
+            low, _, high = BAND_COLUMNS
+            band = (*self._band_view(x0, x1, width), f"{low}-{high}")
+        self.render_pool.request(
+            id(self),
+            PlotSpec(xlabel, tuple(lines), band, xlim=self._view),
+            (width, height),
+            self.canvas.set_image,
+            self.canvas.devicePixelRatioF(),
+        )
+
+    def _on_xlim_changed(self, _ax) -> None:
+        """Re-sample the lines for the zoomed or panned view."""
+        if self._ax is not None:
+            self._resample_view()
+
+    def _fill_band(self, x, lows, highs):
+        low, _, high = BAND_COLUMNS
+        return self._ax.fill_between(
+            x, lows, highs, alpha=0.25, label=f"{low}-{high}", animated=True
+        )
+
+    def _outside_view(self) -> bool:
+        """Return ``True`` if any plotted value lies outside the view limits."""
+        arrays = [(p.x, p.y) for p in self._pyramids.values()]
+        if self._band_data is not None:
+            x, lows, highs = self._band_data
+            arrays += [(x, lows), (x, highs)]
+        (x0, x1), (y0, y1) = self._ax.get_xlim(), self._ax.get_ylim()
+        for x, y in arrays:
+            if len(x) and (
+                np.nanmin(x) < x0
+                or np.nanmax(x) > x1
+                or np.nanmin(y) < y0
+                or np.nanmax(y) > y1
+            ):
+                return True
+        return False
+
+    def _on_draw(self, _event) -> None:
+        """Cache the static background after a full redraw."""
+        if self._ax is None:
+            return
+        self._background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self) -> None:
+        if self._band is not None:
+            self._ax.draw_artist(self._band)
+        for line in self._lines.values():
+            self._ax.draw_artist(line)
+
+    def _blit(self) -> None:
+        """Redraw only the animated artists over the cached background."""
+        if self._background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_artists()
+        self.canvas.blit(self._ax.bbox)
+
+    def _uses_query(self) -> bool:
+        return self.dataset_name in self.data_manager
+
     def _toggle_view(self):
         self.view_mode = "table" if self.view_mode == "graph" else "graph"
         widget = self.canvas if self.view_mode == "graph" else self.table
@@ -298,11 +814,13 @@ class GraphScreen(QDockWidget):
 
     # --------------------- Parameter management ---------------------
     def _available_parameters(self) -> list[str]:
-        if not (isinstance(self.data, list) and self.data and isinstance(self.data[0], dict)):
+        if not _is_table(self.data):
             return []
         keys = list(self.data[0].keys())
         if "month" in keys:
             keys.remove("month")
+        if self.dataset_name in self.data_manager:
+            keys += [k for k in self.query.computed_columns() if k not in keys]
         return [k for k in keys if k not in self._parameters]
 
     def _add_parameter(self) -> None:
@@ -330,7 +848,7 @@ class GraphScreen(QDockWidget):
 
     def _add_data(self) -> None:
         """Prompt the user to choose an available dataset."""
-        names = sorted(self.data_manager.all_datasets().keys())
+        names = sorted(self.data_manager.names())
         if not names:
             QMessageBox.information(
                 self,
@@ -342,6 +860,4 @@ class GraphScreen(QDockWidget):
             self, "Add data", "Dataset:", names, 0, False
         )
         if ok and name:
-            data = self.data_manager.get_dataset(name)
-            if data is not None:
-                self.set_data(data, name)
+            self.show_dataset(name)
@@ -16,25 +16,54 @@ from PySide6.QtWidgets import (
     QFileDialog,
     QInputDialog,
     QMessageBox,
+    QProgressBar,
     QTabWidget,
 )
 from PySide6.QtGui import QAction
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
+import functools
 import sys
 
+import numpy as np
+
+from money_metrics.core.aggregate import AggregateDataset
+from money_metrics.core.columnar_file import EXTENSION as COLUMNAR_EXTENSION
 from money_metrics.core.data_manager import DataManager
-from money_metrics.core.profile import AppProfile
+from money_metrics.core.binary_profile import BinaryProfile
+from money_metrics.core.binary_profile import EXTENSION as BINARY_PROFILE_EXTENSION
+from money_metrics.core.profile import AppProfile, LazyProfile, open_profile
 from money_metrics.core.four_zero_one_k import FourZeroOneK
+from money_metrics.core.journal import ProfileJournal, RecoveredProfile
+from money_metrics.core.monte_carlo import MonteCarloProjection
+from money_metrics.core.scenario_sweep import sweep
+from .background import BackgroundTask, prefetch_datasets
 from .graph_screen import GraphScreen
+from .render_pool import RenderPool
+from .sweep_screen import SweepScreen
+
+# Profiles whose datasets are decoded on demand.
+_LAZY_PROFILES = (LazyProfile, BinaryProfile, RecoveredProfile)
+
+# How often the journal is checked for compaction. Screen changes are
+# journaled as they happen.
+_AUTOSAVE_INTERVAL_MS = 10_000
+
 
 class MainWindow(QMainWindow):
-    def __init__(self, profile: AppProfile | None = None):
+    def __init__(
+        self,
+        profile: AppProfile | LazyProfile | BinaryProfile | RecoveredProfile | None = None,
+        data_manager: DataManager | None = None,
+        journal: ProfileJournal | None = None,
+        render_pool: RenderPool | None = None,
+    ):
         super().__init__()
         self.setWindowTitle("MoneyMetrics")
         self.setGeometry(100, 100, 800, 600)
 
-        # Data manager keeps datasets separate from the UI widgets
-        self.data_manager = DataManager()
+        # Data manager keeps datasets separate from the UI widgets. Passing
+        # e.g. an SQLiteDataManager swaps in a persistent storage backend.
+        self.data_manager = data_manager if data_manager is not None else DataManager()
 
         # Default home layout with tabs at the top
         self.home_tabs = QTabWidget()
@@ -47,16 +76,43 @@ class MainWindow(QMainWindow):
 
         # Keep track of graph screens
         self.graph_screens: list[GraphScreen] = []
+        # Renders graphs off the UI thread when given; see RenderPool.
+        self.render_pool = render_pool
+
+        # Derived datasets kept up to date from their sources, and those of a
+        # profile being loaded, built once its datasets are decoded
+        self.aggregates: dict[str, AggregateDataset] = {}
+        self.pending_aggregates: dict[str, dict] = {}
 
         # Track profile path
         self.profile_path: str | None = None
 
+        # Autosave journal, attached once the initial state is in place
+        self.journal = journal
+        self._compaction: BackgroundTask | None = None
+
+        # Background decoding of lazily loaded profile datasets
+        self._prefetch_task = None
+        self.load_progress = QProgressBar()
+        self.load_progress.setMaximumWidth(200)
+        self.load_progress.setFormat("Loading data %v/%m")
+        self.load_progress.hide()
+        self.statusBar().addPermanentWidget(self.load_progress)
+
+        # Saves and loads running off the UI thread
+        self._tasks: set[BackgroundTask] = set()
+        self.save_progress = QProgressBar()
+        self.save_progress.setMaximumWidth(200)
+        self.save_progress.setFormat("Saving %p%")
+        self.save_progress.hide()
+        self.statusBar().addPermanentWidget(self.save_progress)
+
         # Menu setup
         menu_bar = QMenuBar(self)
         self.setMenuBar(menu_bar)
         plots_menu = menu_bar.addMenu("Plots")
         add_plot_action = QAction("Add Plot", self)
-        add_plot_action.triggered.connect(self.add_plot_screen)
+        add_plot_action.triggered.connect(lambda: self.add_plot_screen())
         plots_menu.addAction(add_plot_action)
 
         # Finance menu
@@ -64,6 +120,15 @@ class MainWindow(QMainWindow):
         add_401k_action = QAction("Add 401(k)", self)
         add_401k_action.triggered.connect(self._add_401k_dialog)
         finance_menu.addAction(add_401k_action)
+        projection_action = QAction("Project 401(k)...", self)
+        projection_action.triggered.connect(self._add_projection_dialog)
+        finance_menu.addAction(projection_action)
+        sweep_action = QAction("Scenario Sweep...", self)
+        sweep_action.triggered.connect(self._scenario_sweep_dialog)
+        finance_menu.addAction(sweep_action)
+        net_worth_action = QAction("Net Worth...", self)
+        net_worth_action.triggered.connect(self._net_worth_dialog)
+        finance_menu.addAction(net_worth_action)
 
         # Profile menu
         profile_menu = menu_bar.addMenu("Profile")
@@ -78,26 +143,71 @@ class MainWindow(QMainWindow):
         profile_menu.addAction(save_as_action)
 
         if profile is not None:
+            # Also attaches the journal.
             self._apply_profile(profile)
         else:
-            # Example dataset for demonstration purposes
-            # `replace=True` ensures re-running won't raise if the dataset exists
-            self.data_manager.add_dataset("Sample", [1, 2, 3, 4], replace=True)
+            if not self.data_manager.names():
+                # Example dataset for demonstration purposes
+                # `replace=True` ensures re-running won't raise if the dataset exists
+                self.data_manager.add_dataset("Sample", [1, 2, 3, 4], replace=True)
+            if journal is not None:
+                journal.attach(self.data_manager, lambda: AppProfile.from_window(self))
+
+        if journal is not None:
+            self._autosave_timer = QTimer(self)
+            self._autosave_timer.setInterval(_AUTOSAVE_INTERVAL_MS)
+            self._autosave_timer.timeout.connect(self._autosave)
+            self._autosave_timer.start()
 
     # ------------------------------------------------------------------
-    def add_plot_screen(self):
-        """Create and show a new plot screen."""
-        plot = GraphScreen(self.data_manager, self)
-        plot.destroyed.connect(self._remove_graph_screen)
-        self.addDockWidget(Qt.TopDockWidgetArea, plot)
+    def add_plot_screen(self, title: str | None = None, screen=None):
+        """Create and show a new plot screen, tabbed with the existing ones.
+
+        An empty :class:`GraphScreen` titled ``title`` is created unless an
+        already built dock widget is passed as ``screen``.  Graph screens are
+        tracked in :attr:`graph_screens`, and so saved with the profile and
+        journaled whenever one is added, retitled, shows another dataset or
+        is closed; other screens such as a :class:`SweepScreen` are only
+        docked. Returns the screen.
+        """
+        if screen is None:
+            screen = GraphScreen(
+                self.data_manager, self, title=title, render_pool=self.render_pool
+            )
+        self.addDockWidget(Qt.TopDockWidgetArea, screen)
         if self.graph_screens:
-            self.tabifyDockWidget(self.graph_screens[0], plot)
-        self.graph_screens.append(plot)
+            self.tabifyDockWidget(self.graph_screens[0], screen)
+        if isinstance(screen, GraphScreen):
+            # Closing a graph screen removes it from the layout.
+            screen.setAttribute(Qt.WA_DeleteOnClose)
+            # ``destroyed`` passes a bare QObject, so bind the screen itself.
+            screen.destroyed.connect(functools.partial(self._remove_graph_screen, screen))
+            screen.windowTitleChanged.connect(self._journal_screens)
+            screen.datasetChanged.connect(self._journal_screens)
+            screen.datasetChanged.connect(self._sync_read_only)
+            self.graph_screens.append(screen)
+            self._journal_screens()
+        return screen
 
-    def _remove_graph_screen(self, screen):
+    def _remove_graph_screen(self, screen, *_args):
         """Remove a graph screen once it has been destroyed."""
         if screen in self.graph_screens:
             self.graph_screens.remove(screen)
+            self._journal_screens()
+
+    def _journal_screens(self, *_args) -> None:
+        """Journal the screen layout if it changed."""
+        if self.journal is not None:
+            self.journal.record_screens(AppProfile.screen_layout(self))
+
+    def _sync_read_only(self, *_args) -> None:
+        """Make the screens showing an aggregate read-only.
+
+        Aggregates are rewritten from their sources, overwriting any edit.
+        """
+        derived = set(self.aggregates) | set(self.pending_aggregates)
+        for screen in self.graph_screens:
+            screen.set_read_only(screen.dataset_name in derived)
 
     # ------------------------------------------------------------------
     def _dialog_options(self) -> QFileDialog.Options:
@@ -148,45 +258,232 @@ class MainWindow(QMainWindow):
         )
         if not ok:
             return
-        plan = FourZeroOneK()
-        for _ in range(months):
-            plan.add_month(contribution, growth)
+        plan = FourZeroOneK.from_arrays(np.full(months, contribution), growth)
         data = plan.to_dict()
 
-        # Save the dataset to a JSON file
+        # Save the dataset to a JSON file, or a binary columnar file that
+        # can be memory-mapped when it is large.
         path, _ = QFileDialog.getSaveFileName(
             self,
             "Save 401(k) Data",
-            filter="JSON Files (*.json)",
+            filter=f"JSON Files (*.json);;Columnar Files (*{COLUMNAR_EXTENSION})",
             options=self._dialog_options(),
         )
-        if path:
-            plan.save_to_json(path)
+        # The plan is not used elsewhere, so it can be written off the UI thread.
+        if path.endswith(COLUMNAR_EXTENSION):
+            self._run_in_background(lambda report: plan.save_columns(path))
+        elif path:
+            self._run_in_background(lambda report: plan.save_to_json(path))
 
+        self._show_401k(data)
+
+    def _show_401k(self, data) -> None:
+        """Store ``data`` as the 401(k) dataset and show it in a table."""
         self.data_manager.add_dataset("401(k)", data, replace=True)
 
         # Display the data immediately in a new plot screen (table view)
-        plot = GraphScreen(self.data_manager, self, title="401(k)")
-        plot.set_data(data, "401(k)")
+        plot = self.add_plot_screen(title="401(k)")
+        plot.show_dataset("401(k)")
         if plot.view_mode == "graph":
             plot._toggle_view()
-        plot.destroyed.connect(self._remove_graph_screen)
-        self.addDockWidget(Qt.TopDockWidgetArea, plot)
-        if self.graph_screens:
-            self.tabifyDockWidget(self.graph_screens[0], plot)
-        self.graph_screens.append(plot)
+
+    def _add_projection_dialog(self) -> BackgroundTask | None:
+        """Run a Monte Carlo projection of the 401(k) dataset on a worker thread."""
+        data = self.data_manager.get_dataset("401(k)")
+        if not data:
+            QMessageBox.information(
+                self,
+                "Project 401(k)",
+                "You haven't created 401(k) data yet! Try adding it first",
+            )
+            return None
+        volatility, ok = QInputDialog.getDouble(
+            self,
+            "Project 401(k)",
+            "Monthly growth volatility (e.g. 0.04 for 4%):",
+            0.04,
+            0.0,
+            1.0,
+            4,
+        )
+        if not ok:
+            return None
+        target, ok = QInputDialog.getDouble(
+            self,
+            "Project 401(k)",
+            "Target balance:",
+            0.0,
+            0.0,
+            1_000_000_000.0,
+            2,
+        )
+        if not ok:
+            return None
+        projection = MonteCarloProjection.from_plan(FourZeroOneK(data), volatility)
+        return self._run_in_background(
+            lambda report: projection.run(target=target or None),
+            self._on_projection_finished,
+            "Project 401(k)",
+        )
+
+    def _on_projection_finished(self, bands) -> None:
+        name = "401(k) projection"
+        self.data_manager.add_dataset(name, bands.to_dict(), replace=True)
+        if bands.probability_of_target is not None:
+            QMessageBox.information(
+                self,
+                "Project 401(k)",
+                f"Probability of reaching {bands.target:,.2f}: "
+                f"{bands.probability_of_target:.1%}",
+            )
+
+        self.add_plot_screen(title=name).show_dataset(name)
+
+    @staticmethod
+    def _parse_values(text: str) -> list[float]:
+        """Parse ``"a, b, c"`` or an evenly spaced ``"start:stop:count"``."""
+        text = text.strip()
+        if ":" in text:
+            start, stop, count = text.split(":")
+            return np.linspace(float(start), float(stop), int(count)).tolist()
+        return [float(part) for part in text.split(",") if part.strip()]
+
+    def _scenario_sweep_dialog(self) -> None:
+        """Prompt for parameter ranges and show a scenario sweep."""
+        prompts = [
+            ("Monthly contributions (a, b, c or start:stop:count):", "100:1000:10"),
+            ("Monthly growth rates (a, b, c or start:stop:count):", "0:0.01:11"),
+            ("Horizons in months (a, b, c or start:stop:count):", "120, 240, 360"),
+        ]
+        values = []
+        for label, default in prompts:
+            text, ok = QInputDialog.getText(self, "Scenario Sweep", label, text=default)
+            if not ok:
+                return
+            try:
+                parsed = self._parse_values(text)
+            except ValueError:
+                parsed = []
+            if not parsed:
+                QMessageBox.warning(self, "Scenario Sweep", f"Invalid values: {text}")
+                return
+            values.append(parsed)
+        contributions, growth_rates, horizons = values
+        # Whole months; rounding a fine "start:stop:count" range can repeat one.
+        horizons = np.unique(np.rint(horizons)).astype(int).tolist()
+        try:
+            results = sweep(contributions, growth_rates, horizons)
+        except ValueError as exc:
+            QMessageBox.warning(self, "Scenario Sweep", f"Invalid values: {exc}")
+            return
+
+        self.add_plot_screen(screen=SweepScreen(results, self))
+
+    def _net_worth_dialog(self) -> None:
+        """Combine account balances into a live net worth dataset."""
+        name = "Net worth"
+        accounts = []
+        for dataset in self.data_manager.names():
+            rows = self.data_manager.view(dataset)
+            if (
+                dataset not in self.aggregates
+                and dataset not in self.pending_aggregates
+                and dataset != name
+                and isinstance(rows, list)
+                and rows
+                and isinstance(rows[0], dict)
+                and "balance" in rows[0]
+            ):
+                accounts.append(dataset)
+        if not accounts:
+            QMessageBox.information(
+                self,
+                "Net Worth",
+                "You haven't created any accounts yet! Try adding 401(k) data first",
+            )
+            return
+        text, ok = QInputDialog.getText(
+            self, "Net Worth", "Accounts (comma separated):", text=", ".join(accounts)
+        )
+        if not ok:
+            return
+        sources = [part.strip() for part in text.split(",") if part.strip()]
+        unknown = [s for s in sources if s not in accounts]
+        if not sources or unknown:
+            QMessageBox.warning(
+                self, "Net Worth", f"Unknown accounts: {', '.join(unknown) or text}"
+            )
+            return
+        if name in self.aggregates:
+            self.aggregates.pop(name).close()
+        self.pending_aggregates.pop(name, None)
+        self.aggregates[name] = AggregateDataset(self.data_manager, name, sources)
+        self._journal_aggregates()
+
+        self.add_plot_screen(title=name).show_dataset(name)
+
+    def _restore_aggregates(self) -> None:
+        """Build the aggregates of the loaded profile from their sources."""
+        if not self.pending_aggregates:
+            return
+        for name, spec in self.pending_aggregates.items():
+            self.aggregates[name] = AggregateDataset(self.data_manager, name, **spec)
+        self.pending_aggregates = {}
+        self._journal_aggregates()
+
+    def _journal_aggregates(self) -> None:
+        if self.journal is not None:
+            self.journal.record_aggregates(AppProfile.aggregate_sources(self))
 
     # ------------------------------------------------------------------
-    def _apply_profile(self, profile: AppProfile) -> None:
-        """Load datasets and graph screens from a profile."""
-        # Replace the default home tabs with a plain central widget
-        if isinstance(self.centralWidget(), QTabWidget):
-            self.centralWidget().deleteLater()
-        self.setCentralWidget(QWidget())
+    def _apply_profile(
+        self, profile: AppProfile | LazyProfile | BinaryProfile | RecoveredProfile
+    ) -> None:
+        """Load datasets and graph screens from a profile.
 
-        self.data_manager = DataManager()
-        for name, data in profile.datasets.items():
-            self.data_manager.add_dataset(name, data, replace=True)
+        Datasets of a :class:`LazyProfile`, :class:`BinaryProfile` or
+        :class:`RecoveredProfile` are registered lazily: the screens are shown
+        straight away and the datasets are decoded in the background, those
+        on screen first. Datasets a persistent data manager already holds in
+        their recovered state are kept as they are. Aggregates are rebuilt
+        from their sources once those are loaded.
+        """
+        # Replace the default home tabs with a plain central widget, except
+        # when carrying on with a recovered session.
+        if not isinstance(profile, RecoveredProfile):
+            if isinstance(self.centralWidget(), QTabWidget):
+                self.centralWidget().deleteLater()
+            self.setCentralWidget(QWidget())
+
+        for aggregate in self.aggregates.values():
+            aggregate.close()
+        self.aggregates.clear()
+        self.pending_aggregates = dict(profile.aggregates)
+        if self._prefetch_task is not None:
+            self._prefetch_task.cancel()
+            self._prefetch_task = None
+        if self.journal is not None:
+            # The journal restarts from the new profile once it is applied.
+            self.journal.detach()
+        lazy = isinstance(profile, _LAZY_PROFILES)
+        names = profile.dataset_names if lazy else list(profile.datasets)
+        for name in self.data_manager.names():
+            if name not in names:
+                self.data_manager.remove_dataset(name)
+        if lazy:
+            kept = (
+                profile.stored_in(self.data_manager)
+                if isinstance(profile, RecoveredProfile)
+                else set()
+            )
+            for name in names:
+                if name not in kept:
+                    self.data_manager.add_lazy_dataset(
+                        name, functools.partial(profile.load_dataset, name), replace=True
+                    )
+        else:
+            for name, data in profile.datasets.items():
+                self.data_manager.add_dataset(name, data, replace=True)
 
         # Remove existing screens
         for screen in list(self.graph_screens):
@@ -194,30 +491,165 @@ class MainWindow(QMainWindow):
         self.graph_screens.clear()
 
         for info in profile.screens:
-            graph = GraphScreen(self.data_manager, self, title=info.get("title"))
+            graph = self.add_plot_screen(title=info.get("title"))
             dataset_name = info.get("dataset")
-            if dataset_name:
-                data = self.data_manager.get_dataset(dataset_name)
-                if data is not None:
-                    graph.set_data(data, dataset_name)
-            graph.destroyed.connect(self._remove_graph_screen)
-            self.addDockWidget(Qt.TopDockWidgetArea, graph)
-            if self.graph_screens:
-                self.tabifyDockWidget(self.graph_screens[0], graph)
-            self.graph_screens.append(graph)
-
-    def _save_profile(self) -> None:
+            if dataset_name in self.data_manager and not self.data_manager.is_loaded(
+                dataset_name
+            ):
+                graph.show_loading(dataset_name)
+            elif dataset_name:
+                graph.show_dataset(dataset_name)
+
+        if lazy:
+            self._start_prefetch(profile)
+        if self._prefetch_task is None:
+            self._restore_aggregates()
+        if self.journal is not None:
+            self.journal.attach(
+                self.data_manager,
+                lambda: AppProfile.from_window(self),
+                base=profile.path if lazy else None,
+                # The journal already holds the recovered state.
+                resume=isinstance(profile, RecoveredProfile),
+            )
+
+    def _start_prefetch(self, profile: LazyProfile | BinaryProfile) -> None:
+        """Decode the profile's datasets off the UI thread, visible ones first."""
+        shown = [s.dataset_name for s in self.graph_screens if s.dataset_name]
+        pending = [
+            n for n in profile.dataset_names if not self.data_manager.is_loaded(n)
+        ]
+        names = [n for n in pending if n in shown]
+        names += [n for n in pending if n not in shown]
+        if not names:
+            return
+        task = prefetch_datasets(profile, names)
+        task.signals.progress.connect(self._on_dataset_prefetched)
+        task.signals.finished.connect(self._on_prefetch_finished)
+        task.signals.failed.connect(self._on_prefetch_failed)
+        self.load_progress.setRange(0, len(names))
+        self.load_progress.setValue(0)
+        self.load_progress.show()
+        self._prefetch_task = task.start()
+
+    def _on_dataset_prefetched(self, done: int, total: int, name: str) -> None:
+        if self._prefetch_task is None or self._prefetch_task.cancelled:
+            return
+        self.load_progress.setValue(done)
+        for screen in self.graph_screens:
+            if screen.dataset_name == name and screen.data is None:
+                screen.show_dataset(name)
+
+    def _on_prefetch_finished(self, _result) -> None:
+        self._prefetch_task = None
+        self.load_progress.hide()
+        self._restore_aggregates()
+
+    def _on_prefetch_failed(self, message: str) -> None:
+        self._prefetch_task = None
+        self.load_progress.hide()
+        # Aggregates stay pending, and so are still saved with the profile.
+        QMessageBox.warning(self, "Load Profile", f"Could not load datasets: {message}")
+
+    # ------------------------------------------------------------------
+    def _run_in_background(self, func, on_finished=None, title="Save") -> BackgroundTask:
+        """Run ``func(report)`` on a worker thread, showing its progress."""
+        task = BackgroundTask(func)
+        self._tasks.add(task)
+
+        def progress(done, total, _item):
+            self.save_progress.setRange(0, total)
+            self.save_progress.setValue(done)
+
+        def finished(result):
+            self._tasks.discard(task)
+            if not self._tasks:
+                self.save_progress.hide()
+            if on_finished is not None:
+                on_finished(result)
+
+        def failed(message):
+            self._tasks.discard(task)
+            if not self._tasks:
+                self.save_progress.hide()
+            QMessageBox.warning(self, title, message)
+
+        task.signals.progress.connect(progress)
+        task.signals.finished.connect(finished)
+        task.signals.failed.connect(failed)
+        self.save_progress.setRange(0, 0)
+        self.save_progress.show()
+        return task.start()
+
+    def _save_profile(self) -> BackgroundTask | None:
+        """Save the profile on a worker thread.
+
+        The datasets are taken from a snapshot of read-only views, so edits
+        made while the file is being written do not affect it.
+        """
         if self.profile_path is None:
             self._save_profile_as()
-            return
+            return None
+        self._flush_edits()
         profile = AppProfile.from_window(self)
-        profile.save_to_file(self.profile_path)
+        path = self.profile_path
+        journal = self.journal
+        mark = journal.mark() if journal is not None else None
+
+        def save(report):
+            profile.save_to_file(path, progress=report)
+            # Stage the file for the journal before a later save replaces it.
+            return (journal.stage(path) if journal is not None else None), mark
+
+        return self._run_in_background(save, self._on_profile_saved, "Save Profile")
+
+    def _on_profile_saved(self, result) -> None:
+        snapshot, mark = result
+        if snapshot is not None:
+            # The saved profile holds everything journaled before the mark.
+            # The journal ignores it if it was rebased since the mark was
+            # taken, e.g. by a newer save or because another profile was
+            # loaded meanwhile.
+            self.journal.rebase(snapshot, since=mark)
+
+    def _flush_edits(self) -> None:
+        """Push cell edits still queued in graph screens to the data manager."""
+        for screen in self.graph_screens:
+            if isinstance(screen, GraphScreen):
+                screen.flush_edits()
+
+    def _autosave(self) -> None:
+        """Compact the journal when it is long.
+
+        Compaction rebuilds the journaled state from the journal itself on a
+        worker thread, so lazily loaded datasets stay unloaded.
+        """
+        journal = self.journal
+        if not journal.needs_compaction or self._compaction in self._tasks:
+            return
+        mark = journal.mark()
+
+        def compacted(snapshot):
+            if snapshot is not None:
+                journal.rebase(snapshot, since=mark)
+
+        self._compaction = self._run_in_background(
+            lambda report: journal.write_snapshot(mark), compacted, "Autosave"
+        )
+
+    def closeEvent(self, event):  # type: ignore[override]
+        self._flush_edits()
+        if self.journal is not None:
+            self._journal_screens()
+            self.journal.close()
+        super().closeEvent(event)
 
     def _save_profile_as(self) -> None:
         path, _ = QFileDialog.getSaveFileName(
             self,
             "Save Profile",
-            filter="MoneyMetrics Profile (*.json)",
+            filter="MoneyMetrics Profile (*.json);;"
+            f"Binary MoneyMetrics Profile (*{BINARY_PROFILE_EXTENSION})",
             options=self._dialog_options(),
         )
         if path:
@@ -228,10 +660,22 @@ class MainWindow(QMainWindow):
         path, _ = QFileDialog.getOpenFileName(
             self,
             "Load Profile",
-            filter="MoneyMetrics Profile (*.json)",
+            filter=f"MoneyMetrics Profile (*.json *{BINARY_PROFILE_EXTENSION});;"
+            f"Columnar 401(k) Files (*{COLUMNAR_EXTENSION})",
             options=self._dialog_options(),
         )
-        if path:
-            profile = AppProfile.load_from_file(path)
-            self.profile_path = path
-            self._apply_profile(profile)
+        if path.endswith(COLUMNAR_EXTENSION):
+            # Saved from the 401(k) dialog; opened as the 401(k) dataset.
+            self._run_in_background(
+                lambda report: FourZeroOneK.load_columns(path).to_dict(),
+                self._show_401k,
+                "Load 401(k)",
+            )
+        elif path:
+            self._run_in_background(
+                lambda report: open_profile(path), self._on_profile_opened, "Load Profile"
+            )
+
+    def _on_profile_opened(self, profile) -> None:
+        self.profile_path = profile.path
+        self._apply_profile(profile)
@@ -0,0 +1,183 @@
+"""Render graph figures off the UI thread.
+
+Drawing a figure with Agg on the UI thread blocks input for as long as the
+rasterisation takes, and several graph screens redraw one after another.
+With a :class:`RenderPool`, a screen describes what to draw as a
+:class:`PlotSpec` of plain arrays, a worker thread renders it into an
+offscreen Agg figure, and the resulting image is painted by a
+:class:`RenderedCanvas`.  Each screen only ever sees its most recent
+request: a newer request supersedes the ones still queued or in flight.
+
+The pool keeps the UI thread responsive; it does not make rendering
+faster.  Matplotlib holds the GIL while it draws, so renders on several
+worker threads take turns rather than run on several cores, and the time
+until every screen is redrawn stays about the same as on the UI thread
+(see ``benchmarks/bench_render_pool.py``).
+"""
+
+from __future__ import annotations
+
+import weakref
+from dataclasses import dataclass
+from typing import Callable, Hashable, Tuple
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PySide6.QtCore import QObject, QThreadPool
+from PySide6.QtGui import QImage, QPainter
+from PySide6.QtWidgets import QWidget
+
+from .background import BackgroundTask
+
+
+@dataclass(frozen=True)
+class PlotSpec:
+    """Everything needed to draw a graph, detached from any widget.
+
+    ``lines`` holds ``(label, x, y, marker)`` tuples and ``band`` is either
+    ``None`` or ``(x, lows, highs, label)``.  ``xlim`` is the ``(x0, x1)``
+    range to show, or ``None`` to fit the data.
+    """
+
+    xlabel: str
+    lines: Tuple[tuple, ...] = ()
+    band: tuple | None = None
+    ylabel: str = "Value"
+    xlim: tuple | None = None
+
+
+def render_spec(spec: PlotSpec, width: int, height: int, ratio: float = 1.0) -> QImage:
+    """Draw ``spec`` into a ``width`` x ``height`` image with Agg.
+
+    Safe to call from any thread: the figure is private to the call and
+    never touches a Qt widget.  ``ratio`` is the device pixel ratio.
+    """
+    dpi = 100 * ratio
+    fig = Figure(figsize=(width / 100, height / 100), dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    if spec.band is not None:
+        x, lows, highs, label = spec.band
+        ax.fill_between(x, lows, highs, alpha=0.25, label=label)
+    for label, x, y, marker in spec.lines:
+        ax.plot(x, y, marker=marker, label=label)
+    if spec.xlim is not None:
+        ax.set_xlim(*spec.xlim)
+    ax.set_xlabel(spec.xlabel)
+    ax.set_ylabel(spec.ylabel)
+    if spec.lines:
+        ax.legend()
+    canvas.draw()
+    pixels = np.asarray(canvas.buffer_rgba())
+    rows, columns = pixels.shape[:2]
+    image = QImage(pixels.data, columns, rows, 4 * columns, QImage.Format_RGBA8888)
+    # Copy out of the buffer owned by the figure.
+    image = image.copy()
+    image.setDevicePixelRatio(ratio)
+    return image
+
+
+class RenderPool(QObject):
+    """Thread pool turning :class:`PlotSpec` requests into images.
+
+    Parameters
+    ----------
+    max_threads: int, optional
+        Number of worker threads; defaults to one. Renders hold the GIL, so
+        more threads let requests overlap but do not render them faster.
+    """
+
+    def __init__(self, max_threads: int | None = None, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads or 1)
+        # Generation of the latest request per key; older results are dropped.
+        self._latest: dict = {}
+        self._tasks: set = set()
+
+    def request(
+        self,
+        key: Hashable,
+        spec: PlotSpec,
+        size: Tuple[int, int],
+        on_rendered: Callable[[QImage], None],
+        ratio: float = 1.0,
+    ) -> BackgroundTask:
+        """Render ``spec`` at ``size`` and pass the image to ``on_rendered``.
+
+        ``on_rendered`` runs on the UI thread, and only if no newer request
+        was made for ``key`` in the meantime.
+        """
+        generation = self._latest.get(key, 0) + 1
+        self._latest[key] = generation
+
+        def work(_report):
+            if self._latest.get(key) != generation:
+                return None  # Superseded while queued.
+            return render_spec(spec, *size, ratio)
+
+        task = BackgroundTask(work)
+        self._tasks.add(task)
+
+        def finished(image):
+            self._tasks.discard(task)
+            if image is not None and self._latest.get(key) == generation:
+                on_rendered(image)
+
+        task.signals.finished.connect(finished)
+        task.signals.failed.connect(lambda _message: self._tasks.discard(task))
+        self.pool.start(task)
+        return task
+
+    def forget(self, key: Hashable) -> None:
+        """Drop the pending results for ``key``, e.g. when its screen closes."""
+        self._latest.pop(key, None)
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Block until every queued render has finished."""
+        return self.pool.waitForDone(msecs)
+
+
+class RenderedCanvas(QWidget):
+    """Widget painting the latest image rendered for a graph screen.
+
+    Like the Matplotlib canvas it replaces, it accepts dropped parameter
+    names, and it asks the screen for a new render when resized.
+    """
+
+    def __init__(self, screen, parent=None):
+        super().__init__(parent)
+        # The screen owns this canvas; a strong reference back would form a
+        # cycle that only the garbage collector could break.
+        self._screen = weakref.proxy(screen)
+        self.image: QImage | None = None
+        self.setAcceptDrops(True)
+        self.setMinimumSize(200, 120)
+
+    def set_image(self, image: QImage | None) -> None:
+        self.image = image
+        self.update()
+
+    def paintEvent(self, event):  # type: ignore[override]
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.palette().base())
+        if self.image is not None:
+            painter.drawImage(self.rect(), self.image)
+        painter.end()
+
+    def resizeEvent(self, event):  # type: ignore[override]
+        super().resizeEvent(event)
+        self._screen._update_graph(self._screen.data)
+
+    def dragEnterEvent(self, event):  # type: ignore[override]
+        if event.mimeData().hasText():
+            event.acceptProposedAction()
+
+    def dropEvent(self, event):  # type: ignore[override]
+        if event.mimeData().hasText():
+            self._screen.handle_dropped_parameter(event.mimeData().text())
+            event.acceptProposedAction()
+
+
+__all__ = ["PlotSpec", "RenderPool", "RenderedCanvas", "render_spec"]
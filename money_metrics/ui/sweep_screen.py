@@ -0,0 +1,86 @@
+"""Dockable view of a scenario sweep.
+
+The screen shows the final balances of a
+:func:`~money_metrics.core.scenario_sweep.sweep` as a heatmap of contribution
+against growth rate for one horizon at a time, alongside a table ranking
+every combination by final balance.
+"""
+
+from PySide6.QtWidgets import (
+    QDockWidget,
+    QWidget,
+    QVBoxLayout,
+    QComboBox,
+    QTableWidget,
+    QTableWidgetItem,
+    QSplitter,
+)
+from PySide6.QtCore import Qt
+
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+
+from money_metrics.core.scenario_sweep import rank
+
+
+class SweepScreen(QDockWidget):
+    """Heatmap and ranking of scenario sweep results."""
+
+    # Number of combinations listed in the ranking table.
+    RANK_ROWS = 100
+
+    def __init__(self, results, parent=None, title="Scenario Sweep"):
+        super().__init__(title, parent)
+        self.results = results
+
+        content = QWidget(self)
+        layout = QVBoxLayout(content)
+        self.horizon_box = QComboBox(content)
+        for months in results["months"][0, 0].tolist():
+            self.horizon_box.addItem(f"{months} months", months)
+        self.horizon_box.currentIndexChanged.connect(self._update_heatmap)
+        self.canvas = FigureCanvas(Figure(figsize=(5, 3)))
+        self.ranking = QTableWidget(content)
+        self.ranking.setEditTriggers(QTableWidget.NoEditTriggers)
+
+        splitter = QSplitter(Qt.Vertical, content)
+        splitter.addWidget(self.canvas)
+        splitter.addWidget(self.ranking)
+        layout.addWidget(self.horizon_box)
+        layout.addWidget(splitter)
+        self.setWidget(content)
+
+        self._update_heatmap()
+        self._update_ranking()
+
+    # ------------------------------------------------------------------
+    def _update_heatmap(self) -> None:
+        index = max(self.horizon_box.currentIndex(), 0)
+        grid = self.results[:, :, index]
+        fig = self.canvas.figure
+        fig.clear()
+        ax = fig.add_subplot(111)
+        image = ax.imshow(
+            grid["final_balance"], aspect="auto", origin="lower", cmap="viridis"
+        )
+        contributions = grid["contribution"][:, 0]
+        growth_rates = grid["growth_rate"][0, :]
+        ax.set_yticks(range(len(contributions)))
+        ax.set_yticklabels([f"{c:g}" for c in contributions])
+        ax.set_xticks(range(len(growth_rates)))
+        ax.set_xticklabels([f"{g:g}" for g in growth_rates], rotation=45)
+        ax.set_ylabel("Contribution")
+        ax.set_xlabel("Growth rate")
+        fig.colorbar(image, ax=ax, label="Final balance")
+        self.canvas.draw_idle()
+
+    def _update_ranking(self) -> None:
+        ranked = rank(self.results, top=self.RANK_ROWS)
+        fields = ranked.dtype.names
+        self.ranking.setColumnCount(len(fields))
+        self.ranking.setHorizontalHeaderLabels(list(fields))
+        self.ranking.setRowCount(len(ranked))
+        for row, record in enumerate(ranked.tolist()):
+            for col, (field, value) in enumerate(zip(fields, record)):
+                text = f"{value:,.2f}" if field == "final_balance" else f"{value:g}"
+                self.ranking.setItem(row, col, QTableWidgetItem(text))
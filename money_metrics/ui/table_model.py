@@ -0,0 +1,195 @@
+"""Table model presenting a tabular dataset to a ``QTableView``.
+
+``QTableWidget`` allocates an item per cell up front, so showing (and
+refreshing) a dataset costs time proportional to its size.
+:class:`DatasetTableModel` instead reads cells from the dataset's rows when
+the view asks for them, which it only does for the visible rows, and reports
+edits as ``dataChanged`` over just the affected range.
+
+The rows of a dataset held by a data manager are read through
+:class:`PagedRows`, which fetches them a page at a time with
+:meth:`~money_metrics.core.DataManager.get_rows` and keeps only the most
+recently used pages, so a table over a store such as
+:class:`~money_metrics.core.sqlite_store.SQLiteDataManager` holds a small
+window of rows however large the dataset is.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Sequence
+
+from PySide6.QtCore import QAbstractTableModel, QMimeData, QModelIndex, Qt, Signal
+
+# Rows fetched from the data manager at a time, and pages kept per dataset.
+PAGE_SIZE = 256
+MAX_PAGES = 8
+
+
+class PagedRows(Sequence):
+    """Read-only sequence of the rows of dataset ``name``.
+
+    Rows are fetched in pages of ``PAGE_SIZE`` and at most ``MAX_PAGES``
+    pages are kept.  The pages are dropped whenever the dataset's version
+    changes, so the rows always reflect the data manager.  A dataset that
+    is removed or is not a list of rows has no rows.
+    """
+
+    def __init__(self, data_manager, name: str):
+        self.data_manager = data_manager
+        self.name = name
+        self._version = None
+        self._count = 0
+        self._pages: OrderedDict[int, list] = OrderedDict()
+
+    def __len__(self) -> int:
+        self._sync()
+        return self._count
+
+    def __getitem__(self, index):
+        self._sync()
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._count)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            rows = []
+            while start < stop:
+                number, offset = divmod(start, PAGE_SIZE)
+                page = self._page(number)[offset : offset + stop - start]
+                rows.extend(page)
+                start += len(page)
+            return rows
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("row index out of range")
+        number, offset = divmod(index, PAGE_SIZE)
+        return self._page(number)[offset]
+
+    def _sync(self) -> None:
+        version = self.data_manager.version(self.name)
+        if version == self._version:
+            return
+        self._version = version
+        self._pages.clear()
+        try:
+            self._count = 0 if version is None else self.data_manager.row_count(self.name)
+        except (KeyError, TypeError):
+            self._count = 0
+
+    def _page(self, number: int) -> list:
+        page = self._pages.get(number)
+        if page is None:
+            start = number * PAGE_SIZE
+            page = self._pages[number] = self.data_manager.get_rows(
+                self.name, start, start + PAGE_SIZE
+            )
+            while len(self._pages) > MAX_PAGES:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(number)
+        return page
+
+
+class DatasetTableModel(QAbstractTableModel):
+    """Editable model over a sequence of row dicts sharing one key order.
+
+    Edits are not applied by the model itself: a valid number typed into a
+    cell is reported through :attr:`cellEdited` as ``(row, column name,
+    value)`` and the owner updates the rows and calls :meth:`rows_changed`.
+    Setting :attr:`read_only` turns editing off. Dragging cells exports the
+    name of their column as text.
+    """
+
+    cellEdited = Signal(int, str, float)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: list = []
+        self._keys: list[str] = []
+        self.read_only = False
+
+    # ------------------------------------------------------------------
+    def set_rows(self, rows: Sequence) -> None:
+        """Show ``rows``, taking the columns from the first row."""
+        self.beginResetModel()
+        self._rows = rows
+        self._keys = list(rows[0]) if rows else []
+        self.endResetModel()
+
+    def rows_changed(
+        self, first: int, last: int, rows: Sequence | None = None
+    ) -> None:
+        """Report that rows ``first`` to ``last`` (inclusive) changed.
+
+        ``rows`` replaces the backing list if the owner swapped it for one
+        of the same length.
+        """
+        if rows is not None:
+            self._rows = rows
+        if self._keys and first <= last:
+            self.dataChanged.emit(
+                self.index(first, 0), self.index(last, len(self._keys) - 1)
+            )
+
+    def column_name(self, column: int) -> str:
+        return self._keys[column]
+
+    def column_index(self, name: str) -> int:
+        return self._keys.index(name)
+
+    def rename_column(self, column: int, name: str) -> None:
+        """Relabel ``column``; the owner renames the key in the rows."""
+        self._keys[column] = name
+        self.headerDataChanged.emit(Qt.Horizontal, column, column)
+
+    # ------------------------------------------------------------------
+    def rowCount(self, parent=QModelIndex()):  # type: ignore[override]
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):  # type: ignore[override]
+        return 0 if parent.isValid() else len(self._keys)
+
+    def data(self, index, role=Qt.DisplayRole):  # type: ignore[override]
+        if role not in (Qt.DisplayRole, Qt.EditRole) or not index.isValid():
+            return None
+        return str(self._rows[index.row()].get(self._keys[index.column()], ""))
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):  # type: ignore[override]
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self._keys[section] if section < len(self._keys) else None
+        return str(section + 1)
+
+    def flags(self, index):  # type: ignore[override]
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsDragEnabled
+        return flags if self.read_only else flags | Qt.ItemIsEditable
+
+    def setData(self, index, value, role=Qt.EditRole):  # type: ignore[override]
+        if role != Qt.EditRole or not index.isValid() or self.read_only:
+            return False
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return False
+        self.cellEdited.emit(index.row(), self._keys[index.column()], number)
+        return True
+
+    # ------------------------------------------------------------------
+    def mimeTypes(self):  # type: ignore[override]
+        return ["text/plain"]
+
+    def mimeData(self, indexes):  # type: ignore[override]
+        mime = QMimeData()
+        if indexes:
+            mime.setText(self._keys[indexes[0].column()])
+        return mime
+
+    def supportedDragActions(self):  # type: ignore[override]
+        return Qt.CopyAction
+
+
+__all__ = ["DatasetTableModel", "PagedRows"]
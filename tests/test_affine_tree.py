@@ -0,0 +1,41 @@
+import pytest
+
+from money_metrics.core.affine_tree import AffineTree
+
+
+def _sequential(contributions, growth_rates):
+    balance, out = 0.0, []
+    for c, g in zip(contributions, growth_rates):
+        balance = (balance + c) * (1 + g)
+        out.append(balance)
+    return out
+
+
+def test_prefix_matches_sequential_balances():
+    contributions = [100.0, 50.0, 0.0, 250.0, 10.0]
+    growth = [0.01, -0.02, 0.03, 0.0, 0.005]
+    tree = AffineTree.from_months(contributions, growth)
+    expected = _sequential(contributions, growth)
+    for count in range(1, len(contributions) + 1):
+        assert tree.evaluate(count) == pytest.approx(expected[count - 1])
+    assert tree.evaluate(0, initial=7.0) == 7.0
+
+
+def test_update_and_append_refresh_compositions():
+    contributions = [100.0] * 5
+    growth = [0.01] * 5
+    tree = AffineTree.from_months(contributions, growth)
+
+    contributions[1] = 300.0
+    tree.update_month(1, 300.0, 0.01)
+    for _ in range(6):
+        contributions.append(20.0)
+        growth.append(0.02)
+        tree.append(1.02, 20.0 * 1.02)
+
+    assert len(tree) == 11
+    expected = _sequential(contributions, growth)
+    assert tree.evaluate(11) == pytest.approx(expected[-1])
+    assert tree.evaluate(3) == pytest.approx(expected[2])
+    with pytest.raises(IndexError):
+        tree.update(11, 1.0, 0.0)
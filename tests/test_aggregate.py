@@ -0,0 +1,78 @@
+import pytest
+
+from money_metrics.core.aggregate import AggregateDataset
+from money_metrics.core.data_manager import DataManager
+
+
+def account(balances, start=1):
+    return [{"month": start + i, "balance": b} for i, b in enumerate(balances)]
+
+
+def make_manager():
+    dm = DataManager()
+    dm.add_dataset("401(k)", account([100.0, 200.0, 300.0]))
+    dm.add_dataset("HSA", account([10.0, 20.0], start=2))
+    return dm
+
+
+def test_sum_is_aligned_by_month():
+    dm = make_manager()
+    AggregateDataset(dm, "Net worth", ["401(k)", "HSA"])
+    assert dm.view("Net worth") == [
+        {"month": 1, "balance": 100.0},
+        {"month": 2, "balance": 210.0},
+        {"month": 3, "balance": 320.0},
+    ]
+
+
+def test_cell_edit_updates_only_affected_months():
+    dm = make_manager()
+    AggregateDataset(dm, "Net worth", ["401(k)", "HSA"])
+    changes = []
+    dm.subscribe(changes.append, name="Net worth")
+
+    dm.update_cells("HSA", {0: {"balance": 15.0}})
+
+    assert [(c.kind, c.rows) for c in changes] == [("updated", (1,))]
+    assert dm.view("Net worth")[1]["balance"] == 215.0
+    assert dm.view("Net worth")[2]["balance"] == 320.0
+
+
+def test_layout_changes_and_removal_rewrite_aggregate():
+    dm = make_manager()
+    aggregate = AggregateDataset(dm, "Net worth", ["401(k)", "HSA"])
+
+    dm.add_dataset("HSA", account([1.0, 2.0], start=4), replace=True)
+    assert [r["month"] for r in dm.view("Net worth")] == [1, 2, 3, 4, 5]
+    assert dm.view("Net worth")[3]["balance"] == 1.0
+
+    dm.remove_dataset("HSA")
+    assert dm.view("Net worth") == account([100.0, 200.0, 300.0])
+
+    aggregate.close()
+    dm.update_cells("401(k)", {0: {"balance": 0.0}})
+    assert dm.view("Net worth")[0]["balance"] == 100.0
+
+
+def test_aggregate_cannot_include_itself():
+    with pytest.raises(ValueError):
+        AggregateDataset(DataManager(), "Net worth", ["Net worth"])
+
+
+def test_edits_resum_months_without_accumulating_rounding_errors():
+    dm = make_manager()
+    AggregateDataset(dm, "Net worth", ["401(k)", "HSA"])
+    dm.update_cells("HSA", {0: {"balance": 1e16}})
+    dm.update_cells("HSA", {0: {"balance": 10.0}})
+    assert dm.view("Net worth")[1]["balance"] == 210.0
+
+
+def test_to_dict_rebuilds_the_aggregate():
+    dm = make_manager()
+    aggregate = AggregateDataset(dm, "Net worth", ["401(k)", "HSA"])
+    expected = dm.view("Net worth")
+    aggregate.close()
+    dm.remove_dataset("Net worth")
+
+    AggregateDataset(dm, "Net worth", **aggregate.to_dict())
+    assert dm.view("Net worth") == expected
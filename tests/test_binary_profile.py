@@ -0,0 +1,125 @@
+import math
+
+import pytest
+
+from money_metrics.core.binary_profile import (
+    BinaryProfile,
+    is_binary_profile,
+    write_profile,
+)
+from money_metrics.core.profile import AppProfile, LazyProfile, open_profile
+
+
+def sample_profile():
+    return AppProfile(
+        datasets={
+            "401(k)": [
+                {"month": m, "contribution": 100.0, "growth_rate": 0.01, "balance": m * 1.1}
+                for m in range(1, 50)
+            ],
+            "mixed": [{"a": 1, "b": "x", "c": True}, {"a": 2.5, "b": None, "c": False}],
+            "numbers": [1, 2, 3],
+            "settings": {"currency": "USD", "rate": 0.07},
+            "empty": [],
+        },
+        screens=[{"title": "Graph 1", "dataset": "401(k)"}],
+    )
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_round_trip_matches_json_format(tmp_path, compress):
+    profile = sample_profile()
+    json_path = tmp_path / "profile.json"
+    binary_path = tmp_path / "profile.mmp"
+    profile.save_to_file(json_path)
+    profile.save_to_file(binary_path, compress=compress)
+
+    assert is_binary_profile(binary_path) and not is_binary_profile(json_path)
+    loaded = AppProfile.load_from_file(binary_path)
+    assert loaded.to_dict() == AppProfile.load_from_file(json_path).to_dict()
+    # Integers and floats keep their types.
+    row = loaded.datasets["401(k)"][0]
+    assert type(row["month"]) is int and type(row["balance"]) is float
+    assert loaded.datasets["mixed"][1]["a"] == 2.5
+
+
+def test_binary_profile_is_smaller_and_lazy(tmp_path):
+    profile = sample_profile()
+    profile.save_to_file(tmp_path / "profile.json")
+    profile.save_to_file(tmp_path / "profile.dat", format="binary")
+    assert (tmp_path / "profile.dat").stat().st_size < (
+        tmp_path / "profile.json"
+    ).stat().st_size
+
+    lazy = open_profile(tmp_path / "profile.dat")
+    assert isinstance(lazy, BinaryProfile)
+    assert lazy.screens == profile.screens
+    assert not lazy.is_parsed("401(k)")
+    assert lazy.load_dataset("numbers") == [1, 2, 3]
+    assert isinstance(open_profile(tmp_path / "profile.json"), LazyProfile)
+
+
+def test_non_finite_floats_survive(tmp_path):
+    profile = AppProfile(datasets={"d": [{"x": math.inf}, {"x": math.nan}]})
+    profile.save_to_file(tmp_path / "p.mmp")
+    loaded = AppProfile.load_from_file(tmp_path / "p.mmp").datasets["d"]
+    assert loaded[0]["x"] == math.inf and math.isnan(loaded[1]["x"])
+
+    with pytest.raises(ValueError):
+        profile.save_to_file(tmp_path / "p.bin", format="yaml")
+
+
+def scenario_profile(edits=()):
+    base = [
+        {"month": m, "contribution": 100.0, "growth_rate": 0.01, "balance": float(m)}
+        for m in range(1, 40_001)
+    ]
+    datasets = {"base": base}
+    for i, month in enumerate(edits):
+        copy = [dict(row) for row in base]
+        copy[month]["contribution"] = 0.0
+        datasets[f"scenario {i}"] = copy
+    return AppProfile(datasets=datasets)
+
+
+def test_identical_chunks_are_stored_once(tmp_path):
+    single = tmp_path / "single.mmp"
+    copies = tmp_path / "copies.mmp"
+    base = write_profile(single, scenario_profile(), compress=False)
+    stats = write_profile(copies, scenario_profile(edits=[10, 20_000]), compress=False)
+
+    # Only the chunk holding each edited contribution is new.
+    assert stats.chunks == 3 * base.chunks
+    assert stats.unique == base.unique + 2
+    assert copies.stat().st_size < single.stat().st_size * 1.2
+    loaded = AppProfile.load_from_file(copies)
+    assert loaded.datasets == scenario_profile(edits=[10, 20_000]).datasets
+
+
+def test_resave_reuses_unchanged_chunks(tmp_path):
+    path = tmp_path / "profile.mmp"
+    profile = scenario_profile()
+    first = write_profile(path, profile)
+    assert first.reused == 0
+
+    profile.datasets["base"][5]["balance"] = -1.0
+    second = write_profile(path, profile)
+    assert second.reused == second.unique - 1
+    assert AppProfile.load_from_file(path).datasets == profile.datasets
+
+    # A change of compression cannot reuse compressed bytes.
+    assert write_profile(path, profile, compress=False).reused == 0
+
+
+def test_open_profile_reads_from_the_mapped_file(tmp_path):
+    path = tmp_path / "profile.mmp"
+    profile = sample_profile()
+    profile.save_to_file(path)
+
+    lazy = open_profile(path)
+    # Overwriting the file does not change the datasets still to be loaded.
+    AppProfile(datasets={"numbers": [9]}).save_to_file(path)
+    assert lazy.load_dataset("numbers") == [1, 2, 3]
+    rest = [name for name in lazy.dataset_names if name != "numbers"]
+    loaded = {name: lazy.load_dataset(name) for name in rest}
+    assert loaded["401(k)"] == profile.datasets["401(k)"]
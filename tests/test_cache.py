@@ -0,0 +1,70 @@
+import threading
+
+import numpy as np
+
+from money_metrics.core.cache import ArtifactCache, shared_cache, sizeof
+
+
+def test_entries_are_sized_and_evicted_lru():
+    array = np.zeros(100)
+    size = sizeof(array)
+    assert size >= array.nbytes
+    cache = ArtifactCache(budget=3 * size)
+
+    for version in range(3):
+        cache.put(("plan", version, "balance"), np.zeros(100))
+    assert cache.get(("plan", 0, "balance")) is not None
+    cache.put(("plan", 3, "balance"), np.zeros(100))
+
+    assert ("plan", 1, "balance") not in cache
+    assert ("plan", 0, "balance") in cache
+    stats = cache.stats()
+    assert (stats.hits, stats.evictions, stats.entries) == (1, 1, 3)
+    assert stats.bytes <= stats.budget
+
+
+def test_oversized_entries_are_not_cached():
+    cache = ArtifactCache(budget=100)
+    cache.put(("plan", 1, None), np.zeros(1000))
+    assert len(cache) == 0 and cache.stats().bytes == 0
+
+
+def test_get_or_compute_and_invalidate():
+    cache = ArtifactCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return [1, 2, 3]
+
+    assert cache.get_or_compute(("a", 1, "sum"), compute) == [1, 2, 3]
+    assert cache.get_or_compute(("a", 1, "sum"), compute) == [1, 2, 3]
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert (stats.hits, stats.misses) == (1, 1)
+
+    cache.put(("a", 2, "sum"), [6])
+    cache.put(("b", 1, "sum"), [1])
+    assert cache.invalidate("a", keep_version=2) == 1
+    assert ("a", 2, "sum") in cache and ("b", 1, "sum") in cache
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_concurrent_puts_respect_budget():
+    cache = ArtifactCache(budget=50_000)
+
+    def work(offset):
+        for i in range(200):
+            cache.put(("d", offset, i), np.zeros(64))
+            cache.get(("d", offset, i - 1))
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = cache.stats()
+    assert 0 < stats.bytes <= stats.budget
+    assert stats.bytes == sum(size for _, size in cache._entries.values())
+    assert shared_cache() is shared_cache()
@@ -0,0 +1,45 @@
+import json
+
+import numpy as np
+import pytest
+
+from money_metrics.core import FourZeroOneK
+from money_metrics.core.columnar_file import open_columns, write_columns
+from money_metrics.core.four_zero_one_k import write_json
+
+
+def test_columns_round_trip_as_zero_copy_views(tmp_path):
+    path = tmp_path / "data.mmcol"
+    months = np.arange(1, 1001)
+    values = np.linspace(0.0, 1.0, 1000)
+    write_columns(path, {"month": months, "value": values, "flag": months % 2 == 0})
+
+    with open_columns(path) as columns:
+        assert list(columns) == ["month", "value", "flag"]
+        assert columns.rows == 1000
+        assert columns["month"].dtype == np.int64
+        assert np.array_equal(columns["value"], values)
+        assert columns["flag"][1]
+        assert not columns["value"].flags.writeable
+        assert not columns["value"].flags.owndata
+        assert sum(len(c["month"]) for c in columns.iter_chunks(300)) == 1000
+
+    with pytest.raises(ValueError):
+        write_columns(path, {"a": [1, 2], "b": [1.0]})
+
+
+def test_401k_columnar_save_and_json_export(tmp_path):
+    plan = FourZeroOneK.from_arrays([100.0, 200.0, 50.0], 0.01)
+    path = tmp_path / "401k.mmcol"
+    plan.save_columns(path)
+    loaded = FourZeroOneK.load_columns(path)
+    assert loaded.to_dict() == plan.to_dict()
+
+    json_path = tmp_path / "401k.json"
+    with open_columns(path) as columns:
+        write_json(columns.iter_chunks(), json_path)
+    assert json.loads(json_path.read_text()) == plan.to_dict()
+
+    empty = tmp_path / "empty.mmcol"
+    FourZeroOneK().save_columns(empty)
+    assert len(FourZeroOneK.load_columns(empty)) == 0
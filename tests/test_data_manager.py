@@ -1,3 +1,5 @@
+import threading
+
 import pytest
 
 from money_metrics.core import DataManager
@@ -51,3 +53,162 @@ def test_all_datasets_returns_copy():
 
     assert dm.get_dataset("sample") == [1, 2, 3]
 
+
+def test_view_is_read_only_and_not_copied():
+    dm = DataManager()
+    dm.add_dataset("rows", [{"month": 1, "balance": 10.0}])
+
+    view = dm.view("rows")
+    assert view is dm.view("rows")
+    assert view == [{"month": 1, "balance": 10.0}]
+    with pytest.raises(TypeError):
+        view.append({})
+    with pytest.raises(TypeError):
+        view[0]["balance"] = 0.0
+
+    copy = dm.get_dataset("rows")
+    copy[0]["balance"] = 0.0
+    assert dm.view("rows")[0]["balance"] == 10.0
+
+
+def test_names_versions_and_snapshot():
+    dm = DataManager()
+    dm.add_dataset("a", [1])
+    dm.add_dataset("b", [2])
+    assert dm.names() == ["a", "b"]
+
+    snapshot = dm.snapshot()
+    version = dm.version("a")
+    dm.add_dataset("a", [3], replace=True)
+    assert dm.version("a") > version
+    assert snapshot["a"] == [1]
+
+    dm.remove_dataset("a")
+    assert "a" not in dm and dm.version("a") is None
+
+
+def test_update_cells_publishes_delta_and_shares_rows():
+    dm = DataManager()
+    dm.add_dataset("rows", [{"a": 1, "b": 2}, {"a": 3, "b": 4}, {"a": 5, "b": 6}])
+    before = dm.view("rows")
+    events = []
+    token = dm.subscribe(events.append, name="rows")
+    dm.subscribe(lambda change: events.append("other") if change.name != "rows" else None)
+
+    dm.update_cells("rows", {1: {"b": 40}}, source="editor")
+    after = dm.view("rows")
+    assert after[1] == {"a": 3, "b": 40}
+    assert after[0] is before[0]
+    assert before[1]["b"] == 4
+
+    change = events[-1]
+    assert (change.kind, change.rows, change.columns, change.source) == (
+        "updated",
+        (1,),
+        ("b",),
+        "editor",
+    )
+    assert change.version == dm.version("rows")
+
+    dm.rename_column("rows", "a", "x")
+    assert list(dm.view("rows")[0]) == ["x", "b"]
+    merged = events[0].merge(events[1])
+    assert merged.kind == "replaced" and merged.version == dm.version("rows")
+    assert merged.rename == (("a", "x"),)
+
+    dm.add_dataset("other", [1])
+    assert events[-1] == "other"
+    dm.unsubscribe(token)
+    dm.remove_dataset("rows")
+    assert all(e == "other" or e.kind != "removed" for e in events)
+
+
+def test_lazy_dataset_loads_on_first_read():
+    dm = DataManager()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return [{"month": 1, "balance": 1.0}]
+
+    dm.add_lazy_dataset("plan", loader)
+    assert "plan" in dm and dm.names() == ["plan"]
+    version = dm.version("plan")
+    assert not dm.is_loaded("plan") and not calls
+
+    assert dm.view("plan") == [{"month": 1, "balance": 1.0}]
+    assert dm.get_dataset("plan") == dm.view("plan")
+    assert dm.is_loaded("plan") and len(calls) == 1
+    assert dm.version("plan") == version
+
+    dm.add_lazy_dataset("other", loader)
+    dm.remove_dataset("other")
+    assert "other" not in dm and len(calls) == 1
+
+
+def test_failed_lazy_load_is_retried():
+    dm = DataManager()
+    attempts = []
+
+    def loader():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ValueError("truncated profile")
+        return [{"month": 1, "balance": 1.0}]
+
+    dm.add_lazy_dataset("plan", loader)
+    with pytest.raises(ValueError):
+        dm.view("plan")
+    assert "plan" in dm and not dm.is_loaded("plan")
+    assert dm.view("plan") == [{"month": 1, "balance": 1.0}]
+    assert len(attempts) == 2
+
+
+def test_snapshot_leaves_lazy_datasets_to_its_reader():
+    dm = DataManager()
+    calls = []
+
+    def loader():
+        calls.append(threading.current_thread())
+        return [{"month": 1, "balance": 1.0}]
+
+    dm.add_lazy_dataset("plan", loader)
+    snapshot = dm.snapshot()
+    assert list(snapshot) == ["plan"] and not calls
+
+    reader = threading.Thread(target=lambda: snapshot["plan"])
+    reader.start()
+    reader.join()
+    assert calls == [reader]
+    # The manager reuses the data loaded for the snapshot.
+    assert dm.view("plan") is snapshot["plan"]
+    assert len(calls) == 1
+
+
+def test_merged_changes_keep_their_renames():
+    dm = DataManager()
+    dm.add_dataset("rows", [{"a": 1, "b": 2}])
+    events = []
+    dm.subscribe(events.append)
+    dm.rename_column("rows", "a", "x")
+    dm.update_cells("rows", {0: {"b": 3}})
+    dm.rename_column("rows", "x", "y")
+    dm.rename_column("rows", "b", "z")
+
+    merged = events[0].merge(events[1]).merge(events[2]).merge(events[3])
+    assert merged.kind == "replaced"
+    assert merged.rename == (("a", "x"), ("x", "y"), ("b", "z"))
+
+
+def test_unshared_rows_are_updated_in_place():
+    dm = DataManager()
+    dm.add_dataset("rows", [{"a": i} for i in range(3)])
+    stored = id(dm.view("rows"))
+    dm.update_cells("rows", {1: {"a": 10}})
+    # Nothing else held the rows, so only the edited row was replaced.
+    assert id(dm.view("rows")) == stored
+
+    snapshot = dm.snapshot()
+    dm.update_cells("rows", {2: {"a": 20}})
+    assert snapshot["rows"] == [{"a": 0}, {"a": 10}, {"a": 2}]
+    assert dm.view("rows") == [{"a": 0}, {"a": 10}, {"a": 20}]
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from money_metrics.core.downsample import (
+    SeriesPyramid,
+    envelope,
+    lttb,
+    minmax_downsample,
+)
+
+
+def noisy_series(n):
+    rng = np.random.default_rng(3)
+    x = np.arange(1, n + 1)
+    y = np.cumsum(rng.normal(size=n))
+    return x, y
+
+
+def test_minmax_keeps_extremes_and_endpoints():
+    x, y = noisy_series(10_000)
+    y[4321] = 1e6
+    xs, ys = minmax_downsample(x, y, 100)
+
+    assert len(xs) <= 202
+    assert ys.max() == 1e6 and ys.min() == y.min()
+    assert (xs[0], xs[-1]) == (1, 10_000)
+    assert np.all(np.diff(xs) > 0)
+    with pytest.raises(ValueError):
+        minmax_downsample(x, y, 0)
+
+
+def test_short_series_are_returned_whole():
+    x, y = noisy_series(50)
+    assert len(minmax_downsample(x, y, 100)[0]) == 50
+    assert len(lttb(x, y, 100)[0]) == 50
+
+
+def test_lttb_picks_one_point_per_bucket():
+    x, y = noisy_series(5_000)
+    y[2500] = 500.0
+    xs, ys = lttb(x, y, 200)
+
+    assert len(xs) == 200
+    assert (xs[0], xs[-1]) == (1, 5_000)
+    assert np.all(np.diff(xs) > 0)
+    assert 500.0 in ys
+
+
+def test_envelope_encloses_band():
+    x, lows = noisy_series(1_000)
+    highs = lows + 5
+    xs, bucket_lows, bucket_highs = envelope(x, lows, highs, 50)
+
+    assert len(xs) == 100
+    assert bucket_lows.min() == lows.min()
+    assert bucket_highs.max() == highs.max()
+
+
+def test_pyramid_views_scale_with_pixels():
+    x, y = noisy_series(1_000_000)
+    y[777_777] = 1e9
+    pyramid = SeriesPyramid(x, y)
+
+    xs, ys, raw = pyramid.view(pixels=500)
+    assert not raw
+    assert len(xs) <= 2 * 500 + 2
+    assert ys.max() == 1e9 and ys.min() == y.min()
+    assert (xs[0], xs[-1]) == (1, 1_000_000)
+
+    xs, ys, raw = pyramid.view(700_000, 800_000, pixels=500)
+    assert len(xs) <= 2 * 500 + 2
+    assert xs[0] <= 700_000 and xs[-1] >= 800_000
+    assert 1e9 in ys
+
+    xs, ys, raw = pyramid.view(777_000, 777_500, pixels=500)
+    assert raw
+    np.testing.assert_array_equal(ys, y[776_998:777_501])
+
+
+def test_pyramid_ignores_nan():
+    x, y = noisy_series(10_000)
+    y[:100] = np.nan
+    xs, ys, _ = SeriesPyramid(x, y).view(pixels=50)
+    assert np.nanmax(ys) == np.nanmax(y)
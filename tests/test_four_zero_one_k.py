@@ -36,3 +36,126 @@ def test_save_and_load_json(tmp_path):
     loaded = FourZeroOneK.load_from_json(path)
     assert loaded.to_dict() == plan.to_dict()
 
+
+def test_columnar_engine_matches_recurrence():
+    plan = FourZeroOneK()
+    expected = []
+    balance = 0.0
+    for month in range(1, 50):
+        contribution, growth = 10.0 * month, 0.001 * (month % 7) - 0.002
+        plan.add_month(contribution, growth)
+        balance = (balance + contribution) * (1 + growth)
+        expected.append(balance)
+
+    assert plan.balances.tolist() == pytest.approx(expected)
+
+    plan.modify_month(1, contribution=500)
+    rebuilt = FourZeroOneK(plan.to_dict())
+    assert rebuilt.balances.tolist() == pytest.approx(plan.balances.tolist())
+    assert plan.months.tolist() == list(range(1, 50))
+    assert not plan.balances.flags.writeable
+
+
+def test_entries_reject_assignment():
+    plan = FourZeroOneK.from_arrays([100.0] * 3, 0.01)
+    with pytest.raises(AttributeError):
+        plan.entries[1].contribution = 500.0
+    assert plan.contributions.tolist() == [100.0] * 3
+
+    plan.modify_month(2, contribution=500.0)
+    assert plan.entries[1].contribution == 500.0
+
+
+def test_from_arrays_handles_total_loss_month():
+    plan = FourZeroOneK.from_arrays([100.0] * 200, [0.01] * 99 + [-1.0] + [0.01] * 100)
+    assert plan.entries[99].balance == 0.0
+    assert plan.entries[100].balance == pytest.approx(101.0)
+    assert len(plan) == 200
+
+
+def test_modify_month_defers_recompute_until_read():
+    plan = FourZeroOneK.from_arrays([100.0] * 120, 0.01)
+    plan.modify_month(1, contribution=1000)
+    plan.modify_month(60, growth_rate=0.02)
+
+    expected = FourZeroOneK(plan.to_dict())
+    plan.modify_month(2, contribution=0)
+    expected.modify_month(2, contribution=0)
+
+    # balance_at answers from the affine tree while the tail is stale
+    assert plan.balance_at(120) == pytest.approx(expected.entries[119].balance)
+    plan.add_month(100, 0.01)
+    expected.add_month(100, 0.01)
+    assert plan.balance_at(121) == pytest.approx(expected.balances[-1])
+    assert plan.balances.tolist() == pytest.approx(expected.balances.tolist())
+
+
+def test_modify_months_batch_commits_once():
+    plan = FourZeroOneK.from_arrays([100.0] * 24, 0.01)
+    expected = FourZeroOneK(plan.to_dict())
+    plan.modify_months(
+        [
+            {"month": 1, "contribution": 50.0},
+            {"op": "insert", "month": 3, "contribution": 75.0, "growth_rate": 0.02},
+            {"op": "delete", "month": 10},
+            {"month": 24, "growth_rate": 0.0},
+        ]
+    )
+    expected.modify_month(1, contribution=50.0)
+    expected.insert_month(3, 75.0, 0.02)
+    expected.delete_month(10)
+    expected.modify_month(24, growth_rate=0.0)
+
+    assert plan.to_dict() == pytest.approx(expected.to_dict())
+    assert plan.balance_at(24) == pytest.approx(expected.balances[-1])
+
+
+def test_transaction_rolls_back_on_invalid_edit():
+    plan = FourZeroOneK.from_arrays([100.0] * 12, 0.01)
+    before = plan.to_dict()
+    with pytest.raises(ValueError):
+        plan.modify_months(
+            [
+                {"op": "delete", "month": 1},
+                {"month": 2, "contribution": 10.0},
+                {"month": 3, "growth_rate": float("nan")},
+            ]
+        )
+    assert plan.to_dict() == before
+
+    with pytest.raises(IndexError):
+        with plan.transaction():
+            plan.add_month(5.0, 0.0)
+            plan.modify_month(99, contribution=1.0)
+    assert plan.to_dict() == before
+
+
+def test_streaming_export_matches_eager_output(tmp_path):
+    import csv
+    import json
+
+    plan = FourZeroOneK.from_arrays([100.0, 250.5, 0.0, 75.25, 10.0], 0.01)
+    assert list(plan.iter_rows(chunk_size=2)) == plan.to_dict()
+
+    path = tmp_path / "401k.json"
+    plan.save_to_json(path)
+    assert path.read_text() == json.dumps(plan.to_dict(), indent=2)
+    empty = tmp_path / "empty.json"
+    FourZeroOneK().save_to_json(empty)
+    assert json.loads(empty.read_text()) == []
+
+    csv_path = tmp_path / "401k.csv"
+    plan.save_to_csv(csv_path)
+    with open(csv_path, newline="") as fh:
+        rows = list(csv.DictReader(fh))
+    assert [float(r["balance"]) for r in rows] == plan.balances.tolist()
+
+
+def test_stream_projection_is_chunked_and_consistent():
+    from money_metrics.core.four_zero_one_k import stream_projection
+
+    chunks = list(stream_projection(50.0, 0.001, 1_000, chunk_size=300))
+    assert [len(c["balance"]) for c in chunks] == [300, 300, 300, 100]
+    plan = FourZeroOneK.from_arrays([50.0] * 1_000, 0.001)
+    assert chunks[-1]["month"][-1] == 1_000
+    assert chunks[-1]["balance"][-1] == pytest.approx(plan.balances[-1])
@@ -1,10 +1,17 @@
+import time
+import weakref
+from unittest import mock
+
 import pytest
 
 pytest.importorskip("PySide6.QtWidgets")
+from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QApplication
 
 from money_metrics.ui.graph_screen import GraphScreen
+from money_metrics.ui.table_model import MAX_PAGES, PAGE_SIZE
 from money_metrics.core.data_manager import DataManager
+from money_metrics.core.four_zero_one_k import FourZeroOneK
 
 
 @pytest.fixture(scope="module")
@@ -56,12 +63,23 @@ def test_update_graph_reuses_axes(app):
 
 
 def _col_index(table, name):
-    for i in range(table.columnCount()):
-        if table.horizontalHeaderItem(i).text() == name:
+    model = table.model()
+    for i in range(model.columnCount()):
+        if model.headerData(i, Qt.Horizontal) == name:
             return i
     raise ValueError(name)
 
 
+def _set_cell(table, row, column, text):
+    model = table.model()
+    return model.setData(model.index(row, column), text)
+
+
+def _cell(table, row, column):
+    model = table.model()
+    return model.data(model.index(row, column))
+
+
 def test_edit_and_rename_column_updates_dataset(app):
     dm = DataManager()
     screen = GraphScreen(dm)
@@ -70,9 +88,9 @@ def test_edit_and_rename_column_updates_dataset(app):
 
     # Edit contribution of first row
     c_idx = _col_index(screen.table, "contribution")
-    item = screen.table.item(0, c_idx)
-    item.setText("200")
+    assert _set_cell(screen.table, 0, c_idx, "200")
     assert screen.data[0]["contribution"] == 200.0
+    screen.flush_edits()
     # balance should be recomputed
     assert screen.data[0]["balance"] == pytest.approx((0 + 200) * 1.01)
     assert dm.get_dataset("401(k)")[0]["contribution"] == 200.0
@@ -83,6 +101,8 @@ def test_edit_and_rename_column_updates_dataset(app):
     assert "deposit" in screen.data[0]
     assert "contribution" not in screen.data[0]
     assert "deposit" in screen._parameters and "contribution" not in screen._parameters
+    assert screen.table_model.headerData(c_idx, Qt.Horizontal) == "deposit"
+    assert _cell(screen.table, 0, c_idx) == "200.0"
 
 
 def test_drag_drop_toggle_parameter(app):
@@ -93,3 +113,251 @@ def test_drag_drop_toggle_parameter(app):
     assert "contribution" in screen._parameters
     screen.handle_dropped_parameter("contribution")
     assert "contribution" not in screen._parameters
+
+
+def test_projection_bands_are_shaded(app):
+    screen = GraphScreen(DataManager())
+    data = [
+        {"month": 1, "p5": 90.0, "p50": 100.0, "p95": 110.0},
+        {"month": 2, "p5": 180.0, "p50": 200.0, "p95": 220.0},
+    ]
+    screen.set_data(data, name="401(k) projection")
+    ax = screen.canvas.figure.axes[0]
+    assert screen._parameters == ["p50"]
+    assert len(ax.collections) == 1
+    assert [line.get_label() for line in ax.get_lines()] == ["p50"]
+
+
+def test_edits_propagate_to_other_screens(app):
+    dm = DataManager()
+    dm.add_dataset("401(k)", sample_dataset())
+    editor = GraphScreen(dm)
+    viewer = GraphScreen(dm)
+    editor.set_data(dm.get_dataset("401(k)"), name="401(k)")
+    viewer.set_data(dm.get_dataset("401(k)"), name="401(k)")
+
+    c_idx = _col_index(editor.table, "contribution")
+    _set_cell(editor.table, 0, c_idx, "200")
+    _set_cell(editor.table, 1, c_idx, "50")
+    editor.flush_edits()
+
+    # Both edits are coalesced into a single pending refresh
+    assert editor._pending_change is None
+    assert viewer._pending_change.rows == (0, 1)
+    assert viewer._refresh_timer.isActive()
+    viewer._apply_pending_changes()
+
+    assert viewer.data == editor.data
+    b_idx = _col_index(viewer.table, "balance")
+    assert _cell(viewer.table, 1, b_idx) == str(editor.data[1]["balance"])
+
+
+def test_renames_made_elsewhere_keep_the_column_graphed(app):
+    dm = DataManager()
+    dm.add_dataset("401(k)", sample_dataset())
+    viewer = GraphScreen(dm)
+    viewer.show_dataset("401(k)")
+    assert viewer._parameters == ["balance"]
+
+    dm.update_cells("401(k)", {0: {"contribution": 1.0}})
+    dm.rename_column("401(k)", "balance", "total")
+    dm.rename_column("401(k)", "contribution", "deposit")
+    dm.rename_column("401(k)", "total", "value")
+    viewer._apply_pending_changes()
+    assert viewer._parameters == ["value"]
+
+
+def test_resampled_view_uses_query(app):
+    dm = DataManager()
+    data = [
+        {"month": m, "contribution": 100.0, "growth_rate": 0.0, "balance": 100.0 * m}
+        for m in range(1, 25)
+    ]
+    dm.add_dataset("401(k)", data)
+    screen = GraphScreen(dm)
+    screen.set_data(dm.get_dataset("401(k)"), name="401(k)")
+
+    screen.set_period("year")
+    line = screen.canvas.figure.axes[0].get_lines()[0]
+    assert list(line.get_xdata()) == [1, 2]
+    assert list(line.get_ydata()) == [1200.0, 2400.0]
+    assert screen.canvas.figure.axes[0].get_xlabel() == "Year"
+
+
+def test_edits_update_persistent_lines(app):
+    screen = GraphScreen(DataManager())
+    data = sample_dataset()
+    screen.set_data(data, name="401(k)")
+    screen.canvas.draw()
+    ax = screen.canvas.figure.axes[0]
+    (line,) = ax.get_lines()
+    ylim = ax.get_ylim()
+
+    # A value inside the view is blitted onto the same artist.
+    data[1]["balance"] = 150.0
+    screen._update_graph(data)
+    assert ax.get_lines() == [line] and screen.canvas.figure.axes == [ax]
+    assert list(line.get_ydata()) == [101.0, 150.0]
+    assert ax.get_ylim() == ylim
+
+    # A value outside the view relimits the axes.
+    data[1]["balance"] = 10_000.0
+    screen._update_graph(data)
+    assert ax.get_lines() == [line]
+    assert ax.get_ylim()[1] >= 10_000.0
+
+
+def test_long_series_are_downsampled_to_the_view(app):
+    dm = DataManager()
+    data = [
+        {"month": m, "contribution": 0.0, "growth_rate": 0.0, "balance": float(m % 97)}
+        for m in range(1, 50_001)
+    ]
+    dm.add_dataset("401(k)", data)
+    screen = GraphScreen(dm)
+    screen.set_data(dm.get_dataset("401(k)"), name="401(k)")
+    screen.canvas.draw()
+    ax = screen.canvas.figure.axes[0]
+    (line,) = ax.get_lines()
+    pixels = int(ax.bbox.width)
+
+    assert len(line.get_xdata()) <= 2 * pixels + 2
+    assert line.get_marker() in ("", "None")
+    assert max(line.get_ydata()) == 96.0
+
+    # Zooming in re-samples the visible range at full detail.
+    ax.set_xlim(1000, 1100)
+    xs = line.get_xdata()
+    assert xs[0] <= 1000 and xs[-1] >= 1100
+    assert len(xs) == 103
+
+    # Markers return once the points are far enough apart.
+    ax.set_xlim(1000, 1020)
+    assert len(line.get_xdata()) == 23
+    assert line.get_marker() == "o"
+
+    # set_view zooms the same way and zooms back out to the whole series.
+    screen.set_view(1000, 1100)
+    assert len(line.get_xdata()) == 103
+    screen.set_view()
+    assert ax.get_xlim()[1] >= 50_000
+    assert len(line.get_xdata()) <= 2 * pixels + 2
+
+
+def test_table_model_reports_only_recomputed_rows(app):
+    data = [
+        {"month": m, "contribution": 100.0, "growth_rate": 0.0, "balance": 100.0 * m}
+        for m in range(1, 100_001)
+    ]
+    screen = GraphScreen(DataManager())
+    screen.set_data(data, name="401(k)")
+    model = screen.table_model
+    assert (model.rowCount(), model.columnCount()) == (100_000, 4)
+
+    ranges = []
+    model.dataChanged.connect(
+        lambda first, last, *_: ranges.append((first.row(), last.row()))
+    )
+    resets = []
+    model.modelReset.connect(lambda: resets.append(True))
+    c_idx = _col_index(screen.table, "contribution")
+    assert not _set_cell(screen.table, 99_990, c_idx, "not a number")
+    assert _set_cell(screen.table, 99_990, c_idx, "50")
+    screen.flush_edits()
+
+    assert ranges == [(99_990, 99_999)] and not resets
+    b_idx = _col_index(screen.table, "balance")
+    assert _cell(screen.table, 99_999, b_idx) == str(screen.data[-1]["balance"])
+
+
+def test_dragging_a_cell_exports_its_column_name(app):
+    screen = GraphScreen(DataManager())
+    screen.set_data(sample_dataset(), name="401(k)")
+    model = screen.table_model
+    c_idx = _col_index(screen.table, "contribution")
+    mime = model.mimeData([model.index(1, c_idx)])
+    assert mime.text() == "contribution"
+    screen.handle_dropped_parameter(mime.text())
+    assert "contribution" in screen._parameters
+
+
+def test_edit_bursts_are_coalesced(app):
+    dm = DataManager()
+    dm.add_dataset("401(k)", FourZeroOneK.from_arrays([100.0] * 1000, 0.01).to_dict())
+    screen = GraphScreen(dm)
+    screen.set_data(dm.get_dataset("401(k)"), name="401(k)")
+    changes = []
+    dm.subscribe(changes.append)
+    ranges = []
+    screen.table_model.dataChanged.connect(
+        lambda first, last, *_: ranges.append((first.row(), last.row()))
+    )
+
+    with mock.patch.object(screen, "_update_graph", wraps=screen._update_graph) as redraw:
+        # Pasting a column arrives as many cell edits within one tick.
+        c_idx = _col_index(screen.table, "contribution")
+        for row in range(500, 550):
+            _set_cell(screen.table, row, c_idx, "200")
+        assert not changes and not redraw.called
+
+        deadline = time.perf_counter() + 2
+        while screen.last_edit_latency is None and time.perf_counter() < deadline:
+            app.processEvents()
+
+    assert len(changes) == 1 and changes[0].rows == tuple(range(500, 1000))
+    assert ranges == [(500, 999)]
+    assert redraw.call_count == 1
+    assert screen.last_edit_latency is not None
+    expected = dm.get_dataset("401(k)")
+    plan = FourZeroOneK(expected)
+    assert [r["balance"] for r in expected] == pytest.approx(plan.balances.tolist())
+    assert screen.data[499]["balance"] == pytest.approx(plan.balances[499])
+
+
+def test_screens_share_prepared_series_and_page_rows(app):
+    dm = DataManager()
+    dm.add_dataset("401(k)", FourZeroOneK.from_arrays([100.0] * 5000, 0.01).to_dict())
+    screens = [GraphScreen(dm) for _ in range(10)]
+    for screen in screens:
+        assert screen.show_dataset("401(k)")
+
+    first, second = screens[0], screens[1]
+    assert all(s.series is first.series for s in screens)
+    pyramids = {id(s._pyramids["balance"]) for s in screens}
+    assert len(pyramids) == 1
+
+    # The table reads rows from the data manager and keeps a window of them.
+    with mock.patch.object(dm, "get_rows", wraps=dm.get_rows) as get_rows:
+        assert _cell(first.table, 4000, 0) == "4001"
+        assert _cell(first.table, 4001, 0) == "4002"
+    assert get_rows.call_count == 1
+    for row in range(0, 5000, PAGE_SIZE):
+        _cell(first.table, row, 0)
+    assert len(first.data._pages) == MAX_PAGES
+
+    # Edits go to the data manager; no screen keeps a copy of the rows.
+    c_idx = _col_index(first.table, "contribution")
+    _set_cell(first.table, 4498, c_idx, "0")
+    first.flush_edits()
+    assert dm.view("401(k)")[4498]["contribution"] == 0.0
+    assert second.data[4498] == dm.view("401(k)")[4498]
+    plan = FourZeroOneK(dm.get_dataset("401(k)"))
+    assert dm.view("401(k)")[-1]["balance"] == pytest.approx(plan.balances[-1])
+
+    second._apply_pending_changes()
+    first._redraw()
+    assert first._pyramids["balance"] is second.series.pyramid("401(k)", "balance")
+    assert not second.show_dataset("missing")
+
+
+def test_screens_do_not_outlive_their_last_reference(app):
+    dm = DataManager()
+    dm.add_dataset("401(k)", sample_dataset())
+    screen = GraphScreen(dm)
+    screen.show_dataset("401(k)")
+    ref = weakref.ref(screen)
+
+    # The data manager's subscription does not keep the screen alive.
+    del screen
+    assert ref() is None
+    dm.update_cells("401(k)", {0: {"contribution": 1.0}})
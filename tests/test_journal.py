@@ -0,0 +1,210 @@
+import json
+import os
+
+import pytest
+
+from money_metrics.core.data_manager import DataManager, DatasetChange
+from money_metrics.core.journal import ProfileJournal
+from money_metrics.core.profile import AppProfile
+from money_metrics.core.sqlite_store import SQLiteDataManager
+
+
+def plan(n=3):
+    return [{"month": m, "contribution": 10.0, "balance": 10.0 * m} for m in range(1, n + 1)]
+
+
+def attach(dm, path, **kwargs):
+    journal = ProfileJournal(path, **kwargs)
+    journal.attach(dm, lambda: AppProfile(datasets=dict(dm.snapshot())))
+    return journal
+
+
+def recovered_datasets(path):
+    return ProfileJournal(path).recover().to_profile().datasets
+
+
+def test_edits_are_appended_and_recovered(tmp_path):
+    path = tmp_path / "autosave.jsonl"
+    dm = DataManager()
+    dm.add_dataset("401(k)", plan())
+    journal = attach(dm, path)
+
+    size = path.stat().st_size
+    dm.update_cells("401(k)", {1: {"contribution": 50.0}})
+    # A cell edit appends a record the size of the change.
+    assert path.stat().st_size - size < 200
+    dm.rename_column("401(k)", "balance", "total")
+    dm.add_dataset("HSA", [{"month": 1, "total": 5.0}])
+    dm.remove_dataset("HSA")
+    journal.record_screens([{"title": "Plot", "dataset": "401(k)"}])
+    assert journal.records == 5
+
+    recovered = ProfileJournal(path).recover()
+    assert recovered.dataset_names == ["401(k)"]
+    assert recovered.screens == [{"title": "Plot", "dataset": "401(k)"}]
+    assert recovered.load_dataset("401(k)") == dm.get_dataset("401(k)")
+
+
+def test_only_renames_are_journaled_as_renames(tmp_path):
+    path = tmp_path / "autosave.jsonl"
+    dm = DataManager()
+    dm.add_dataset("401(k)", plan())
+    journal = attach(dm, path)
+    # A replace that happens to list two columns is not a rename.
+    dm.add_dataset("401(k)", plan(2), replace=True)
+    journal._on_change(
+        DatasetChange("401(k)", dm.version("401(k)"), "replaced", columns=("a", "b"))
+    )
+    ops = [json.loads(line)["op"] for line in path.read_text().splitlines()[1:]]
+    assert ops == ["replace", "replace"]
+    assert recovered_datasets(path) == {"401(k)": plan(2)}
+
+
+def test_truncated_record_is_ignored(tmp_path):
+    path = tmp_path / "autosave.jsonl"
+    dm = DataManager()
+    dm.add_dataset("401(k)", plan())
+    journal = attach(dm, path)
+    dm.update_cells("401(k)", {0: {"contribution": 1.0}})
+    journal.close()
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write('{"op": "cells", "name": "401(k)", "ro')
+
+    assert recovered_datasets(path)["401(k)"][0]["contribution"] == 1.0
+
+
+def test_compaction_and_rebase(tmp_path):
+    path = tmp_path / "autosave.jsonl"
+    dm = DataManager()
+    dm.add_dataset("401(k)", plan())
+    journal = attach(dm, path, compact_after=2)
+
+    dm.update_cells("401(k)", {0: {"contribution": 1.0}})
+    assert not journal.maybe_compact()
+    dm.update_cells("401(k)", {1: {"contribution": 2.0}})
+    assert journal.maybe_compact()
+    assert journal.records == 0
+    assert len(path.read_text().splitlines()) == 1
+    assert recovered_datasets(path) == dm.all_datasets()
+
+    saved = tmp_path / "profile.json"
+    AppProfile(datasets=dm.all_datasets()).save_to_file(saved)
+    journal.rebase(str(saved))
+    dm.update_cells("401(k)", {2: {"contribution": 3.0}})
+    # The journal keeps its own copy of the saved profile.
+    saved.unlink()
+    assert recovered_datasets(path) == dm.all_datasets()
+    snapshots = [p for p in tmp_path.iterdir() if p.name.endswith(".snapshot")]
+    assert [str(p) for p in snapshots] == [journal.base]
+
+
+def test_stale_mark_does_not_rebase(tmp_path):
+    path = tmp_path / "autosave.jsonl"
+    dm = DataManager()
+    dm.add_dataset("401(k)", plan())
+    journal = attach(dm, path)
+    older = journal.mark()
+    dm.update_cells("401(k)", {0: {"contribution": 1.0}})
+    newer = journal.mark()
+    dm.update_cells("401(k)", {1: {"contribution": 2.0}})
+
+    stale = journal.write_snapshot(older)
+    assert journal.rebase(journal.write_snapshot(newer), since=newer)
+    assert journal.records == 1
+    # The older snapshot finishes last but must not replace the newer one.
+    assert not journal.rebase(stale, since=older)
+    assert not os.path.exists(stale)
+    assert recovered_datasets(path) == dm.all_datasets()
+
+
+def test_missing_snapshot_raises_and_unknown_datasets_are_skipped(tmp_path):
+    path = tmp_path / "autosave.jsonl"
+    dm = DataManager()
+    dm.add_dataset("401(k)", plan())
+    journal = attach(dm, path)
+    dm.update_cells("401(k)", {0: {"contribution": 1.0}})
+    journal.close()
+
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write(json.dumps({"op": "cells", "name": "HSA", "rows": {"0": {"a": 1}}}) + "\n")
+    assert recovered_datasets(path)["401(k)"][0]["contribution"] == 1.0
+
+    os.remove(journal.base)
+    with pytest.raises(ValueError):
+        ProfileJournal(path).recover()
+
+
+def test_recovery_keeps_datasets_a_store_already_holds(tmp_path):
+    path = tmp_path / "autosave.jsonl"
+    store = tmp_path / "data.db"
+    dm = SQLiteDataManager(str(store))
+    dm.add_dataset("401(k)", plan())
+    dm.add_dataset("HSA", plan(2))
+    journal = attach(dm, path)
+    dm.update_cells("401(k)", {0: {"contribution": 1.0}})
+    journal.close()
+    dm.close()
+
+    reopened = SQLiteDataManager(str(store))
+    recovered = ProfileJournal(path).recover()
+    assert recovered.stored_in(reopened) == {"401(k)", "HSA"}
+    assert recovered.stored_in(DataManager()) == set()
+    reopened.update_cells("HSA", {0: {"balance": 0.0}})
+    assert recovered.stored_in(reopened) == {"401(k)"}
+    reopened.close()
+
+
+def test_no_journal_recovers_nothing(tmp_path):
+    assert ProfileJournal(tmp_path / "missing.jsonl").recover() is None
+
+
+def test_only_a_journal_left_open_needs_recovery(tmp_path):
+    path = tmp_path / "autosave.jsonl"
+    assert not ProfileJournal(path).needs_recovery()
+    dm = DataManager()
+    dm.add_dataset("401(k)", plan())
+    journal = attach(dm, path)
+    dm.update_cells("401(k)", {0: {"contribution": 1.0}})
+    # A crash leaves the journal without its closing record.
+    assert ProfileJournal(path).needs_recovery()
+    journal.close()
+    assert not ProfileJournal(path).needs_recovery()
+
+    # Resuming drops the closing record until the journal is closed again.
+    resumed = ProfileJournal(path)
+    recovered = resumed.recover()
+    dm = DataManager()
+    dm.add_dataset("401(k)", recovered.load_dataset("401(k)"))
+    resumed.attach(dm, lambda: AppProfile(datasets=dict(dm.snapshot())), resume=True)
+    assert resumed.needs_recovery()
+    resumed.close()
+    assert not resumed.needs_recovery()
+
+
+def test_journals_sharing_a_directory_keep_their_own_snapshots(tmp_path):
+    dm = DataManager()
+    dm.add_dataset("401(k)", plan())
+    other = tmp_path / "autosave.jsonl"
+    other_journal = attach(dm, other)
+    stray = tmp_path / "notes.snapshot"
+    stray.write_text("not a journal snapshot")
+
+    journal = attach(dm, tmp_path / "autosave")
+    journal.rebase()
+    assert os.path.exists(other_journal.base)
+    assert stray.exists()
+    assert recovered_datasets(other) == {"401(k)": plan()}
+    journal.close()
+    other_journal.close()
+
+
+def test_replacing_a_dataset_counts_its_rows_towards_compaction(tmp_path):
+    dm = DataManager()
+    dm.add_dataset("401(k)", plan())
+    journal = attach(dm, tmp_path / "autosave.jsonl", compact_after=10)
+    dm.update_cells("401(k)", {0: {"contribution": 1.0}})
+    assert journal.records == 1
+    dm.add_dataset("401(k)", plan(9), replace=True)
+    assert journal.records == 10
+    assert journal.needs_compaction
+    journal.close()
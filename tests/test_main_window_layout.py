@@ -1,10 +1,12 @@
 import pytest
 
 pytest.importorskip("PySide6.QtWidgets")
+from PySide6.QtCore import QEvent, QThread, QThreadPool
 from PySide6.QtWidgets import QApplication, QTabWidget
 
 from money_metrics.ui.main_window import MainWindow
-from money_metrics.core.profile import AppProfile
+from money_metrics.core.journal import ProfileJournal
+from money_metrics.core.profile import AppProfile, LazyProfile
 
 
 @pytest.fixture(scope="module")
@@ -30,3 +32,318 @@ def test_profile_load_replaces_home_layout(app):
     window = MainWindow()
     window._apply_profile(profile)
     assert not isinstance(window.centralWidget(), QTabWidget)
+
+
+def test_lazy_profile_shows_screens_before_loading_data(app, tmp_path):
+    data = [{"month": 1, "contribution": 1.0, "growth_rate": 0.0, "balance": 1.0}]
+    path = tmp_path / "profile.json"
+    AppProfile(
+        datasets={"Other": [1, 2], "401(k)": data},
+        screens=[{"title": "Graph 1", "dataset": "401(k)"}],
+    ).save_to_file(path)
+
+    window = MainWindow()
+    window._apply_profile(LazyProfile(path))
+    screen = window.graph_screens[0]
+    assert screen.dataset_name == "401(k)"
+    assert set(window.data_manager.names()) == {"Other", "401(k)"}
+
+    QThreadPool.globalInstance().waitForDone()
+    app.processEvents()
+    assert list(screen.data) == data
+    assert window.data_manager.view("Other") == [1, 2]
+    assert window.load_progress.isHidden()
+
+
+def test_window_journals_and_recovers_edits(app, tmp_path):
+    journal_path = tmp_path / "autosave.jsonl"
+    window = MainWindow(journal=ProfileJournal(journal_path))
+    window.add_plot_screen()
+    window.data_manager.add_dataset("401(k)", [{"month": 1, "balance": 1.0}])
+    window.data_manager.update_cells("401(k)", {0: {"balance": 2.0}})
+    window.close()
+
+    journal = ProfileJournal(journal_path)
+    # The window closed the journal cleanly, so there is nothing to offer.
+    assert not journal.needs_recovery()
+    restored = MainWindow(profile=journal.recover(), journal=journal)
+    # A recovered session keeps the home tabs.
+    assert isinstance(restored.centralWidget(), QTabWidget)
+    # Recovered datasets are only decoded when first read.
+    assert not restored.data_manager.is_loaded("401(k)")
+    assert restored.data_manager.view("401(k)") == [{"month": 1, "balance": 2.0}]
+    assert len(restored.graph_screens) == 1
+    restored.data_manager.update_cells("401(k)", {0: {"balance": 3.0}})
+    restored.close()
+
+    recovered = ProfileJournal(journal_path).recover().to_profile()
+    assert recovered.datasets["401(k)"] == [{"month": 1, "balance": 3.0}]
+
+
+def test_profile_saves_in_background(app, tmp_path):
+    window = MainWindow(journal=ProfileJournal(tmp_path / "autosave.jsonl"))
+    window.data_manager.add_dataset("401(k)", [{"month": 1, "balance": 1.0}])
+    window.profile_path = str(tmp_path / "profile.json")
+    window._save_profile()
+    # Edits made while the save is in flight stay in the journal.
+    window.data_manager.update_cells("401(k)", {0: {"balance": 2.0}})
+
+    threads = []
+    window._run_in_background(
+        lambda report: None, lambda _: threads.append(QThread.currentThread())
+    )
+    QThreadPool.globalInstance().waitForDone()
+    app.processEvents()
+
+    assert threads == [app.thread()]
+    saved = AppProfile.load_from_file(window.profile_path)
+    assert saved.datasets["401(k)"] == [{"month": 1, "balance": 1.0}]
+    recovered = window.journal.recover().to_profile()
+    assert recovered.datasets["401(k)"] == [{"month": 1, "balance": 2.0}]
+    assert window.save_progress.isHidden()
+    window.close()
+
+
+def test_save_finishing_after_profile_load_is_not_journaled(app, tmp_path):
+    window = MainWindow(journal=ProfileJournal(tmp_path / "autosave.jsonl"))
+    window.data_manager.add_dataset("401(k)", [{"month": 1, "balance": 1.0}])
+    window.profile_path = str(tmp_path / "profile.json")
+    window._save_profile()
+    window._apply_profile(AppProfile(datasets={"HSA": [{"month": 1, "balance": 5.0}]}))
+    QThreadPool.globalInstance().waitForDone()
+    app.processEvents()
+
+    recovered = window.journal.recover().to_profile()
+    assert recovered.datasets == {"HSA": [{"month": 1, "balance": 5.0}]}
+    window.close()
+
+
+def test_recovery_keeps_datasets_in_persistent_store(app, tmp_path):
+    from money_metrics.core.sqlite_store import SQLiteDataManager
+
+    store = str(tmp_path / "data.db")
+    journal_path = tmp_path / "autosave.jsonl"
+    window = MainWindow(
+        data_manager=SQLiteDataManager(store), journal=ProfileJournal(journal_path)
+    )
+    window.data_manager.add_dataset("401(k)", [{"month": 1, "balance": 1.0}])
+    window.close()
+    window.data_manager.close()
+
+    dm = SQLiteDataManager(store)
+    versions = {name: dm.version(name) for name in dm.names()}
+    journal = ProfileJournal(journal_path)
+    restored = MainWindow(profile=journal.recover(), data_manager=dm, journal=journal)
+    # Nothing was removed, reloaded or rewritten.
+    assert {name: dm.version(name) for name in dm.names()} == versions
+    assert dm.is_loaded("401(k)")
+    restored.close()
+    dm.close()
+
+
+def test_autosave_compacts_in_background_without_loading(app, tmp_path):
+    path = tmp_path / "profile.json"
+    AppProfile(datasets={"Other": [1, 2], "HSA": [{"balance": 1.0}]}).save_to_file(path)
+    journal = ProfileJournal(tmp_path / "autosave.jsonl", compact_after=1)
+    window = MainWindow(profile=LazyProfile(path), journal=journal)
+    window.data_manager.update_cells("HSA", {0: {"balance": 2.0}})
+    window._autosave()
+    QThreadPool.globalInstance().waitForDone()
+    app.processEvents()
+
+    assert journal.records == 0
+    assert not window.data_manager.is_loaded("Other")
+    recovered = journal.recover().to_profile()
+    assert recovered.datasets == {"Other": [1, 2], "HSA": [{"balance": 2.0}]}
+    window.close()
+
+
+def test_hidden_screens_catch_up_when_shown(app):
+    window = MainWindow()
+    window.show()
+    window.data_manager.add_dataset(
+        "401(k)",
+        [
+            {"month": m, "contribution": 1.0, "growth_rate": 0.0, "balance": float(m)}
+            for m in range(1, 4)
+        ],
+    )
+    for _ in range(3):
+        window.add_plot_screen()
+    for screen in window.graph_screens:
+        screen.set_data(window.data_manager.get_dataset("401(k)"), name="401(k)")
+    app.processEvents()
+    visible, hidden = window.graph_screens[0], window.graph_screens[-1]
+    assert not visible._hidden and hidden._hidden
+
+    for value in (10.0, 20.0):
+        window.data_manager.update_cells("401(k)", {2: {"balance": value}})
+    assert hidden._pending_change is None and not hidden._refresh_timer.isActive()
+    assert hidden._stale_version == window.data_manager.version("401(k)")
+    assert visible._pending_change.rows == (2,)
+    visible._apply_pending_changes()
+    assert visible.data[2]["balance"] == 20.0
+    assert hidden.data[2]["balance"] == 3.0
+
+    hidden.raise_()
+    app.processEvents()
+    assert not hidden._hidden and visible._hidden
+    assert hidden._stale_version is None
+    assert hidden.data[2]["balance"] == 20.0
+    assert list(hidden.canvas.figure.axes[0].get_lines()[0].get_ydata()) == [1.0, 2.0, 20.0]
+    window.close()
+
+
+def test_scenario_sweep_rejects_negative_horizons(app, monkeypatch):
+    from money_metrics.ui import main_window
+
+    answers = iter(["100, 200", "0.01", "-12"])
+    warnings = []
+    monkeypatch.setattr(
+        main_window.QInputDialog,
+        "getText",
+        lambda *args, **kwargs: (next(answers), True),
+    )
+    monkeypatch.setattr(
+        main_window.QMessageBox, "warning", lambda *args: warnings.append(args[2])
+    )
+    window = MainWindow()
+    window._scenario_sweep_dialog()
+    assert warnings == ["Invalid values: horizons must be non-negative"]
+
+
+def test_scenario_sweep_rounds_and_deduplicates_horizons(app, monkeypatch):
+    from money_metrics.ui import main_window
+    from money_metrics.ui.sweep_screen import SweepScreen
+
+    answers = iter(["100", "0.01", "12:13:4"])
+    monkeypatch.setattr(
+        main_window.QInputDialog,
+        "getText",
+        lambda *args, **kwargs: (next(answers), True),
+    )
+    window = MainWindow()
+    window._scenario_sweep_dialog()
+    (screen,) = window.findChildren(SweepScreen)
+    results = screen.results
+    assert list(results["months"].reshape(-1)) == [12, 13]
+    window.close()
+
+
+def test_scenario_sweep_rejects_growth_rates_at_or_below_minus_one(app, monkeypatch):
+    from money_metrics.ui import main_window
+
+    answers = iter(["100", "-1", "12"])
+    warnings = []
+    monkeypatch.setattr(
+        main_window.QInputDialog,
+        "getText",
+        lambda *args, **kwargs: (next(answers), True),
+    )
+    monkeypatch.setattr(
+        main_window.QMessageBox, "warning", lambda *args: warnings.append(args[2])
+    )
+    window = MainWindow()
+    window._scenario_sweep_dialog()
+    assert warnings == ["Invalid values: growth rates must be greater than -1"]
+
+
+def test_screen_changes_are_journaled_as_they_happen(app, tmp_path):
+    journal = ProfileJournal(tmp_path / "autosave.jsonl")
+    window = MainWindow(journal=journal)
+    window.data_manager.add_dataset("HSA", [{"month": 1, "balance": 1.0}])
+    screen = window.add_plot_screen(title="Savings")
+    assert journal.recover().screens == [{"title": "Savings", "dataset": None}]
+    screen.show_dataset("HSA")
+    screen.setWindowTitle("HSA")
+    assert journal.recover().screens == [{"title": "HSA", "dataset": "HSA"}]
+    screen.close()
+    app.sendPostedEvents(None, QEvent.DeferredDelete)
+    assert window.graph_screens == []
+    assert journal.recover().screens == []
+    window.close()
+
+
+def test_aggregates_are_saved_rebuilt_and_read_only(app, tmp_path, monkeypatch):
+    from PySide6.QtWidgets import QInputDialog
+
+    window = MainWindow(journal=ProfileJournal(tmp_path / "autosave.jsonl"))
+    window.data_manager.add_dataset("401(k)", [{"month": 1, "balance": 1.0}])
+    window.data_manager.add_dataset("HSA", [{"month": 1, "balance": 2.0}])
+    monkeypatch.setattr(QInputDialog, "getText", lambda *a, **k: ("401(k), HSA", True))
+    window._net_worth_dialog()
+    assert window.graph_screens[-1].read_only
+    path = tmp_path / "profile.json"
+    AppProfile.from_window(window).save_to_file(path)
+    recovered = window.journal.recover()
+    assert recovered.aggregates == {
+        "Net worth": {"sources": ["401(k)", "HSA"], "column": "balance"}
+    }
+    window.close()
+
+    loaded = MainWindow(profile=LazyProfile(path))
+    screen = loaded.graph_screens[-1]
+    assert screen.dataset_name == "Net worth" and screen.read_only
+    QThreadPool.globalInstance().waitForDone()
+    app.processEvents()
+    assert list(loaded.aggregates) == ["Net worth"]
+    loaded.data_manager.update_cells("HSA", {0: {"balance": 5.0}})
+    assert loaded.data_manager.view("Net worth") == [{"month": 1, "balance": 6.0}]
+    loaded.close()
+
+
+def test_saving_leaves_unloaded_datasets_to_the_worker(app, tmp_path):
+    path = tmp_path / "profile.json"
+    AppProfile(datasets={"Other": [1, 2], "HSA": [{"balance": 1.0}]}).save_to_file(path)
+    window = MainWindow(profile=LazyProfile(path))
+    # Keep the datasets unloaded while the profile is saved.
+    window._prefetch_task.cancel()
+    window.profile_path = str(tmp_path / "saved.json")
+    window._save_profile()
+    assert not window.data_manager.is_loaded("Other")
+    QThreadPool.globalInstance().waitForDone()
+    app.processEvents()
+
+    saved = AppProfile.load_from_file(window.profile_path)
+    assert saved.datasets == {"Other": [1, 2], "HSA": [{"balance": 1.0}]}
+    assert window.data_manager.view("Other") == [1, 2]
+    window.close()
+
+
+def test_projection_runs_in_background(app, monkeypatch):
+    from PySide6.QtWidgets import QInputDialog
+
+    window = MainWindow()
+    rows = [
+        {"month": m, "contribution": 100.0, "growth_rate": 0.01, "balance": 0.0}
+        for m in range(1, 13)
+    ]
+    window.data_manager.add_dataset("401(k)", rows)
+    monkeypatch.setattr(QInputDialog, "getDouble", lambda *a, **k: (0.0, True))
+    task = window._add_projection_dialog()
+    assert task in window._tasks
+    QThreadPool.globalInstance().waitForDone()
+    app.processEvents()
+
+    assert window.graph_screens[-1].dataset_name == "401(k) projection"
+    assert len(window.data_manager.view("401(k) projection")) == 12
+    window.close()
+
+
+def test_columnar_401k_file_opens_from_load_dialog(app, tmp_path, monkeypatch):
+    import numpy as np
+    from PySide6.QtWidgets import QFileDialog
+    from money_metrics.core.four_zero_one_k import FourZeroOneK
+
+    plan = FourZeroOneK.from_arrays(np.full(3, 100.0), 0.01)
+    path = str(tmp_path / "plan.mmcol")
+    plan.save_columns(path)
+    monkeypatch.setattr(QFileDialog, "getOpenFileName", lambda *a, **k: (path, ""))
+    window = MainWindow()
+    window._load_profile_dialog()
+    QThreadPool.globalInstance().waitForDone()
+    app.processEvents()
+
+    assert window.data_manager.view("401(k)") == plan.to_dict()
+    assert window.graph_screens[-1].dataset_name == "401(k)"
+    window.close()
@@ -0,0 +1,40 @@
+import pytest
+
+from money_metrics.core import FourZeroOneK
+from money_metrics.core.monte_carlo import MonteCarloProjection
+
+
+def test_zero_volatility_matches_deterministic_plan():
+    plan = FourZeroOneK.from_arrays([100.0] * 24, 0.01)
+    bands = MonteCarloProjection.from_plan(plan, 0.0).run(
+        50, seed=1, target=plan.balances[-1] - 1
+    )
+    assert bands.p5.tolist() == pytest.approx(plan.balances.tolist())
+    assert bands.p95.tolist() == pytest.approx(plan.balances.tolist())
+    assert bands.probability_of_target == 1.0
+    assert bands.to_dict()[0] == {
+        "month": 1,
+        "p5": pytest.approx(101.0),
+        "p50": pytest.approx(101.0),
+        "p95": pytest.approx(101.0),
+    }
+
+
+def test_seeded_runs_are_reproducible_across_workers():
+    projection = MonteCarloProjection([200.0] * 36, 0.005, 0.04)
+    serial = projection.simulate(1_000, seed=42, chunk_size=250)
+    pooled = projection.simulate(1_000, seed=42, chunk_size=250, workers=2)
+    assert serial.shape == (1_000, 36)
+    assert (serial == pooled).all()
+
+    bands = projection.run(1_000, seed=42, chunk_size=250)
+    assert (bands.p5 <= bands.p50).all() and (bands.p50 <= bands.p95).all()
+
+
+def test_from_plan_copies_the_plan_columns():
+    from money_metrics.core.four_zero_one_k import FourZeroOneK
+
+    plan = FourZeroOneK.from_arrays([100.0] * 12, 0.01)
+    projection = MonteCarloProjection.from_plan(plan, 0.0)
+    plan.modify_month(1, contribution=500.0)
+    assert projection.contributions[0] == 100.0
@@ -1,4 +1,11 @@
-from money_metrics.core.profile import AppProfile
+import json
+import os
+import stat
+
+import pytest
+
+from money_metrics.core import atomic
+from money_metrics.core.profile import AppProfile, LazyProfile, open_profile
 
 
 def test_profile_round_trip(tmp_path):
@@ -12,3 +19,91 @@ def test_profile_round_trip(tmp_path):
 
     assert loaded.datasets == profile.datasets
     assert loaded.screens == profile.screens
+
+
+def test_profile_lists_header_before_datasets(tmp_path):
+    profile = AppProfile(datasets={"a": [1], "b": {"x": 2}}, screens=[{"title": "G"}])
+    path = tmp_path / "profile.json"
+    profile.save_to_file(path)
+    text = path.read_text()
+    assert text.index('"screens"') < text.index('"dataset_names"') < text.index('"datasets"')
+
+
+def test_lazy_profile_decodes_datasets_on_demand(tmp_path):
+    profile = AppProfile(
+        datasets={"a": [1, 2], "b": [{"month": 1, "balance": 3.5}], "c": "text"},
+        screens=[{"title": "Graph 1", "dataset": "b"}],
+    )
+    path = tmp_path / "profile.json"
+    profile.save_to_file(path)
+
+    lazy = LazyProfile(path)
+    assert lazy.screens == profile.screens
+    assert lazy.dataset_names == ["a", "b", "c"]
+    assert not lazy.is_parsed("a")
+
+    assert lazy.load_dataset("b") == profile.datasets["b"]
+    assert lazy.is_parsed("a") and not lazy.is_parsed("c")
+    with pytest.raises(KeyError):
+        lazy.load_dataset("b")
+    with pytest.raises(KeyError):
+        lazy.prefetch("missing")
+    assert lazy.load_dataset("a") == [1, 2]
+    assert lazy.load_dataset("c") == "text"
+
+
+def test_lazy_profile_reads_old_layout(tmp_path):
+    path = tmp_path / "old.json"
+    path.write_text(
+        json.dumps({"version": 1, "datasets": {"n": [1, 2]}, "screens": [{"title": "G"}]})
+    )
+    lazy = LazyProfile(path)
+    assert lazy.screens == [{"title": "G"}]
+    assert lazy.to_profile().datasets == {"n": [1, 2]}
+
+
+def test_json_save_is_atomic_and_matches_json_dump(tmp_path):
+    profile = AppProfile(
+        datasets={"a": [{"x": 1.5}], "b": {"y": [1, 2]}, "c": []},
+        screens=[{"title": "G", "dataset": "a"}],
+    )
+    path = tmp_path / "profile.json"
+    progress = []
+    profile.save_to_file(path, progress=lambda done, total: progress.append(done))
+    assert path.read_text() == json.dumps(profile.to_dict(), indent=2)
+    assert progress == [1, 2, 3]
+
+    empty = AppProfile()
+    empty.save_to_file(tmp_path / "empty.json")
+    assert (tmp_path / "empty.json").read_text() == json.dumps(empty.to_dict(), indent=2)
+
+    class Unserialisable:
+        pass
+
+    # A failed save leaves the previous file and no temporary files behind.
+    with pytest.raises(TypeError):
+        AppProfile(datasets={"bad": Unserialisable()}).save_to_file(path)
+    assert AppProfile.load_from_file(path).datasets == profile.datasets
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["empty.json", "profile.json"]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permissions")
+def test_save_keeps_file_permissions(tmp_path):
+    path = tmp_path / "profile.json"
+    AppProfile().save_to_file(path)
+    # Not the owner-only mode of the temporary file.
+    assert stat.S_IMODE(path.stat().st_mode) == 0o666 & ~atomic._UMASK
+
+    path.chmod(0o640)
+    AppProfile(datasets={"a": [1]}).save_to_file(path)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+
+
+@pytest.mark.parametrize("name", ["profile.json", "profile.mmp"])
+def test_aggregate_sources_round_trip(tmp_path, name):
+    aggregates = {"Net worth": {"sources": ["401(k)", "HSA"], "column": "balance"}}
+    path = tmp_path / name
+    AppProfile(datasets={"401(k)": [1]}, aggregates=aggregates).save_to_file(path)
+
+    assert AppProfile.load_from_file(path).aggregates == aggregates
+    assert open_profile(path).aggregates == aggregates
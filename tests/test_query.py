@@ -0,0 +1,99 @@
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from money_metrics.core.cache import ArtifactCache
+from money_metrics.core.data_manager import DataManager
+from money_metrics.core.query import DatasetQuery, inflation_adjusted
+
+
+def make_manager(months=24):
+    dm = DataManager()
+    dm.add_dataset(
+        "plan",
+        [
+            {"month": m, "contribution": 100.0, "balance": 100.0 * m}
+            for m in range(1, months + 1)
+        ],
+    )
+    return dm
+
+
+def test_resample_to_quarters_and_years():
+    query = DatasetQuery(make_manager())
+
+    quarters, balances = query.resample("plan", "balance", "quarter")
+    assert quarters.tolist() == list(range(1, 9))
+    assert balances.tolist() == [300.0 * q for q in range(1, 9)]
+
+    years, contributions = query.resample("plan", "contribution", "year", how="sum")
+    assert years.tolist() == [1, 2]
+    assert contributions.tolist() == [1200.0, 1200.0]
+
+    _, means = query.resample("plan", "balance", "year", how="mean")
+    assert means.tolist() == [650.0, 1850.0]
+
+    with pytest.raises(ValueError):
+        query.resample("plan", "balance", "week")
+
+
+def test_rolling_and_cumulative():
+    query = DatasetQuery(make_manager(months=4))
+
+    rolling = query.rolling("plan", "balance", 2)
+    assert np.isnan(rolling[0])
+    assert rolling[1:].tolist() == [150.0, 250.0, 350.0]
+    assert query.cumulative("plan", "contribution").tolist() == [
+        100.0,
+        200.0,
+        300.0,
+        400.0,
+    ]
+
+
+def test_computed_column():
+    query = DatasetQuery(make_manager(months=12))
+    query.register_column("real_balance", inflation_adjusted(0.12))
+
+    real = query.column("plan", "real_balance")
+    assert real[-1] == pytest.approx(1200.0 / 1.12)
+    _, yearly = query.resample("plan", "real_balance", "year")
+    assert yearly[0] == real[-1]
+
+
+def test_results_are_memoised_per_version():
+    dm = make_manager()
+    cache = ArtifactCache()
+    query = DatasetQuery(dm, cache=cache)
+
+    first = query.resample("plan", "balance", "year")
+    assert query.resample("plan", "balance", "year") is first
+    with pytest.raises(ValueError):
+        first[1][0] = 0.0
+
+    dm.update_cells("plan", {23: {"balance": 0.0}})
+    years, balances = query.resample("plan", "balance", "year")
+    assert balances.tolist() == [1200.0, 0.0]
+    assert all(key[1] == dm.version("plan") for key in cache._entries)
+    assert cache.stats().hits > 0
+
+
+def test_cell_edits_patch_the_cached_columns():
+    dm = make_manager()
+    query = DatasetQuery(dm, cache=ArtifactCache())
+    before = query.columns("plan")
+
+    dm.update_cells("plan", {3: {"balance": -1.0}, 5: {"balance": -2.0}})
+    with mock.patch.object(dm, "view", wraps=dm.view) as view:
+        after = query.columns("plan")
+    assert not view.called
+    # Only the edited column is copied; the others are shared.
+    assert after["contribution"] is before["contribution"]
+    assert after["balance"][[3, 5]].tolist() == [-1.0, -2.0]
+    assert before["balance"][3] == 400.0
+    assert query.resample("plan", "balance", "year")[1].tolist() == [1200.0, 2400.0]
+
+    # An edit that makes a numeric column non-numeric rebuilds the columns.
+    dm.update_cells("plan", {0: {"contribution": "n/a"}})
+    assert "contribution" not in query.columns("plan")
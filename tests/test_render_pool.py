@@ -0,0 +1,115 @@
+import time
+from unittest import mock
+
+import numpy as np
+import pytest
+
+pytest.importorskip("PySide6.QtWidgets")
+from PySide6.QtCore import QThread
+from PySide6.QtWidgets import QApplication
+
+from money_metrics.core.data_manager import DataManager
+from money_metrics.ui.graph_screen import GraphScreen
+from money_metrics.ui.render_pool import PlotSpec, RenderPool, render_spec
+
+
+@pytest.fixture(scope="module")
+def app():
+    try:
+        app = QApplication.instance() or QApplication([])
+    except Exception:
+        pytest.skip("Qt GUI not available")
+    yield app
+
+
+def _settle(app, pool, condition=lambda: True, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        pool.wait()
+        app.processEvents()
+        if condition():
+            return
+
+
+def test_render_spec_draws_into_an_image(app):
+    x = np.arange(1, 11)
+    spec = PlotSpec("Month", (("balance", x, x * 2.0, "o"),), (x, x - 1.0, x + 1.0, "p5-p95"))
+    image = render_spec(spec, 320, 200)
+    assert (image.width(), image.height()) == (320, 200)
+    assert not image.isNull()
+
+
+def test_newer_requests_supersede_older_ones(app):
+    pool = RenderPool(max_threads=1)
+    x = np.arange(1, 1001)
+    delivered = []
+    for value in range(5):
+        spec = PlotSpec("Month", (("balance", x, x * value, ""),))
+        pool.request("screen", spec, (200, 100), lambda image, v=value: delivered.append(v))
+    _settle(app, pool, lambda: delivered)
+
+    assert delivered == [4]
+
+    pool.request("screen", spec, (200, 100), delivered.append)
+    pool.forget("screen")
+    _settle(app, pool)
+    assert delivered == [4]
+
+
+def test_graph_screen_renders_on_worker_threads(app):
+    pool = RenderPool(max_threads=2)
+    dm = DataManager()
+    dm.add_dataset(
+        "401(k)",
+        [
+            {"month": m, "contribution": 1.0, "growth_rate": 0.0, "balance": float(m)}
+            for m in range(1, 50)
+        ],
+    )
+    threads = []
+
+    def render(*args):
+        threads.append(QThread.currentThread())
+        return render_spec(*args)
+
+    screens = [GraphScreen(dm, render_pool=pool) for _ in range(2)]
+    with mock.patch("money_metrics.ui.render_pool.render_spec", render):
+        for screen in screens:
+            screen.resize(400, 300)
+            screen.set_data(dm.get_dataset("401(k)"), name="401(k)")
+        _settle(app, pool, lambda: all(s.canvas.image is not None for s in screens))
+
+    assert all(s.canvas.image is not None for s in screens)
+    assert threads and app.thread() not in threads
+
+
+def test_pooled_screen_zooms_with_set_view(app):
+    pool = RenderPool(max_threads=1)
+    dm = DataManager()
+    dm.add_dataset(
+        "401(k)",
+        [
+            {"month": m, "contribution": 0.0, "growth_rate": 0.0, "balance": float(m % 97)}
+            for m in range(1, 50_001)
+        ],
+    )
+    specs = []
+
+    def render(spec, *args):
+        specs.append(spec)
+        return render_spec(spec, *args)
+
+    screen = GraphScreen(dm, render_pool=pool)
+    screen.resize(400, 300)
+    with mock.patch("money_metrics.ui.render_pool.render_spec", render):
+        screen.show_dataset("401(k)")
+        _settle(app, pool, lambda: specs)
+        ((_, xs, _, _),) = specs[-1].lines
+        assert len(xs) <= 2 * screen.canvas.width() + 2 and specs[-1].xlim is None
+
+        # Zooming in renders the range re-sampled at full detail.
+        screen.set_view(1000, 1100)
+        _settle(app, pool, lambda: specs[-1].xlim is not None)
+        ((_, xs, _, _),) = specs[-1].lines
+        assert specs[-1].xlim == (1000, 1100)
+        assert xs[0] <= 1000 and xs[-1] >= 1100 and len(xs) == 103
@@ -0,0 +1,37 @@
+import pytest
+
+from money_metrics.core import FourZeroOneK
+from money_metrics.core.scenario_sweep import sweep, rank
+
+
+def test_sweep_matches_month_by_month_plans():
+    contributions = [0.0, 100.0, 250.0]
+    growth_rates = [-0.01, 0.0, 0.005, 0.02]
+    horizons = [1, 12, 60]
+    results = sweep(contributions, growth_rates, horizons, initial=1_000.0)
+    assert results.shape == (3, 4, 3)
+
+    for i, c in enumerate(contributions):
+        for j, g in enumerate(growth_rates):
+            plan = FourZeroOneK.from_arrays([c] * 60, g)
+            for k, n in enumerate(horizons):
+                # FourZeroOneK starts from zero, so add the compounded initial
+                expected = plan.balances[n - 1] + 1_000.0 * (1 + g) ** n
+                record = results[i, j, k]
+                assert record["months"] == n
+                assert record["final_balance"] == pytest.approx(expected)
+
+
+def test_rank_orders_by_final_balance():
+    results = sweep([100.0, 200.0], [0.0, 0.01], [12])
+    ranked = rank(results, top=3)
+    assert len(ranked) == 3
+    assert ranked[0]["contribution"] == 200.0 and ranked[0]["growth_rate"] == 0.01
+    assert list(ranked["final_balance"]) == sorted(ranked["final_balance"], reverse=True)
+
+
+def test_sweep_rejects_growth_rates_at_or_below_minus_one():
+    with pytest.raises(ValueError):
+        sweep([100.0], [0.01, -1.0], [12])
+    with pytest.raises(ValueError):
+        sweep([100.0], [-1.5], [12])
@@ -0,0 +1,46 @@
+import numpy as np
+
+from money_metrics.core.cache import ArtifactCache
+from money_metrics.core.data_manager import DataManager
+from money_metrics.core.series_store import SeriesStore, series_store
+
+
+def plan_rows(n):
+    return [
+        {"month": m, "contribution": 100.0, "growth_rate": 0.0, "balance": 100.0 * m}
+        for m in range(1, n + 1)
+    ]
+
+
+def test_store_is_shared_per_data_manager():
+    dm = DataManager()
+    assert series_store(dm) is series_store(dm) is dm.series_store()
+    assert series_store(DataManager()) is not series_store(dm)
+    assert isinstance(dm.series_store(), SeriesStore)
+
+
+def test_arrays_are_prepared_once_per_version():
+    dm = DataManager()
+    dm.add_dataset("401(k)", plan_rows(24))
+    store = SeriesStore(dm, ArtifactCache())
+
+    x, balances = store.series("401(k)", "balance")
+    assert store.series("401(k)", "balance")[1] is balances
+    assert store.pyramid("401(k)", "balance") is store.pyramid("401(k)", "balance")
+    assert not balances.flags.writeable
+    yearly = store.series("401(k)", "balance", "year")[1]
+    np.testing.assert_array_equal(yearly, [1200.0, 2400.0])
+
+    dm.update_cells("401(k)", {0: {"balance": 5.0}})
+    _, updated = store.series("401(k)", "balance")
+    assert updated is not balances and updated[0] == 5.0
+
+
+def test_band_reads_the_outer_percentiles():
+    dm = DataManager()
+    dm.add_dataset(
+        "projection",
+        [{"month": m, "p5": m - 1.0, "p50": float(m), "p95": m + 1.0} for m in (1, 2)],
+    )
+    x, lows, highs = SeriesStore(dm, ArtifactCache()).band("projection")
+    assert list(x) == [1, 2] and list(lows) == [0.0, 1.0] and list(highs) == [2.0, 3.0]
@@ -0,0 +1,63 @@
+import pytest
+
+from money_metrics.core.sqlite_store import SQLiteDataManager
+
+
+def rows(n):
+    return [{"month": i + 1, "balance": float(i)} for i in range(n)]
+
+
+def test_datasets_persist_and_load_lazily(tmp_path):
+    path = tmp_path / "store.db"
+    dm = SQLiteDataManager(path)
+    dm.add_dataset("401k", rows(10))
+    dm.add_dataset("numbers", [1, 2, 3])
+    dm.update_cells("401k", {3: {"balance": 99.0}})
+    version = dm.version("401k")
+    dm.close()
+
+    reopened = SQLiteDataManager(path, cache_size=1)
+    assert reopened.names() == ["401k", "numbers"]
+    assert reopened.version("401k") == version
+    # nothing has been read yet
+    assert not reopened._cache
+    assert reopened.get_rows("401k", 2, 5) == [
+        {"month": 3, "balance": 2.0},
+        {"month": 4, "balance": 99.0},
+        {"month": 5, "balance": 4.0},
+    ]
+    assert reopened.row_count("401k") == 10
+    assert reopened.get_dataset("numbers") == [1, 2, 3]
+    with pytest.raises(ValueError):
+        reopened.add_dataset("numbers", [4])
+
+
+def test_update_cells_writes_only_changed_rows():
+    dm = SQLiteDataManager(cache_size=0)
+    dm.add_dataset("401k", rows(5))
+    events = []
+    dm.subscribe(events.append)
+    dm.update_cells("401k", {0: {"balance": -1.0}, 4: {"balance": -4.0}}, source="t")
+
+    assert [r["balance"] for r in dm.view("401k")] == [-1.0, 1.0, 2.0, 3.0, -4.0]
+    assert events[-1].rows == (0, 4) and events[-1].source == "t"
+
+    retrieved = dm.get_dataset("401k")
+    retrieved[1]["balance"] = 100.0
+    assert dm.view("401k")[1]["balance"] == 1.0
+
+    dm.remove_dataset("401k")
+    assert dm.view("401k") is None and "401k" not in dm
+
+
+def test_lazy_dataset_is_stored_when_loaded(tmp_path):
+    path = str(tmp_path / "data.db")
+    dm = SQLiteDataManager(path)
+    dm.add_lazy_dataset("plan", lambda: [{"month": 1, "balance": 2.0}])
+    assert dm.row_count("plan") == 1
+    version = dm.version("plan")
+    dm.close()
+
+    reopened = SQLiteDataManager(path)
+    assert reopened.version("plan") == version
+    assert reopened.view("plan") == [{"month": 1, "balance": 2.0}]
@@ -0,0 +1,28 @@
+import pytest
+
+pytest.importorskip("PySide6.QtWidgets")
+from PySide6.QtWidgets import QApplication
+
+from money_metrics.core.scenario_sweep import sweep
+from money_metrics.ui.sweep_screen import SweepScreen
+
+
+@pytest.fixture(scope="module")
+def app():
+    try:
+        app = QApplication.instance() or QApplication([])
+    except Exception:
+        pytest.skip("Qt GUI not available")
+    yield app
+
+
+def test_sweep_screen_shows_heatmap_and_ranking(app):
+    results = sweep([100.0, 200.0, 300.0], [0.0, 0.01], [12, 24])
+    screen = SweepScreen(results)
+    assert screen.horizon_box.count() == 2
+    assert screen.ranking.rowCount() == 12
+    assert screen.ranking.item(0, 0).text() == "300"
+
+    screen.horizon_box.setCurrentIndex(1)
+    image = screen.canvas.figure.axes[0].images[0]
+    assert image.get_array().shape == (3, 2)